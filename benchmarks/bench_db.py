@@ -0,0 +1,169 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from src import cache, db
+from src.connection import close_all
+
+from .generate import build_database
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _timed(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def _cold(fn):
+    # Read benchmarks measure the query, not a hit in the result cache.
+    def run():
+        cache.results.clear()
+        return fn()
+    return run
+
+def _peak_kib(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+def _operations(path: str, scratch: str, source: str):
+    # name -> (operation, repeat[, untimed setup])
+    csv_path = os.path.join(scratch, "export.csv")
+    json_path = os.path.join(scratch, "export.json")
+    import_source = os.path.join(scratch, "import_source.csv")
+
+    inserted = itertools.count()
+
+    def insert_entry():
+        # Sessions are unique per day, start and end, so every call gets its own day.
+        day = date(2099, 1, 1) + timedelta(days=next(inserted))
+        db.insert_entry(path, day.isoformat(), "09:00:00", "10:00:00", 3600)
+
+    def prepare_import():
+        # Exported from the generated database, so the imported rows do not
+        # depend on which other operations ran before.
+        if not os.path.exists(import_source):
+            db.export_csv(source, import_source)
+
+    def import_csv():
+        target = os.path.join(scratch, "import.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(target + suffix):
+                os.remove(target + suffix)
+        db.ensure_database(scratch, "import.db")
+        db.import_csv(target, import_source)
+
+    return {
+        "insert_entry":         (insert_entry, 200),
+        "session_checkpoint":   (lambda: db.checkpoint_session(path), 200),
+        "export_csv":           (lambda: db.export_csv(path, csv_path), 3),
+        "import_csv":           (import_csv, 1, prepare_import),
+        "export_json":          (lambda: db.export_json(path, json_path), 3),
+        "summary_by_date":      (_cold(lambda: db.summary_by_date(path)), 20),
+        "all_entries":          (_cold(lambda: db.all_entries(path)), 3),
+        "month_and_week_stats": (_cold(lambda: db.month_and_week_stats(path)), 20),
+        "summary_by_date_cached":      (lambda: db.summary_by_date(path), 20),
+        "month_and_week_stats_cached": (lambda: db.month_and_week_stats(path), 20),
+    }
+
+def run(sizes, workdir: str, only=None, memory: bool = True):
+    results = []
+    for rows in sizes:
+        source = build_database(workdir, rows)
+        with tempfile.TemporaryDirectory() as scratch:
+            # Mutating benchmarks work on a copy so the cached database stays reusable.
+            path = os.path.join(scratch, "work_time.db")
+            shutil.copy2(source, path)
+            db.ensure_database(scratch)
+            db.start_session(path)
+            for name, (fn, repeat, *setup) in _operations(path, scratch, source).items():
+                if only and name not in only:
+                    continue
+                for prepare in setup:
+                    prepare()
+                timings = _timed(fn, repeat)
+                result = {
+                    "rows": rows,
+                    "operation": name,
+                    "repeat": repeat,
+                    "seconds_min": min(timings),
+                    "seconds_median": statistics.median(timings),
+                    "seconds_max": max(timings),
+                }
+                if memory:
+                    result["peak_kib"] = _peak_kib(fn)
+                results.append(result)
+                print(f"{rows:>9} {name:<28} min {result['seconds_min'] * 1000:10.2f} ms"
+                      f"  median {result['seconds_median'] * 1000:10.2f} ms"
+                      + (f"  peak {result['peak_kib']:>8} KiB" if memory else ""))
+            close_all()
+    return results
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+def compare(baseline_path: str, results) -> int:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["rows"], r["operation"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    for result in results:
+        old = baseline.get((result["rows"], result["operation"]))
+        if old is None:
+            continue
+        ratio = result["seconds_median"] / old["seconds_median"] if old["seconds_median"] else 1.0
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        regressions += bool(flag)
+        print(f"{result['rows']:>9} {result['operation']:<28} x{ratio:5.2f}{flag}")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark src/db.py on synthetic histories.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "work_time_bench"),
+                        help="where generated databases are cached between runs")
+    parser.add_argument("--only", nargs="+", help="run only these operations")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = run(args.rows, args.workdir, args.only, memory=not args.no_memory)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": _metadata(), "results": results}, f, indent=4)
+    print(f"Ergebnisse gespeichert: {args.output}")
+    if args.compare:
+        return 1 if compare(args.compare, results) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
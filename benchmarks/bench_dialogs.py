@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from PySide6.QtCore import QEvent, QEventLoop, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QDialog
+
+from src.connection import close_all
+from src.executor import shutdown_executor
+
+from .bench_db import _metadata
+from .generate import build_database
+
+# Time from the menu action to the first painted frame of the dialog. The
+# first open and the reopens are reported separately; data that the dialogs
+# load in the background is not waited for.
+
+DIALOGS = {
+    "all_entries":  "show_all_entries",
+    "statistics":   "show_statistics",
+    "manual_entry": "setup_man_entry",
+}
+
+
+class _FirstPaint(QObject):
+    def __init__(self):
+        super().__init__()
+        self.started: float | None = None
+        self.elapsed: float | None = None
+
+    def eventFilter(self, obj, event):
+        if self.started is not None and event.type() == QEvent.Paint and isinstance(obj, QDialog):
+            self.elapsed = time.perf_counter() - self.started
+            self.started = None
+            QTimer.singleShot(0, obj.reject)
+        return False
+
+def _spin(ms: int):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+def run(rows: int, workdir: str, repeat: int, only=None):
+    from src.main_window import WorkTimeTracker
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    source = build_database(workdir, rows)
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copy2(source, os.path.join(scratch, "work_time.db"))
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            win = WorkTimeTracker()
+            win.show()
+            _spin(1000)
+            probe = _FirstPaint()
+            app.installEventFilter(probe)
+            for name, action in DIALOGS.items():
+                if only and name not in only:
+                    continue
+                timings = []
+                for _ in range(repeat):
+                    probe.started = time.perf_counter()
+                    getattr(win, action)()
+                    timings.append(probe.elapsed)
+                    _spin(200)
+                result = {
+                    "rows": rows,
+                    "operation": name,
+                    "repeat": repeat,
+                    "seconds_first": timings[0],
+                    "seconds_median": statistics.median(timings[1:] or timings),
+                    "seconds_max": max(timings[1:] or timings),
+                }
+                results.append(result)
+                print(f"{name:<14} first {result['seconds_first'] * 1000:8.2f} ms"
+                      f"  reopen median {result['seconds_median'] * 1000:8.2f} ms")
+            app.removeEventFilter(probe)
+            win.close()
+            shutdown_executor()
+            close_all()
+        finally:
+            os.chdir(cwd)
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure how fast the dialogs open.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "work_time_bench"))
+    parser.add_argument("--only", nargs="+", choices=tuple(DIALOGS))
+    parser.add_argument("--output", default="bench_dialogs.json")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = run(args.rows, args.workdir, args.repeat, args.only)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": _metadata(), "results": results}, f, indent=4)
+    print(f"Ergebnisse gespeichert: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import os
+import random
+from datetime import date, timedelta
+
+from src.config import Config as _conf
+from src.connection import close_manager, get_manager
+from src.db import ensure_database
+
+
+def generate_sessions(rows: int | None = None, years: float | None = None, sessions_per_day: float = 3.0,
+                      gap_rate: float = 0.15, odd_rate: float = 0.02, seed: int = 42,
+                      start: date = date(2000, 1, 3)):
+    if rows is None and years is None:
+        raise ValueError("rows or years is required")
+    rng = random.Random(seed)
+    end = start + timedelta(days=int(years * 365.25)) if years else None
+    produced = 0
+    day = start
+    while (rows is None or produced < rows) and (end is None or day < end):
+        # Weekends, holidays and sick days produce empty days.
+        if day.weekday() >= 5 or rng.random() < gap_rate:
+            day += timedelta(days=1)
+            continue
+        iso = day.isoformat()
+        clock = rng.randint(6 * 3600, 10 * 3600)
+        for _ in range(max(1, round(rng.gauss(sessions_per_day, 1)))):
+            if rng.random() < odd_rate:
+                length = rng.choice((1, 59, 3599, rng.randint(10 * 3600, 14 * 3600)))
+            else:
+                length = rng.randint(15 * 60, 4 * 3600)
+            if clock + length >= 86400:
+                break
+            pause = rng.randint(0, min(length // 4, 45 * 60))
+            yield (iso, _clock(clock), _clock(clock + length), length - pause)
+            produced += 1
+            if rows is not None and produced >= rows:
+                return
+            clock += length + rng.randint(5 * 60, 90 * 60)
+        day += timedelta(days=1)
+
+def _clock(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+def build_database(folder: str, rows: int, seed: int = 42, **options) -> str:
+    filename = f"bench_{rows}_{seed}.db"
+    path = os.path.join(folder, filename)
+    if os.path.exists(path):
+        return path
+    tmp_name = filename + ".part"
+    tmp_path = os.path.join(folder, tmp_name)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(tmp_path + suffix):
+            os.remove(tmp_path + suffix)
+    ensure_database(folder, tmp_name)
+    sessions = generate_sessions(rows=rows, seed=seed, **options)
+    manager = get_manager(tmp_path)
+    while True:
+        batch = [s for _, s in zip(range(_conf.import_chunk_size), sessions)]
+        if not batch:
+            break
+        with manager.write() as conn:
+            conn.executemany(_conf.txt_insert_entry, batch)
+    manager.checkpoint("TRUNCATE")
+    close_manager(tmp_path)
+    os.replace(tmp_path, path)
+    return path
@@ -1,13 +1,41 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QFont
 
-from src.main_window import WorkTimeTracker
+from src import startup
+
+# Imported one by one so the startup profile shows what each costs.
+_STARTUP_MODULES = (
+    "PySide6.QtCore",
+    "PySide6.QtGui",
+    "PySide6.QtWidgets",
+    "src.db",
+    "src.executor",
+    "src.models",
+    "src.styles",
+    "src.main_window",
+)
 
 def main():
+    if "--profile-startup" in sys.argv:
+        sys.argv.remove("--profile-startup")
+        startup.enabled = True
+    for name in _STARTUP_MODULES:
+        startup.timed_import(name)
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QFont
+    from src.main_window import WorkTimeTracker
+    from src.connection import close_all
+    from src.executor import shutdown_executor
+    from src.styles import apply_app_style
+
     app = QApplication(sys.argv)
     app.setFont(QFont("Segoe UI", 10))
+    apply_app_style(app)
+    app.aboutToQuit.connect(shutdown_executor)
+    app.aboutToQuit.connect(close_all)
+    startup.mark("QApplication erstellt")
     win = WorkTimeTracker()
+    startup.mark("Fenster erstellt")
     win.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,210 @@
+import os
+import threading
+from datetime import date
+from functools import lru_cache
+
+from .config import Config as _conf
+from .connection import get_manager
+from .db import _where
+from .federation import _expand
+
+
+@lru_cache(maxsize=None)
+def _day_number(iso: str) -> int:
+    try:
+        return date.fromisoformat(iso).toordinal()
+    except ValueError:
+        return 0
+
+@lru_cache(maxsize=None)
+def _second_of_day(text: str) -> int:
+    try:
+        h, m, s = (int(p) for p in text.split(":"))
+    except ValueError:
+        return 0
+    return h * 3600 + m * 60 + s
+
+
+class SessionAggregates:
+    # Running aggregates of one database: per-day totals, a weekday x hour
+    # heatmap and a session length histogram. The sessions themselves are
+    # not kept; new ones are read by id and folded in, and only deletions
+    # force a full reload.
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.sessions
+
+    def clear(self):
+        self.sessions = 0
+        self.last_id = 0
+        self.rows_read = 0
+        self.day_totals: dict[int, int] = {}
+        self.heatmap = [[0] * 24 for _ in range(7)]
+        self.lengths = [0] * (len(_conf.analytics_length_bounds) + 1)
+        self.report: dict | None = None
+
+    def refresh(self) -> int:
+        with self.lock, get_manager(self.db_path).read() as conn:
+            conn.execute("BEGIN")
+            total = conn.execute(_conf.txt_count_entries).fetchone()[0]
+            if total < self.rows_read:
+                self.clear()
+            added = self._append_from(conn)
+            if self.rows_read != total:
+                self.clear()
+                added = self._append_from(conn)
+        return added
+
+    def _append_from(self, conn) -> int:
+        cursor = conn.execute(_conf.txt_analytics_rows, (self.last_id,))
+        added = 0
+        while rows := cursor.fetchmany(_conf.export_batch_size):
+            for entry_id, day, start, seconds in rows:
+                number = _day_number(day)
+                if number:
+                    self._add(number, _second_of_day(start), seconds)
+                    added += 1
+            self.rows_read += len(rows)
+            self.last_id = rows[-1][0]
+            self.report = None
+        return added
+
+    def _add(self, day: int, start: int, seconds: int):
+        self.sessions += 1
+        self.day_totals[day] = self.day_totals.get(day, 0) + seconds
+
+        # Spread the session over the hours it covers, from its start.
+        weekday = (day - 1) % 7
+        position = start
+        remaining = seconds
+        while remaining > 0:
+            hour = position // 3600
+            if hour >= 24:
+                weekday = (weekday + 1) % 7
+                position -= 86400
+                hour = 0
+            chunk = min(remaining, (hour + 1) * 3600 - position)
+            self.heatmap[weekday][hour] += chunk
+            position += chunk
+            remaining -= chunk
+
+        bounds = _conf.analytics_length_bounds
+        slot = 0
+        while slot < len(bounds) and seconds >= bounds[slot]:
+            slot += 1
+        self.lengths[slot] += 1
+
+    def weekday_averages(self) -> list[tuple[int, int, float]]:
+        return weekday_averages(self.day_totals)
+
+    def rolling_weeks(self, window: int = _conf.analytics_rolling_weeks) -> list[tuple[str, int, float]]:
+        return rolling_weeks(self.day_totals, window)
+
+
+def weekday_averages(day_totals: dict[int, int]) -> list[tuple[int, int, float]]:
+    # (worked days, total seconds, average seconds per worked day), Monday first.
+    days = [0] * 7
+    seconds = [0] * 7
+    for day, total in day_totals.items():
+        weekday = (day - 1) % 7
+        days[weekday] += 1
+        seconds[weekday] += total
+    return [(d, s, s / d if d else 0.0) for d, s in zip(days, seconds)]
+
+def rolling_weeks(day_totals: dict[int, int],
+                  window: int = _conf.analytics_rolling_weeks) -> list[tuple[str, int, float]]:
+    # (Monday, week total, average over the last `window` weeks incl. empty weeks).
+    weeks: dict[int, int] = {}
+    for day, seconds in day_totals.items():
+        monday = day - (day - 1) % 7
+        weeks[monday] = weeks.get(monday, 0) + seconds
+    if not weeks:
+        return []
+    result = []
+    recent: list[int] = []
+    for monday in range(min(weeks), max(weeks) + 1, 7):
+        total = weeks.get(monday, 0)
+        recent.append(total)
+        if len(recent) > window:
+            recent.pop(0)
+        result.append((date.fromordinal(monday).isoformat(), total, sum(recent) / len(recent)))
+    return result
+
+
+_caches: dict[str, SessionAggregates] = {}
+_caches_lock = threading.Lock()
+
+
+def get_aggregates(db_path: str) -> SessionAggregates:
+    key = os.path.abspath(db_path)
+    with _caches_lock:
+        aggregates = _caches.get(key)
+        if aggregates is None:
+            aggregates = _caches[key] = SessionAggregates(key)
+        return aggregates
+
+def analytics_report(db_path: str) -> dict:
+    aggregates = get_aggregates(db_path)
+    aggregates.refresh()
+    with aggregates.lock:
+        if aggregates.report is None:
+            aggregates.report = {
+                "sessions": len(aggregates),
+                "weekdays": aggregates.weekday_averages(),
+                "heatmap": [row[:] for row in aggregates.heatmap],
+                "lengths": aggregates.lengths[:],
+                "rolling": aggregates.rolling_weeks(),
+            }
+        return aggregates.report
+
+def range_aggregates(db_path: str, date_from: str | None, date_to: str | None) -> SessionAggregates:
+    # A date range reads only its slice through idx_work_time_date, which
+    # covers all three columns; the result is not cached.
+    aggregates = SessionAggregates(db_path)
+    sql, params = _where(_conf.txt_analytics_range, date_from, date_to)
+    with get_manager(db_path).read() as conn:
+        cursor = conn.execute(sql, params)
+        while rows := cursor.fetchmany(_conf.export_batch_size):
+            for day, start, seconds in rows:
+                number = _day_number(day)
+                if number:
+                    aggregates._add(number, _second_of_day(start), seconds)
+    return aggregates
+
+def combined_report(paths: list[str], date_from: str | None = None, date_to: str | None = None) -> dict:
+    # Every source keeps its own cache; the aggregates are additive, so they
+    # are summed instead of loading the sessions of all sources together.
+    ranged = bool(date_from or date_to)
+    paths, _ = _expand(paths, date_from, date_to)
+    if len(paths) == 1 and not ranged:
+        return analytics_report(paths[0])
+    day_totals: dict[int, int] = {}
+    heatmap = [[0] * 24 for _ in range(7)]
+    lengths = [0] * (len(_conf.analytics_length_bounds) + 1)
+    sessions = 0
+    for path in paths:
+        if ranged:
+            aggregates = range_aggregates(path, date_from, date_to)
+        else:
+            aggregates = get_aggregates(path)
+            aggregates.refresh()
+        with aggregates.lock:
+            sessions += len(aggregates)
+            for day, seconds in aggregates.day_totals.items():
+                day_totals[day] = day_totals.get(day, 0) + seconds
+            for total_row, row in zip(heatmap, aggregates.heatmap):
+                for hour, seconds in enumerate(row):
+                    total_row[hour] += seconds
+            for slot, count in enumerate(aggregates.lengths):
+                lengths[slot] += count
+    return {
+        "sessions": sessions,
+        "weekdays": weekday_averages(day_totals),
+        "heatmap": heatmap,
+        "lengths": lengths,
+        "rolling": rolling_weeks(day_totals),
+    }
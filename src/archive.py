@@ -0,0 +1,126 @@
+import os
+import re
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+from .config import Config as _conf
+from .connection import get_manager, archive_uri
+from .schema import ensure_schema
+
+
+class ArchiveError(Exception):
+    pass
+
+class ArchiveCancelled(Exception):
+    pass
+
+def archive_path(db_path: str, year: int) -> str:
+    stem = os.path.splitext(db_path)[0]
+    return f"{stem}_archiv_{year}.db"
+
+def archives(db_path: str) -> list[tuple[int, str]]:
+    folder = os.path.dirname(os.path.abspath(db_path))
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(rf"{re.escape(stem)}_archiv_(\d{{4}})\.db")
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return []
+    found = []
+    for name in names:
+        match = pattern.fullmatch(name)
+        if match:
+            found.append((int(match.group(1)), os.path.join(folder, name)))
+    return sorted(found)
+
+def archivable_years(db_path: str, today: date | None = None) -> list[int]:
+    # Only closed years; the current one still receives entries.
+    today = today or date.today()
+    with get_manager(db_path).read() as conn:
+        return [row[0] for row in conn.execute(_conf.txt_archive_years, (str(today.year),))]
+
+def _year_range(year: int) -> tuple[str, str]:
+    return f"{year:04d}-01-01", f"{year:04d}-12-31"
+
+def _write_archive(db_path: str, dest: str, year: int, progress=None, cancelled=None) -> int:
+    # The archive is built next to its final name, compacted, switched to a
+    # rollback journal and only then renamed into place and made read-only.
+    part = dest + ".part"
+    if os.path.exists(part):
+        os.remove(part)
+    target = sqlite3.connect(Path(part).resolve().as_uri(), uri=True, isolation_level=None)
+    try:
+        ensure_schema(target)
+        target.execute(_conf.txt_fed_attach.format(alias="live"), (Path(db_path).resolve().as_uri() + "?mode=ro",))
+        target.execute("BEGIN IMMEDIATE")
+        steps = len(_conf.txt_archive_copy)
+        for step, sql in enumerate(_conf.txt_archive_copy):
+            if cancelled and cancelled():
+                raise ArchiveCancelled()
+            target.execute(sql, _year_range(year))
+            if progress:
+                progress(0.8 * (step + 1) / steps)
+        copied, expected = target.execute(_conf.txt_archive_copied, _year_range(year)).fetchone()
+        if copied != expected:
+            raise ArchiveError(f"Archiv für {year} unvollständig ({copied} von {expected} Einträgen).")
+        target.execute("COMMIT")
+        target.execute("DETACH DATABASE live")
+        target.execute(_conf.txt_archive_journal)
+        target.execute("VACUUM")
+    except BaseException:
+        target.close()
+        os.remove(part)
+        raise
+    target.close()
+    os.replace(part, dest)
+    os.chmod(dest, 0o444)
+    return copied
+
+def _remove_archived(db_path: str, dest: str, year: int) -> int:
+    manager = get_manager(db_path)
+    with manager.exclusive() as conn:
+        conn.execute(_conf.txt_fed_attach.format(alias="archive"), (archive_uri(dest),))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = conn.execute(_conf.txt_archive_delete, _year_range(year)).rowcount
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.execute("DETACH DATABASE archive")
+        if removed:
+            # Give the freed pages back so the live file really shrinks.
+            try:
+                conn.execute("VACUUM")
+            except sqlite3.OperationalError:
+                pass
+    return removed
+
+def archive_year(db_path: str, year: int, today: date | None = None, progress=None, cancelled=None) -> int:
+    # Copy first, verify, then delete from the live database. An interrupted
+    # run leaves either no archive or a complete one; running it again
+    # finishes the removal from the live database.
+    today = today or date.today()
+    if year >= today.year:
+        raise ArchiveError("Nur abgeschlossene Jahre können archiviert werden.")
+    dest = archive_path(db_path, year)
+    if os.path.exists(dest):
+        removed = _remove_archived(db_path, dest, year)
+        if not removed and year in archivable_years(db_path, today):
+            raise ArchiveError(f"{os.path.basename(dest)} existiert bereits; neuere Einträge aus {year} "
+                               f"bleiben in der aktuellen Datenbank.")
+        if not removed:
+            raise ArchiveError(f"{year} ist bereits archiviert.")
+        if progress:
+            progress(1.0)
+        return removed
+    if year not in archivable_years(db_path, today):
+        raise ArchiveError(f"Keine Einträge aus {year} vorhanden.")
+    _write_archive(db_path, dest, year, progress, cancelled)
+    removed = _remove_archived(db_path, dest, year)
+    if progress:
+        progress(1.0)
+    return removed
@@ -0,0 +1,72 @@
+import os
+import re
+import sqlite3
+from datetime import date
+
+from .config import Config as _conf
+from .connection import get_manager
+
+
+class BackupCancelled(Exception):
+    pass
+
+def backup_database(src_path: str, dest_path: str, progress=None, cancelled=None,
+                    pages: int = _conf.backup_pages_per_step):
+    # The backup API copies a consistent snapshot page by page from a pooled
+    # reader, so the writer (timer inserts, imports) is never held up.
+    def step(status, remaining, total):
+        if cancelled and cancelled():
+            raise BackupCancelled()
+        if progress and total:
+            progress(1.0 - remaining / total)
+
+    part = dest_path + ".part"
+    target = sqlite3.connect(part)
+    try:
+        with get_manager(src_path).read() as conn:
+            conn.backup(target, pages=pages, progress=step)
+    except BaseException:
+        target.close()
+        os.remove(part)
+        raise
+    # A backup is a single self-contained file, not a WAL database.
+    target.execute("PRAGMA journal_mode = DELETE")
+    target.close()
+    os.replace(part, dest_path)
+    return dest_path
+
+def _backup_files(folder: str, stem: str) -> list[tuple[date, str]]:
+    pattern = re.compile(rf"{re.escape(stem)}_(\d{{4}}-\d{{2}}-\d{{2}})\.db")
+    found = []
+    for name in os.listdir(folder):
+        match = pattern.fullmatch(name)
+        if match:
+            found.append((date.fromisoformat(match.group(1)), os.path.join(folder, name)))
+    return sorted(found, reverse=True)
+
+def rotate_backups(folder: str, stem: str, keep_daily: int, keep_weekly: int) -> list[str]:
+    backups = _backup_files(folder, stem)
+    keep = {path for _, path in backups[:keep_daily]}
+    weeks = set()
+    for day, path in backups:
+        week = day.isocalendar()[:2]
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks.add(week)
+            keep.add(path)
+    removed = [path for _, path in backups if path not in keep]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+def scheduled_backup(db_path: str, folder: str, keep_daily: int = _conf.backup_keep_daily,
+                     keep_weekly: int = _conf.backup_keep_weekly, today: date | None = None,
+                     progress=None, cancelled=None) -> str | None:
+    today = today or date.today()
+    os.makedirs(folder, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    dest = os.path.join(folder, f"{stem}_{today.isoformat()}.db")
+    if os.path.exists(dest):
+        return None
+    backup_database(db_path, dest, progress, cancelled)
+    rotate_backups(folder, stem, keep_daily, keep_weekly)
+    return dest
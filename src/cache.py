@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from .config import Config as _conf
+from .connection import get_manager
+
+# Results of read-only queries, keyed on the database's data version (see
+# ConnectionManager.data_version) and the call arguments. Any commit, also
+# from another process, moves the version, so stale entries are never hit
+# again and simply age out of the LRU order.
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = _conf.result_cache_entries, max_rows: int = _conf.result_cache_rows):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[bool, object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: tuple, value, rows: int):
+        # Results larger than the whole budget are returned but not kept.
+        if rows > self.max_rows or self.max_entries <= 0:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._rows -= old[1]
+            self._entries[key] = (value, rows)
+            self._rows += rows
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._rows -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> tuple[int, int, int, int]:
+        with self._lock:
+            return self.hits, self.misses, len(self._entries), self._rows
+
+
+results = ResultCache()
+
+
+def _rows(value) -> int:
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(len(part) for part in value if isinstance(part, list)) or 1
+    return 1
+
+def _copy(value):
+    # Callers may extend or sort what they get; the cached lists stay untouched.
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, tuple):
+        return tuple(list(part) if isinstance(part, list) else part for part in value)
+    return value
+
+def cached(fn):
+    @wraps(fn)
+    def wrapper(db_path: str, *args, **kwargs):
+        manager = get_manager(db_path)
+        key = (fn.__name__, manager.db_path, manager.data_version(), args, tuple(sorted(kwargs.items())))
+        found, value = results.get(key)
+        if not found:
+            value = fn(db_path, *args, **kwargs)
+            results.put(key, value, _rows(value))
+        return _copy(value)
+    wrapper.uncached = fn
+    return wrapper
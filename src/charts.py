@@ -0,0 +1,279 @@
+import math
+from datetime import date, timedelta
+
+from PySide6.QtCore import QPointF, QRectF, Qt, QTimer
+from PySide6.QtGui import QColor, QFont, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QToolTip, QWidget
+
+from .config import Config as _conf
+from .executor import get_executor
+from .federation import chart_series_for
+from .formats import display_date, display_month, display_week, format_duration
+
+UNITS = {"day": ("Tag", "Tage"), "week": ("Woche", "Wochen"), "month": ("Monat", "Monate")}
+
+_BAR = QColor("#2563eb")
+_PEAK = QColor("#93c5fd")
+_GRID = QColor("#e5e7eb")
+_TEXT = QColor("#6b7280")
+_HOUR_STEPS = (0.25, 0.5, 1, 2, 4, 5, 10, 20, 25, 50, 100, 200, 250, 500, 1000)
+
+
+def unit_index(day: date, unit: str) -> int:
+    # Consecutive units get consecutive numbers; only differences are used.
+    if unit == "day":
+        return day.toordinal()
+    if unit == "week":
+        return (day.toordinal() - day.weekday()) // 7
+    return day.year * 12 + day.month - 1
+
+def unit_start(index: int, unit: str) -> date:
+    if unit == "day":
+        return date.fromordinal(index)
+    if unit == "week":
+        return date.fromordinal(index * 7 + 1)
+    return date(index // 12, index % 12 + 1, 1)
+
+def unit_label(index: int, unit: str) -> str:
+    iso = unit_start(index, unit).isoformat()
+    if unit == "day":
+        return display_date(iso)
+    if unit == "week":
+        return display_week(iso)
+    return display_month(iso[:7])
+
+
+class HoursChart(QWidget):
+    # Hours per day, week or month as bars or a line. The visible range is
+    # folded in SQL into at most one bar per chart_min_bar_px pixels, so a
+    # paint never touches more than a few hundred buckets no matter how long
+    # the history is. Dragging pans, the wheel zooms around the cursor and a
+    # double click shows everything again; each change re-queries only the
+    # visible range once the view has settled.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sources: list[str] = []
+        self.unit = "week"
+        self.line = False
+        self._extent: tuple[int, int] | None = None
+        self._bounds: tuple[date, date] | None = None
+        self._view = (0.0, 1.0)
+        self._series: list[tuple] = []
+        self._series_view: tuple[int, int, int] | None = None
+        self._generation = 0
+        self._drag: tuple[float, tuple[float, float]] | None = None
+        self._query_timer = QTimer(self)
+        self._query_timer.setSingleShot(True)
+        self._query_timer.setInterval(_conf.chart_query_delay_ms)
+        self._query_timer.timeout.connect(self._query)
+        self.setMinimumHeight(220)
+        self.setMouseTracking(True)
+        self.setFont(QFont(_conf.font, 9))
+
+    def set_data(self, sources: list[str], first: str | None, last: str | None):
+        # first/last bound the data; pan and zoom stay inside them.
+        self.sources = sources
+        self._bounds = (date.fromisoformat(first), date.fromisoformat(last)) if first and last else None
+        self._series = []
+        self._series_view = None
+        self._reset_view()
+
+    def set_unit(self, unit: str):
+        if unit == self.unit:
+            return
+        previous, self.unit = self.unit, unit
+        self._series = []
+        self._series_view = None
+        if self._extent is None:
+            self.update()
+            return
+        # Keep roughly the same dates on screen in the new unit.
+        start, end = self._view
+        first = unit_start(int(start), previous)
+        last = unit_start(math.ceil(end), previous) - timedelta(days=1)
+        self._extent = (unit_index(self._bounds[0], unit), unit_index(self._bounds[1], unit) + 1)
+        self._set_view(unit_index(first, unit), unit_index(last, unit) + 1)
+
+    def set_line(self, line: bool):
+        self.line = line
+        self.update()
+
+    def _reset_view(self):
+        if self._bounds is None:
+            self._extent = None
+            self.update()
+            return
+        first, last = self._bounds
+        self._extent = (unit_index(first, self.unit), unit_index(last, self.unit) + 1)
+        self._set_view(*self._extent)
+
+    def _set_view(self, start: float, end: float):
+        lo, hi = self._extent
+        span = min(max(end - start, min(5, hi - lo)), hi - lo)
+        start = min(max(start, lo), hi - span)
+        self._view = (start, start + span)
+        self.update()
+        self._query_timer.start()
+
+    def _plot_rect(self) -> QRectF:
+        return QRectF(self.rect()).adjusted(48, 30, -12, -28)
+
+    def _per_bucket(self) -> int:
+        start, end = self._view
+        bars = max(1, int(self._plot_rect().width() / _conf.chart_min_bar_px))
+        return max(1, math.ceil((end - start) / bars))
+
+    def _query(self):
+        if self._extent is None or not self.sources:
+            return
+        per_bucket = self._per_bucket()
+        # Buckets start on multiples of per_bucket so they stay put while panning.
+        first = math.floor(self._view[0] / per_bucket) * per_bucket
+        last = min(math.ceil(self._view[1]), self._extent[1]) - 1
+        if self._series_view == (first, last, per_bucket):
+            return
+        self._generation += 1
+        generation = self._generation
+        date_to = unit_start(last + 1, self.unit) - timedelta(days=1)
+        get_executor().read(
+            chart_series_for, self.sources, self.unit,
+            unit_start(first, self.unit).isoformat(), date_to.isoformat(), per_bucket,
+            on_done=lambda rows: self._series_loaded(generation, (first, last, per_bucket), rows),
+        )
+
+    def _series_loaded(self, generation: int, view: tuple[int, int, int], rows):
+        if generation != self._generation:
+            return
+        self._series = rows
+        self._series_view = view
+        self.update()
+
+    def _buckets(self):
+        # (first unit, units, average hours per unit, busiest unit in hours)
+        if self._series_view is None:
+            return
+        first, last, per_bucket = self._series_view
+        for bucket, _, seconds, peak in self._series:
+            start = first + bucket * per_bucket
+            units = max(1, min(per_bucket, last + 1 - start))
+            yield start, units, seconds / units / 3600, peak / 3600
+
+    def _x(self, unit: float, plot: QRectF) -> float:
+        start, end = self._view
+        return plot.left() + (unit - start) / (end - start) * plot.width()
+
+    def _unit_at(self, x: float) -> float:
+        plot = self._plot_rect()
+        start, end = self._view
+        return start + (x - plot.left()) / max(1.0, plot.width()) * (end - start)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        plot = self._plot_rect()
+        painter.setPen(_TEXT)
+        if self._extent is None:
+            painter.drawText(self.rect(), Qt.AlignCenter, "Keine Einträge im Zeitraum.")
+            return
+        buckets = list(self._buckets())
+        visible = [b for b in buckets if b[0] + b[1] > self._view[0] and b[0] < self._view[1]]
+        top = max((peak for _, _, _, peak in visible), default=0)
+        step = next((s for s in _HOUR_STEPS if top / s <= 5), _HOUR_STEPS[-1])
+        scale = plot.height() / (step * max(1, math.ceil(top / step)))
+
+        metrics = painter.fontMetrics()
+        for i in range(max(1, math.ceil(top / step)) + 1):
+            y = plot.bottom() - i * step * scale
+            painter.setPen(_GRID)
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(_TEXT)
+            painter.drawText(QRectF(0, y - 8, plot.left() - 6, 16), Qt.AlignRight | Qt.AlignVCenter, f"{i * step:g} h")
+
+        per_bucket = self._series_view[2] if self._series_view else 1
+        unit_px = plot.width() / (self._view[1] - self._view[0])
+        label_px = metrics.horizontalAdvance(unit_label(self._extent[0], self.unit)) + 16
+        label_every = per_bucket * max(1, math.ceil(label_px / (unit_px * per_bucket)))
+        first_label = math.ceil(self._view[0] / label_every) * label_every
+        for unit in range(first_label, math.ceil(self._view[1]), label_every):
+            x = self._x(unit, plot)
+            painter.drawText(QRectF(x - label_px / 2, plot.bottom() + 4, label_px, 20),
+                             Qt.AlignHCenter | Qt.AlignTop, unit_label(unit, self.unit))
+
+        painter.save()
+        painter.setClipRect(plot.adjusted(0, -2, 0, 1))
+        painter.setRenderHint(QPainter.Antialiasing, self.line)
+        if self.line:
+            average, peaks = QPainterPath(), QPainterPath()
+            for start, units, value, peak in visible:
+                x = self._x(start + units / 2, plot)
+                for path, hours in ((average, value), (peaks, peak)):
+                    point = QPointF(x, plot.bottom() - hours * scale)
+                    if path.elementCount():
+                        path.lineTo(point)
+                    else:
+                        path.moveTo(point)
+            if per_bucket > 1:
+                painter.setPen(QPen(_PEAK, 1.5))
+                painter.drawPath(peaks)
+            painter.setPen(QPen(_BAR, 2))
+            painter.drawPath(average)
+        else:
+            gap = 1 if unit_px * per_bucket >= 4 else 0
+            for start, units, value, peak in visible:
+                left, right = self._x(start, plot), self._x(start + units, plot) - gap
+                if per_bucket > 1:
+                    painter.fillRect(QRectF(left, plot.bottom() - peak * scale, right - left, 1.5), _PEAK)
+                painter.fillRect(QRectF(left, plot.bottom() - value * scale, right - left, value * scale), _BAR)
+        painter.restore()
+
+        one, many = UNITS[self.unit]
+        caption = f"Stunden je {one}"
+        if per_bucket > 1:
+            caption = f"Ø {caption} · {per_bucket} {many} zusammengefasst · hell: Spitzenwert"
+        painter.setPen(_TEXT)
+        painter.drawText(QRectF(plot.left(), 4, plot.width(), 20), Qt.AlignLeft | Qt.AlignVCenter, caption)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._query_timer.start()
+
+    def wheelEvent(self, event):
+        if self._extent is None:
+            return
+        factor = 0.8 ** (event.angleDelta().y() / 120)
+        anchor = self._unit_at(event.position().x())
+        start, end = self._view
+        self._set_view(anchor - (anchor - start) * factor, anchor + (end - anchor) * factor)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self._extent is not None:
+            self._drag = (event.position().x(), self._view)
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is not None:
+            x, (start, end) = self._drag
+            shift = (x - event.position().x()) / max(1.0, self._plot_rect().width()) * (end - start)
+            self._set_view(start + shift, end + shift)
+            return
+        unit = self._unit_at(event.position().x())
+        for start, units, value, peak in self._buckets():
+            if start <= unit < start + units:
+                text = unit_label(start, self.unit)
+                if units > 1:
+                    text += f" – {unit_label(start + units - 1, self.unit)}"
+                    text += f"\nØ {format_duration(value * 3600)} je {UNITS[self.unit][0]}"
+                    text += f"\nSpitzenwert {format_duration(peak * 3600)}"
+                else:
+                    text += f"\n{format_duration(value * 3600)}"
+                QToolTip.showText(event.globalPosition().toPoint(), text, self)
+                return
+        QToolTip.hideText()
+
+    def mouseReleaseEvent(self, event):
+        if self._drag is not None:
+            self._drag = None
+            self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self._reset_view()
@@ -0,0 +1,169 @@
+import argparse
+import os
+import sys
+import time
+
+from . import db, federation
+from .archive import archives, archivable_years, archive_year, archive_path, ArchiveError
+from .config import Config as _conf
+from .connection import close_all
+from .schema import MigrationReport
+from .formats import display_date, display_month, display_week, format_duration, to_iso_date, parse_tags
+
+# Imported by `python -m src`; must stay free of PySide6 and the GUI modules.
+
+
+def _status(args) -> int:
+    session = db.running_session(args.db_path)
+    if session is None:
+        print("Keine laufende Session.")
+        return 0
+    elapsed = format_duration(int(session.elapsed_at(time.time())))
+    state = "Pausiert" if session.paused else "Läuft"
+    print(f"{state} seit {display_date(session.date)} {session.start_time} — {elapsed}")
+    return 0
+
+def _start(args) -> int:
+    session = db.start_session(args.db_path)
+    print(f"Session gestartet um {session.start_time}.")
+    return 0
+
+def _pause(args) -> int:
+    session = db.pause_session(args.db_path)
+    print(f"Session pausiert — {format_duration(int(session.elapsed))}.")
+    return 0
+
+def _continue(args) -> int:
+    db.continue_session(args.db_path)
+    print("Session fortgesetzt.")
+    return 0
+
+def _stop(args) -> int:
+    details = db.EntryDetails(args.project.strip(), parse_tags(",".join(args.tags)), args.note.strip())
+    date, start, end, seconds = db.stop_session(args.db_path, details=details)
+    print(f"Gespeichert: {display_date(date)} {start}–{end} ({format_duration(seconds)})")
+    return 0
+
+def _report(args) -> int:
+    paths = [args.db_path, *federation.prepare_sources(args.sources)]
+    if args.by == "day":
+        rows = federation.summary_page_for(paths, limit=args.limit)
+        label = display_date
+    else:
+        month_rows, week_rows = federation.month_and_week_stats_for(paths)
+        rows = [row[:3] for row in (month_rows if args.by == "month" else week_rows)[:args.limit]]
+        label = display_month if args.by == "month" else display_week
+    if not rows:
+        print("Noch keine Einträge.")
+    for key, sessions, seconds in rows:
+        print(f"{label(key):<12} {sessions:>5} Session(s)  {format_duration(seconds):>10}")
+    return 0
+
+def _search(args) -> int:
+    rows, _ = db.entries_page(args.db_path, limit=args.limit, search=" ".join(args.query))
+    if not rows:
+        print("Keine Treffer.")
+    for _, date, start, end, seconds, project, tags, note in rows:
+        details = "  ".join(filter(None, (project, f"[{tags}]" if tags else "", note)))
+        print(f"{display_date(date)} {start}–{end} {format_duration(seconds):>10}  {details}")
+    return 0
+
+def _import(args) -> int:
+    report = db.import_csv(args.db_path, args.path)
+    print(f"{report.imported} neu, {report.duplicates} bereits vorhanden, {report.conflict_count} Konflikt(e), "
+          f"{report.error_count} Zeile(n) ungültig.")
+    for line, reason in report.conflicts:
+        print(f"Zeile {line}: Konflikt {reason}", file=sys.stderr)
+    for line, reason in report.errors:
+        print(f"Zeile {line}: {reason}", file=sys.stderr)
+    return 1 if report.error_count or report.conflict_count else 0
+
+def _export_format(path: str) -> str:
+    base = path[:-3] if path.endswith((".gz", ".xz")) else path
+    if base.endswith(".ndjson"):
+        return "ndjson"
+    return "json" if base.endswith(".json") else "csv"
+
+def _export(args) -> int:
+    fmt = args.format or _export_format(args.path)
+    date_range = {
+        "date_from": to_iso_date(args.date_from) if args.date_from else None,
+        "date_to": to_iso_date(args.date_to) if args.date_to else None,
+    }
+    if fmt == "csv":
+        count = federation.export_csv([args.db_path], args.path, **date_range)
+    else:
+        count = federation.export_json([args.db_path], args.path, ndjson=fmt == "ndjson", **date_range)
+    print(f"{count} Einträge exportiert nach {args.path}.")
+    return 0
+
+def _archive(args) -> int:
+    if args.year is None:
+        for year, path in archives(args.db_path):
+            print(f"{year}  {path}")
+        years = archivable_years(args.db_path)
+        print("Archivierbar: " + (", ".join(map(str, years)) if years else "keine abgeschlossenen Jahre"))
+        return 0
+    count = archive_year(args.db_path, args.year)
+    print(f"{count} Einträge aus {args.year} verschoben nach {archive_path(args.db_path, args.year)}.")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src", description="Work Time Tracker ohne Oberfläche.")
+    parser.add_argument("--folder", default=os.getcwd(),
+                        help=f"Ordner mit {_conf.db_file} (Standard: aktuelles Verzeichnis)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("start", help="Session starten").set_defaults(run=_start)
+    commands.add_parser("pause", help="Laufende Session pausieren").set_defaults(run=_pause)
+    commands.add_parser("continue", help="Pausierte Session fortsetzen").set_defaults(run=_continue)
+    stop = commands.add_parser("stop", help="Session beenden und speichern")
+    stop.add_argument("--project", default="", help="Projekt des Eintrags")
+    stop.add_argument("--tag", dest="tags", action="append", default=[], help="Tag (mehrfach möglich)")
+    stop.add_argument("--note", default="", help="Notiz")
+    stop.set_defaults(run=_stop)
+    commands.add_parser("status", help="Laufende Session anzeigen").set_defaults(run=_status)
+
+    report = commands.add_parser("report", help="Zusammenfassung pro Tag, Woche oder Monat")
+    report.add_argument("--by", choices=("day", "week", "month"), default="day")
+    report.add_argument("--limit", type=int, default=14)
+    report.add_argument("--with", dest="sources", action="append", default=[], metavar="DB",
+                        help="weitere Datenbank einbeziehen (mehrfach möglich)")
+    report.set_defaults(run=_report)
+
+    search = commands.add_parser("search", help="Einträge nach Projekt, Tags und Notiz durchsuchen")
+    search.add_argument("query", nargs="+", help="Suchbegriffe, projekt:name, tag:name, notiz:text")
+    search.add_argument("--limit", type=int, default=20)
+    search.set_defaults(run=_search)
+
+    imp = commands.add_parser("import", help="CSV importieren")
+    imp.add_argument("path")
+    imp.set_defaults(run=_import)
+
+    exp = commands.add_parser("export", help="Als CSV, JSON oder NDJSON exportieren (.gz/.xz komprimiert)")
+    exp.add_argument("path")
+    exp.add_argument("--format", choices=("csv", "json", "ndjson"),
+                     help="Standard: aus der Dateiendung abgeleitet")
+    exp.add_argument("--from", dest="date_from", metavar="DATUM", help="erster Tag (31.12.2026 oder 2026-12-31)")
+    exp.add_argument("--to", dest="date_to", metavar="DATUM", help="letzter Tag")
+    exp.set_defaults(run=_export)
+
+    arc = commands.add_parser("archive", help="Abgeschlossenes Jahr in eine schreibgeschützte Archivdatei verschieben")
+    arc.add_argument("year", type=int, nargs="?", help="ohne Angabe: vorhandene und archivierbare Jahre anzeigen")
+    arc.set_defaults(run=_archive)
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        report = MigrationReport()
+        args.db_path = db.ensure_database(args.folder, report=report)
+        if report.removed_duplicates:
+            backup = f", Sicherung: {report.backup_path}" if report.backup_path else ""
+            print(f"Hinweis: doppelte Einträge entfernt: {report.removed_duplicates}{backup}", file=sys.stderr)
+        return args.run(args)
+    except (db.SessionError, ArchiveError, federation.SourceError, ValueError, OSError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        close_all()
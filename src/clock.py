@@ -0,0 +1,85 @@
+import math
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+# Tolerance for a single-shot that fires a hair before its second boundary.
+_EARLY_S = 0.01
+
+
+class SessionClock(QObject):
+    # Elapsed time is measured with time.monotonic(), so NTP corrections and
+    # DST changes do not move the display. Instead of a free-running interval
+    # timer there is one single-shot aimed at the next full second of elapsed
+    # time, scheduled only while the clock runs and the window is visible;
+    # stopped, paused, hidden or minimized, the app does not wake up at all.
+    tick = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._base = 0.0
+        self._since: float | None = None
+        self._visible = True
+        self._shown: int | None = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._since is not None
+
+    def elapsed(self) -> float:
+        if self._since is None:
+            return self._base
+        return self._base + time.monotonic() - self._since
+
+    def start(self, elapsed: float = 0.0):
+        self._base = max(0.0, elapsed)
+        self._since = time.monotonic()
+        self._shown = None
+        self._update()
+
+    def pause(self) -> float:
+        self.hold(self.elapsed())
+        return self._base
+
+    def hold(self, elapsed: float):
+        self._base = max(0.0, elapsed)
+        self._since = None
+        self._timer.stop()
+        self._emit(int(self._base))
+
+    def reset(self):
+        self._base = 0.0
+        self._since = None
+        self._shown = None
+        self._timer.stop()
+
+    def set_visible(self, visible: bool):
+        if visible == self._visible:
+            return
+        self._visible = visible
+        if visible:
+            # Catch up at once; nothing was drawn while hidden.
+            self._update()
+        else:
+            self._timer.stop()
+
+    def _emit(self, second: int):
+        if second != self._shown:
+            self._shown = second
+            self.tick.emit(second)
+
+    def _update(self):
+        if self._since is None or not self._visible:
+            self._timer.stop()
+            return
+        elapsed = self.elapsed()
+        second = int(elapsed + _EARLY_S)
+        self._emit(second)
+        self._timer.start(max(1, math.ceil((second + 1 - elapsed) * 1000)))
+
+    def _on_timeout(self):
+        self._update()
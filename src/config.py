@@ -11,51 +11,469 @@ class Config:
     db_file = "work_time.db"
 
 # Database
+    db_readers = 4
+    db_busy_timeout_ms = 5000
+    db_cached_statements = 128
+    db_job_threads = 2
+
+    txt_journal_mode = "PRAGMA journal_mode = WAL"
+    txt_connection_pragmas = (
+        f"PRAGMA busy_timeout = {db_busy_timeout_ms}",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -16000",
+        "PRAGMA temp_store = MEMORY",
+    )
+
+    schema_version = 8
+    migration_chunk_size = 5000
+    import_chunk_size = 5000
+    import_max_reported_errors = 1000
+    export_batch_size = 2000
+    entries_page_size = 200
+    summary_page_size = 30
+
+    backup_pages_per_step = 256
+    backup_folder = "backups"
+    backup_keep_daily = 7
+    backup_keep_weekly = 4
+    backup_interval_ms = 60 * 60 * 1000
+
+    session_checkpoint_ms = 60 * 1000
+    session_checkpoint_max_ms = 10 * 60 * 1000
+    session_checkpoint_budget_ms = 20
+    session_recovery_gap_s = 5 * 60
+
+    analytics_length_bounds = (15 * 60, 30 * 60, 60 * 60, 2 * 60 * 60, 4 * 60 * 60, 8 * 60 * 60)
+    analytics_rolling_weeks = 4
+
+    federation_attach_limit = 10
+
+    result_cache_entries = 64
+    result_cache_rows = 250_000
+
+    chart_min_bar_px = 3
+    chart_query_delay_ms = 60
+
+    # Closed years move to <stem>_archiv_<year>.db next to the live database.
+    archive_file_pattern = r".+_archiv_\d{4}\.db"
+    archive_mmap_size = 256 * 1024 * 1024
+
+    slow_query_ms = 100
+    slow_query_history = 50
+    trace_history = 500
+
+    # Keyset columns per sortable field; each ends in the primary key so the order is total.
+    entry_sort_keys = {
+        "id":       ("id",),
+        "date":     ("date", "start_time", "id"),
+        "duration": ("duration_seconds", "id"),
+    }
+
+    txt_user_version = "PRAGMA user_version"
+    txt_data_version = "PRAGMA data_version"
+    txt_table_exists = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
     txt_ensure_db = """
         CREATE TABLE IF NOT EXISTS work_time (
-            id         INTEGER PRIMARY KEY AUTOINCREMENT,
-            date       TEXT NOT NULL,
-            start_time TEXT NOT NULL,
-            end_time   TEXT NOT NULL,
-            duration   TEXT NOT NULL
+            id               INTEGER PRIMARY KEY AUTOINCREMENT,
+            date             TEXT    NOT NULL,
+            start_time       TEXT    NOT NULL,
+            end_time         TEXT    NOT NULL,
+            duration_seconds INTEGER NOT NULL
         )
     """
-    txt_new_db = """
-        CREATE TABLE IF NOT EXISTS work_time (
-            id         INTEGER PRIMARY KEY AUTOINCREMENT,
-            date       TEXT NOT NULL,
-            start_time TEXT NOT NULL,
-            end_time   TEXT NOT NULL,
-            duration   TEXT NOT NULL
-        )
-    """
-    txt_insert_entry = "INSERT INTO work_time (date, start_time, end_time, duration) VALUES (?, ?, ?, ?)"
-    txt_summary_by_date = """
-        SELECT date,
-               COUNT(*),
-               SUM(strftime('%s', duration) - strftime('%s', '00:00:00'))
+    txt_ensure_indexes = (
+        """
+        CREATE INDEX IF NOT EXISTS idx_work_time_date
+            ON work_time (date, start_time, duration_seconds)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_work_time_duration ON work_time (duration_seconds)",
+    )
+
+    # Single row (id = 1) while a session is running. started_at is the epoch
+    # the elapsed time counts from; elapsed holds the frozen value while paused.
+    # checkpoint_at is the last time the GUI owning the session was alive.
+    txt_running_session_table = """
+        CREATE TABLE IF NOT EXISTS running_session (
+            id            INTEGER PRIMARY KEY CHECK (id = 1),
+            date          TEXT    NOT NULL,
+            start_time    TEXT    NOT NULL,
+            started_at    REAL    NOT NULL,
+            elapsed       REAL    NOT NULL DEFAULT 0,
+            paused        INTEGER NOT NULL DEFAULT 0,
+            checkpoint_at REAL
+        )
+    """
+    txt_table_columns = "SELECT name FROM pragma_table_info(?)"
+    txt_session_add_checkpoint = "ALTER TABLE running_session ADD COLUMN checkpoint_at REAL"
+
+# A session is identified by its day, start and end (natural key).
+    txt_natural_key_index = """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_work_time_natural ON work_time (date, start_time, end_time)
+    """
+    txt_duplicate_ids = """
+        SELECT id FROM work_time w WHERE EXISTS (
+            SELECT 1 FROM work_time o
+            WHERE o.date = w.date AND o.start_time = w.start_time AND o.end_time = w.end_time AND o.id < w.id
+        )
+    """
+    txt_database_file = "SELECT file FROM pragma_database_list WHERE name = 'main'"
+
+# Projects, tags and notes. entry_search holds the same text per entry (rowid =
+# work_time.id) for full-text search and is written together with the details.
+    txt_detail_columns = {
+        "project_id": "ALTER TABLE work_time ADD COLUMN project_id INTEGER REFERENCES projects (id)",
+        "note":       "ALTER TABLE work_time ADD COLUMN note TEXT",
+    }
+    txt_detail_tables = (
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+            id   INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tags (
+            id   INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS entry_tags (
+            entry_id INTEGER NOT NULL REFERENCES work_time (id),
+            tag_id   INTEGER NOT NULL REFERENCES tags (id),
+            PRIMARY KEY (entry_id, tag_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_entry_tags_tag ON entry_tags (tag_id)",
+        "CREATE INDEX IF NOT EXISTS idx_work_time_project ON work_time (project_id)",
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS entry_search USING fts5 (
+            project, tags, note, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_time_details_delete AFTER DELETE ON work_time
+        BEGIN
+            DELETE FROM entry_tags WHERE entry_id = OLD.id;
+            DELETE FROM entry_search WHERE rowid = OLD.id;
+        END
+        """,
+    )
+    txt_project_insert = "INSERT OR IGNORE INTO projects (name) VALUES (?)"
+    txt_project_id = "SELECT id FROM projects WHERE name = ?"
+    txt_project_names = "SELECT name FROM projects ORDER BY name COLLATE NOCASE"
+    txt_tag_insert = "INSERT OR IGNORE INTO tags (name) VALUES (?)"
+    txt_tag_id = "SELECT id FROM tags WHERE name = ?"
+    txt_entry_details_set = "UPDATE work_time SET project_id = ?, note = ? WHERE id = ?"
+    txt_entry_tags_clear = "DELETE FROM entry_tags WHERE entry_id = ?"
+    txt_entry_tag_add = "INSERT OR IGNORE INTO entry_tags (entry_id, tag_id) VALUES (?, ?)"
+    txt_search_clear = "DELETE FROM entry_search WHERE rowid = ?"
+    txt_search_add = "INSERT INTO entry_search (rowid, project, tags, note) VALUES (?, ?, ?, ?)"
+    txt_search_match = "id IN (SELECT rowid FROM entry_search WHERE entry_search MATCH ?)"
+    txt_count_search = "SELECT COUNT(*) FROM work_time"
+
+# Rollups (kept current by triggers on work_time)
+    txt_rollup_tables = (
+        """
+        CREATE TABLE IF NOT EXISTS rollup_day (
+            date     TEXT PRIMARY KEY,
+            sessions INTEGER NOT NULL,
+            seconds  INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS rollup_week (
+            week_start TEXT PRIMARY KEY,
+            sessions   INTEGER NOT NULL,
+            seconds    INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS rollup_month (
+            month    TEXT PRIMARY KEY,
+            sessions INTEGER NOT NULL,
+            seconds  INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+    txt_rollup_triggers = (
+        """
+        CREATE TRIGGER IF NOT EXISTS work_time_rollup_insert AFTER INSERT ON work_time
+        BEGIN
+            INSERT INTO rollup_day (date, sessions, seconds)
+                VALUES (NEW.date, 1, NEW.duration_seconds)
+                ON CONFLICT (date) DO UPDATE
+                SET sessions = sessions + 1, seconds = seconds + excluded.seconds;
+            INSERT INTO rollup_week (week_start, sessions, seconds)
+                VALUES (COALESCE(date(NEW.date, '-6 days', 'weekday 1'), NEW.date), 1, NEW.duration_seconds)
+                ON CONFLICT (week_start) DO UPDATE
+                SET sessions = sessions + 1, seconds = seconds + excluded.seconds;
+            INSERT INTO rollup_month (month, sessions, seconds)
+                VALUES (substr(NEW.date, 1, 7), 1, NEW.duration_seconds)
+                ON CONFLICT (month) DO UPDATE
+                SET sessions = sessions + 1, seconds = seconds + excluded.seconds;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_time_rollup_delete AFTER DELETE ON work_time
+        BEGIN
+            UPDATE rollup_day SET sessions = sessions - 1, seconds = seconds - OLD.duration_seconds
+                WHERE date = OLD.date;
+            DELETE FROM rollup_day WHERE date = OLD.date AND sessions <= 0;
+            UPDATE rollup_week SET sessions = sessions - 1, seconds = seconds - OLD.duration_seconds
+                WHERE week_start = COALESCE(date(OLD.date, '-6 days', 'weekday 1'), OLD.date);
+            DELETE FROM rollup_week
+                WHERE week_start = COALESCE(date(OLD.date, '-6 days', 'weekday 1'), OLD.date) AND sessions <= 0;
+            UPDATE rollup_month SET sessions = sessions - 1, seconds = seconds - OLD.duration_seconds
+                WHERE month = substr(OLD.date, 1, 7);
+            DELETE FROM rollup_month WHERE month = substr(OLD.date, 1, 7) AND sessions <= 0;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS work_time_rollup_update
+        AFTER UPDATE OF date, duration_seconds ON work_time
+        BEGIN
+            UPDATE rollup_day SET sessions = sessions - 1, seconds = seconds - OLD.duration_seconds
+                WHERE date = OLD.date;
+            DELETE FROM rollup_day WHERE date = OLD.date AND sessions <= 0;
+            UPDATE rollup_week SET sessions = sessions - 1, seconds = seconds - OLD.duration_seconds
+                WHERE week_start = COALESCE(date(OLD.date, '-6 days', 'weekday 1'), OLD.date);
+            DELETE FROM rollup_week
+                WHERE week_start = COALESCE(date(OLD.date, '-6 days', 'weekday 1'), OLD.date) AND sessions <= 0;
+            UPDATE rollup_month SET sessions = sessions - 1, seconds = seconds - OLD.duration_seconds
+                WHERE month = substr(OLD.date, 1, 7);
+            DELETE FROM rollup_month WHERE month = substr(OLD.date, 1, 7) AND sessions <= 0;
+            INSERT INTO rollup_day (date, sessions, seconds)
+                VALUES (NEW.date, 1, NEW.duration_seconds)
+                ON CONFLICT (date) DO UPDATE
+                SET sessions = sessions + 1, seconds = seconds + excluded.seconds;
+            INSERT INTO rollup_week (week_start, sessions, seconds)
+                VALUES (COALESCE(date(NEW.date, '-6 days', 'weekday 1'), NEW.date), 1, NEW.duration_seconds)
+                ON CONFLICT (week_start) DO UPDATE
+                SET sessions = sessions + 1, seconds = seconds + excluded.seconds;
+            INSERT INTO rollup_month (month, sessions, seconds)
+                VALUES (substr(NEW.date, 1, 7), 1, NEW.duration_seconds)
+                ON CONFLICT (month) DO UPDATE
+                SET sessions = sessions + 1, seconds = seconds + excluded.seconds;
+        END
+        """,
+    )
+    txt_rollup_rebuild = (
+        "DELETE FROM rollup_day",
+        "DELETE FROM rollup_week",
+        "DELETE FROM rollup_month",
+        """
+        INSERT INTO rollup_day (date, sessions, seconds)
+        SELECT date, COUNT(*), SUM(duration_seconds)
         FROM work_time
         GROUP BY date
-        ORDER BY date DESC
-    """
-    txt_export_csv = "SELECT date, start_time, end_time, duration FROM work_time"
-    txt_import_csv = "INSERT INTO work_time (date, start_time, end_time, duration) VALUES (?, ?, ?, ?)"
-    txt_export_json = "SELECT id, date, start_time, end_time, duration FROM work_time ORDER BY date DESC"
-    txt_all_entries = "SELECT id, date, start_time, end_time, duration FROM work_time ORDER BY date DESC, start_time DESC"
-    txt_month_rows = """
-        SELECT substr(date, 4, 7) AS month,
-               COUNT(*),
-               SUM(strftime('%s', duration) - strftime('%s', '00:00:00'))
-        FROM work_time
+        """,
+        """
+        INSERT INTO rollup_week (week_start, sessions, seconds)
+        SELECT COALESCE(date(date, '-6 days', 'weekday 1'), date) AS week_start, SUM(sessions), SUM(seconds)
+        FROM rollup_day
+        GROUP BY week_start
+        """,
+        """
+        INSERT INTO rollup_month (month, sessions, seconds)
+        SELECT substr(date, 1, 7) AS month, SUM(sessions), SUM(seconds)
+        FROM rollup_day
         GROUP BY month
-        ORDER BY month DESC
+        """,
+    )
+    txt_rollup_check = {
+        "rollup_day": """
+            SELECT date, COUNT(*), SUM(duration_seconds) FROM work_time GROUP BY date
+        """,
+        "rollup_week": """
+            SELECT COALESCE(date(date, '-6 days', 'weekday 1'), date) AS week_start,
+                   COUNT(*), SUM(duration_seconds)
+            FROM work_time GROUP BY week_start
+        """,
+        "rollup_month": """
+            SELECT substr(date, 1, 7) AS month, COUNT(*), SUM(duration_seconds)
+            FROM work_time GROUP BY month
+        """,
+    }
+
+# Migration v1 -> v2 (dd.mm.yyyy / HH:MM:SS text -> ISO date / integer seconds)
+    txt_v1_rename = "ALTER TABLE work_time RENAME TO work_time_v1"
+    txt_v1_resume = "SELECT COALESCE(MAX(id), 0) FROM work_time"
+    txt_v1_chunk = """
+        SELECT id, date, start_time, end_time, duration
+        FROM work_time_v1
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+    """
+    txt_v1_copy = "INSERT INTO work_time (id, date, start_time, end_time, duration_seconds) VALUES (?, ?, ?, ?, ?)"
+    txt_v1_drop = "DROP TABLE work_time_v1"
+
+# Queries
+    txt_insert_entry = "INSERT INTO work_time (date, start_time, end_time, duration_seconds) VALUES (?, ?, ?, ?)"
+    txt_summary_by_date = "SELECT date, sessions, seconds FROM rollup_day ORDER BY date DESC"
+    txt_summary_page = "SELECT date, sessions, seconds FROM rollup_day WHERE date < ? ORDER BY date DESC LIMIT ?"
+    txt_summary_day = "SELECT date, sessions, seconds FROM rollup_day WHERE date = ?"
+    txt_count_entries = "SELECT COALESCE(SUM(sessions), 0) FROM rollup_month"
+    txt_export_csv = """
+        SELECT date, start_time, end_time, duration_seconds,
+               (SELECT name FROM projects WHERE projects.id = work_time.project_id),
+               (SELECT group_concat(name, ', ') FROM entry_tags JOIN tags ON tags.id = entry_tags.tag_id
+                WHERE entry_tags.entry_id = work_time.id),
+               note
+        FROM work_time
+    """
+    txt_max_entry_id = "SELECT COALESCE(MAX(id), 0) FROM work_time"
+    # Imports are staged per chunk; the natural-key index rejects sessions
+    # that already exist, then the rejected lines are told apart.
+    txt_import_stage_table = """
+        CREATE TEMP TABLE IF NOT EXISTS import_stage (
+            line             INTEGER PRIMARY KEY,
+            date             TEXT,
+            start_time       TEXT,
+            end_time         TEXT,
+            duration_seconds INTEGER
+        )
+    """
+    txt_import_stage_clear = "DELETE FROM temp.import_stage"
+    txt_import_stage = "INSERT INTO temp.import_stage VALUES (?, ?, ?, ?, ?)"
+    txt_import_csv = """
+        INSERT INTO work_time (date, start_time, end_time, duration_seconds)
+        SELECT date, start_time, end_time, duration_seconds FROM temp.import_stage WHERE true ORDER BY line
+        ON CONFLICT (date, start_time, end_time) DO NOTHING
+    """
+    txt_import_new_ids = """
+        SELECT w.id, MIN(s.line) FROM temp.import_stage s
+        JOIN work_time w ON w.date = s.date AND w.start_time = s.start_time AND w.end_time = s.end_time
+        WHERE w.id > ? GROUP BY w.id
     """
-    txt_week_rows = """
-        SELECT strftime('%Y-KW%W',
-                   substr(date,7,4)||'-'||substr(date,4,2)||'-'||substr(date,1,2)) AS week,
-               COUNT(*),
-               SUM(strftime('%s', duration) - strftime('%s', '00:00:00'))
+    txt_import_conflicts = """
+        SELECT s.line, w.date, w.start_time, w.end_time, w.duration_seconds, s.duration_seconds
+        FROM temp.import_stage s
+        JOIN work_time w ON w.date = s.date AND w.start_time = s.start_time AND w.end_time = s.end_time
+        WHERE w.duration_seconds != s.duration_seconds ORDER BY s.line
+    """
+    # Closed years have left the live file, so new sessions in them are also
+    # looked up by natural key in the year's archive (key = position in the list).
+    txt_archived_sessions = """
+        SELECT k.key, w.duration_seconds FROM json_each(?) k
+        JOIN work_time w ON w.date = json_extract(k.value, '$[0]')
+         AND w.start_time = json_extract(k.value, '$[1]') AND w.end_time = json_extract(k.value, '$[2]')
+    """
+    txt_delete_entry = "DELETE FROM work_time WHERE id = ?"
+    txt_delete_entries = "DELETE FROM work_time WHERE id IN (SELECT value FROM json_each(?)) RETURNING date"
+    txt_delete_matching = "DELETE FROM work_time"
+    txt_entries_page_ids = "SELECT id FROM work_time"
+    txt_entries_page = """
+        SELECT id, date, start_time, end_time, duration_seconds,
+               (SELECT name FROM projects WHERE projects.id = work_time.project_id),
+               (SELECT group_concat(name, ', ') FROM entry_tags JOIN tags ON tags.id = entry_tags.tag_id
+                WHERE entry_tags.entry_id = work_time.id),
+               note
         FROM work_time
-        GROUP BY week
-        ORDER BY week DESC
     """
+    txt_count_range = "SELECT COALESCE(SUM(sessions), 0) FROM rollup_day"
+    txt_all_entries = "SELECT id, date, start_time, end_time, duration_seconds FROM work_time ORDER BY date DESC, start_time DESC"
+    txt_month_rows = "SELECT month, sessions, seconds FROM rollup_month ORDER BY month DESC"
+    txt_week_rows = "SELECT week_start, sessions, seconds FROM rollup_week ORDER BY week_start DESC"
+    # Partial months and weeks of a date range come from the rollup_day primary key.
+    txt_month_rows_range = "SELECT substr(date, 1, 7) AS month, SUM(sessions), SUM(seconds) FROM rollup_day"
+    txt_week_rows_range = """
+        SELECT COALESCE(date(date, '-6 days', 'weekday 1'), date) AS week_start, SUM(sessions), SUM(seconds)
+        FROM rollup_day
+    """
+    txt_analytics_range = "SELECT date, start_time, duration_seconds FROM work_time"
+    # Chart series: rollup_day folded into calendar units, then per_bucket units
+    # per bar, counted from the first unit of the requested range.
+    txt_chart_keys = {
+        "day":   "date",
+        "week":  "COALESCE(date(date, '-6 days', 'weekday 1'), date)",
+        "month": "substr(date, 1, 7)",
+    }
+    txt_chart_index = {
+        "day":   "CAST(julianday({col}) AS INTEGER)",
+        "week":  "CAST(julianday({col}, '-6 days', 'weekday 1') AS INTEGER) / 7",
+        "month": "CAST(substr({col}, 1, 4) AS INTEGER) * 12 + CAST(substr({col}, 6, 2) AS INTEGER) - 1",
+    }
+    txt_chart_series = """
+        SELECT ({index} - ({origin})) / ? AS bucket, MIN(unit), SUM(seconds), MAX(seconds)
+        FROM (SELECT {key} AS unit, MIN(date) AS date, SUM(seconds) AS seconds FROM {table}{where} GROUP BY unit)
+        GROUP BY bucket ORDER BY bucket
+    """
+
+    txt_analytics_rows = "SELECT id, date, start_time, duration_seconds FROM work_time WHERE id > ? ORDER BY id"
+
+# Federated reports (one placeholder set per attached source s0, s1, ...)
+    txt_fed_attach = "ATTACH DATABASE ? AS {alias}"
+    txt_fed_user_version = "PRAGMA {alias}.user_version"
+    txt_fed_table_exists = "SELECT 1 FROM {alias}.sqlite_master WHERE type = 'table' AND name = ?"
+    txt_fed_rollup_source = "SELECT {source} AS source, {key} AS key, sessions, seconds FROM {alias}.{table}{where}"
+    txt_fed_rollup = "SELECT key, SUM(sessions), SUM(seconds), {per_source} FROM ({union}){where} GROUP BY key"
+    txt_fed_entries = """
+        SELECT {source} AS source, date, start_time, id, end_time, duration_seconds,
+               (SELECT name FROM {alias}.projects p WHERE p.id = w.project_id),
+               (SELECT group_concat(t.name, ', ') FROM {alias}.entry_tags et JOIN {alias}.tags t ON t.id = et.tag_id
+                WHERE et.entry_id = w.id),
+               note
+        FROM {alias}.work_time w{where}
+    """
+    txt_fed_chart_source = "SELECT date, seconds FROM {alias}.rollup_day{where}"
+    txt_fed_source_totals = """
+        SELECT {source}, COALESCE(SUM(sessions), 0), SUM(seconds), MIN(date), MAX(date) FROM {alias}.rollup_day{where}
+    """
+
+# Year archives (the live database is attached to the new archive as "live")
+    txt_archive_years = "SELECT DISTINCT CAST(substr(month, 1, 4) AS INTEGER) FROM rollup_month WHERE month < ? ORDER BY 1"
+    txt_archive_copy = (
+        """
+        INSERT INTO projects (id, name) SELECT id, name FROM live.projects
+        WHERE id IN (SELECT project_id FROM live.work_time WHERE date BETWEEN ? AND ?)
+        """,
+        """
+        INSERT INTO tags (id, name) SELECT id, name FROM live.tags
+        WHERE id IN (SELECT tag_id FROM live.entry_tags JOIN live.work_time w ON w.id = entry_id
+                     WHERE w.date BETWEEN ? AND ?)
+        """,
+        """
+        INSERT INTO work_time (id, date, start_time, end_time, duration_seconds, project_id, note)
+        SELECT id, date, start_time, end_time, duration_seconds, project_id, note FROM live.work_time
+        WHERE date BETWEEN ? AND ? ORDER BY date, start_time
+        """,
+        """
+        INSERT INTO entry_tags (entry_id, tag_id) SELECT entry_id, tag_id FROM live.entry_tags
+        WHERE entry_id IN (SELECT id FROM live.work_time WHERE date BETWEEN ? AND ?)
+        """,
+        """
+        INSERT INTO entry_search (rowid, project, tags, note) SELECT rowid, project, tags, note FROM live.entry_search
+        WHERE rowid IN (SELECT id FROM live.work_time WHERE date BETWEEN ? AND ?)
+        """,
+    )
+    txt_archive_copied = """
+        SELECT (SELECT COUNT(*) FROM main.work_time),
+               (SELECT COUNT(*) FROM live.work_time WHERE date BETWEEN ? AND ?)
+    """
+    # Only rows that are in the archive with the same natural key leave the live
+    # database; copies added after archiving (under a new id) go with them.
+    txt_archive_delete = """
+        DELETE FROM work_time WHERE date BETWEEN ? AND ? AND EXISTS (
+            SELECT 1 FROM archive.work_time a
+            WHERE a.date = work_time.date AND a.start_time = work_time.start_time AND a.end_time = work_time.end_time
+        )
+    """
+    txt_archive_journal = "PRAGMA journal_mode = DELETE"
+
+# Running session
+    txt_session_get = """
+        SELECT date, start_time, started_at, elapsed, paused, checkpoint_at
+        FROM running_session
+        WHERE id = 1
+    """
+    txt_session_save = """
+        INSERT OR REPLACE INTO running_session (id, date, start_time, started_at, elapsed, paused, checkpoint_at)
+        VALUES (1, ?, ?, ?, ?, ?, ?)
+    """
+    txt_session_checkpoint = "UPDATE running_session SET checkpoint_at = ? WHERE id = 1"
+    txt_session_start = "INSERT INTO running_session (id, date, start_time, started_at) VALUES (1, ?, ?, ?)"
+    txt_session_pause = "UPDATE running_session SET elapsed = ?, paused = 1 WHERE id = 1"
+    txt_session_continue = "UPDATE running_session SET started_at = ?, paused = 0 WHERE id = 1"
+    txt_session_clear = "DELETE FROM running_session WHERE id = 1"
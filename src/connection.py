@@ -0,0 +1,169 @@
+import itertools
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .config import Config as _conf
+from .tracing import TracedConnection
+
+
+def is_archive(path: str) -> bool:
+    return re.fullmatch(_conf.archive_file_pattern, os.path.basename(path)) is not None
+
+def archive_uri(path: str) -> str:
+    # Archives never change once written, so SQLite may skip locking and
+    # change detection entirely.
+    return Path(path).resolve().as_uri() + "?mode=ro&immutable=1"
+
+# Shared by all managers, so a reopened database never reuses an old version.
+_versions = itertools.count(1)
+
+
+class ConnectionManager:
+    def __init__(self, db_path: str, readers: int = _conf.db_readers):
+        self.db_path = db_path
+        self.read_only = is_archive(db_path)
+        self._write_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(readers)
+        self._opened: list[sqlite3.Connection] = []
+        self._open_lock = threading.Lock()
+        self._closed = False
+        self._version = next(_versions)
+        self._seen: dict[sqlite3.Connection, int] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            archive_uri(self.db_path) if self.read_only else self.db_path,
+            uri=self.read_only,
+            timeout=_conf.db_busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=_conf.db_cached_statements,
+            factory=TracedConnection,
+        )
+        for pragma in _conf.txt_connection_pragmas:
+            conn.execute(pragma)
+        if self.read_only:
+            conn.execute(f"PRAGMA mmap_size = {_conf.archive_mmap_size}")
+        with self._open_lock:
+            self._opened.append(conn)
+        return conn
+
+    def _writer_conn(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager is closed")
+        if self.read_only:
+            raise sqlite3.OperationalError(f"{os.path.basename(self.db_path)} ist ein schreibgeschütztes Archiv")
+        if self._writer is None:
+            self._writer = self._connect()
+            self._writer.execute(_conf.txt_journal_mode)
+        return self._writer
+
+    @contextmanager
+    def write(self):
+        waited = time.perf_counter()
+        with self._write_lock:
+            conn = self._writer_conn()
+            conn.lock_wait += time.perf_counter() - waited
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    @contextmanager
+    def read(self):
+        waited = time.perf_counter()
+        self._reader_slots.acquire()
+        waited = time.perf_counter() - waited
+        try:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection manager is closed")
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            conn.lock_wait += waited
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self._readers.put(conn)
+        finally:
+            self._reader_slots.release()
+
+    @contextmanager
+    def exclusive(self):
+        waited = time.perf_counter()
+        with self._write_lock:
+            conn = self._writer_conn()
+            conn.lock_wait += time.perf_counter() - waited
+            yield conn
+
+    def data_version(self) -> int:
+        # PRAGMA data_version moves on a connection whenever any other
+        # connection, in this process or another one, has committed. Each
+        # reader remembers the last value it saw; a reader seeing a new one
+        # advances the manager's version, so every commit is noticed by
+        # whichever reader checks next.
+        with self.read() as conn:
+            current = conn.execute(_conf.txt_data_version).fetchone()[0]
+            with self._open_lock:
+                if self._seen.get(conn) != current:
+                    self._seen[conn] = current
+                    self._version = next(_versions)
+                return self._version
+
+    def checkpoint(self, mode: str = "FULL"):
+        with self.exclusive() as conn:
+            conn.execute(f"PRAGMA wal_checkpoint({mode})")
+
+    def close(self):
+        with self._write_lock:
+            self._closed = True
+            with self._open_lock:
+                opened, self._opened = self._opened, []
+            for conn in opened:
+                conn.close()
+            self._writer = None
+            self._readers = queue.LifoQueue()
+            self._seen.clear()
+
+
+_managers: dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path: str) -> ConnectionManager:
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(key)
+        return manager
+
+
+def close_manager(db_path: str):
+    with _managers_lock:
+        manager = _managers.pop(os.path.abspath(db_path), None)
+    if manager is not None:
+        manager.close()
+
+
+def close_all():
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
@@ -1,127 +1,604 @@
 import json
 import csv
+import gzip
+import io
+import lzma
 import os
 import sqlite3
 import time
-import shutil
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 
+from .archive import archive_path
 from .config import Config as _conf
+from .backup import backup_database
+from .cache import cached
+from .connection import get_manager, close_manager
+from .formats import (
+    to_iso_date, display_date, normalize_time, parse_duration, format_duration, parse_tags, search_query,
+)
+from .schema import MigrationReport, ensure_schema, rebuild_rollups as _rebuild_rollups
 
 
 def ensure_database(database_folder: str, 
-                    filename: str = _conf.db_file) -> str:
+                    filename: str = _conf.db_file,
+                    report: MigrationReport | None = None) -> str:
     os.makedirs(database_folder, exist_ok=True)
     db_path = os.path.join(database_folder, filename)
-    conn = sqlite3.connect(db_path)
-    conn.execute(_conf.txt_ensure_db)
-    conn.commit()
-    conn.close()
+    with get_manager(db_path).exclusive() as conn:
+        ensure_schema(conn, report)
     return db_path
 
 def change_database(dest_folder: str) -> str:
     os.makedirs(dest_folder, exist_ok=True)
     return os.path.join(dest_folder, _conf.db_file)
 
-def clone_database(src_path: str, dest_path: str):
-    shutil.copy2(src_path, dest_path)
+def clone_database(src_path: str, dest_path: str, progress=None, cancelled=None):
+    return backup_database(src_path, dest_path, progress, cancelled)
 
 def new_database(dest_path: str):
-    conn = sqlite3.connect(dest_path)
-    conn.execute(_conf.txt_new_db)
-    conn.commit()
-    conn.close()
-
-def insert_entry(db_path: str, date: str, start: str, end: str, duration: str):
-    conn = sqlite3.connect(db_path)
-    conn.execute(
-        _conf.txt_insert_entry,
-        (date, start, end, duration),
-    )
-    conn.commit()
-    conn.close()
+    close_manager(dest_path)
+    with get_manager(dest_path).exclusive() as conn:
+        ensure_schema(conn)
+
+@dataclass
+class EntryDetails:
+    project: str = ""
+    tags: list[str] = field(default_factory=list)
+    note: str = ""
+
+    def __bool__(self) -> bool:
+        return bool(self.project or self.tags or self.note)
+
+def _name_id(conn, insert: str, select: str, name: str, ids: dict | None = None) -> int:
+    key = (insert, name.casefold())
+    if ids is not None and key in ids:
+        return ids[key]
+    conn.execute(insert, (name,))
+    name_id = conn.execute(select, (name,)).fetchone()[0]
+    if ids is not None:
+        ids[key] = name_id
+    return name_id
+
+def _save_details(conn, entry_id: int, details: EntryDetails, new: bool = False):
+    project_id = None
+    if details.project:
+        project_id = _name_id(conn, _conf.txt_project_insert, _conf.txt_project_id, details.project)
+    conn.execute(_conf.txt_entry_details_set, (project_id, details.note or None, entry_id))
+    if not new:
+        conn.execute(_conf.txt_entry_tags_clear, (entry_id,))
+        conn.execute(_conf.txt_search_clear, (entry_id,))
+    for tag in details.tags:
+        tag_id = _name_id(conn, _conf.txt_tag_insert, _conf.txt_tag_id, tag)
+        conn.execute(_conf.txt_entry_tag_add, (entry_id, tag_id))
+    if details:
+        conn.execute(_conf.txt_search_add, (entry_id, details.project, " ".join(details.tags), details.note))
+
+def _archived(conn, entries: list[tuple]) -> dict[int, int]:
+    # Position in entries -> stored duration, for sessions of archived years
+    # that their archive already holds.
+    path = conn.execute(_conf.txt_database_file).fetchone()[0]
+    if not path:
+        return {}
+    by_year: dict[str, list[int]] = {}
+    for i, entry in enumerate(entries):
+        by_year.setdefault(entry[0][:4], []).append(i)
+    found = {}
+    for year, positions in by_year.items():
+        dest = archive_path(path, year)
+        if not os.path.exists(dest):
+            continue
+        keys = json.dumps([entries[i][:3] for i in positions])
+        with get_manager(dest).read() as archive:
+            for pos, seconds in archive.execute(_conf.txt_archived_sessions, (keys,)):
+                found[positions[pos]] = seconds
+    return found
+
+def _insert(conn, entry: tuple, details: EntryDetails | None) -> int:
+    error = ValueError(f"Es gibt bereits einen Eintrag am {display_date(entry[0])} von {entry[1]} bis {entry[2]}.")
+    if _archived(conn, [entry]):
+        raise error
+    try:
+        entry_id = conn.execute(_conf.txt_insert_entry, entry).lastrowid
+    except sqlite3.IntegrityError:
+        raise error from None
+    if details:
+        _save_details(conn, entry_id, details, new=True)
+    return entry_id
+
+def _save_details_many(conn, rows: list[tuple[int, EntryDetails]]):
+    # Details of freshly inserted entries, one executemany per table.
+    ids: dict = {}
+    details_rows, tag_rows, search_rows = [], [], []
+    for entry_id, details in rows:
+        project_id = None
+        if details.project:
+            project_id = _name_id(conn, _conf.txt_project_insert, _conf.txt_project_id, details.project, ids)
+        details_rows.append((project_id, details.note or None, entry_id))
+        for tag in details.tags:
+            tag_rows.append((entry_id, _name_id(conn, _conf.txt_tag_insert, _conf.txt_tag_id, tag, ids)))
+        search_rows.append((entry_id, details.project, " ".join(details.tags), details.note))
+    conn.executemany(_conf.txt_entry_details_set, details_rows)
+    conn.executemany(_conf.txt_entry_tag_add, tag_rows)
+    conn.executemany(_conf.txt_search_add, search_rows)
+
+def insert_entry(db_path: str, date: str, start: str, end: str, duration_seconds: int,
+                 details: EntryDetails | None = None) -> int:
+    with get_manager(db_path).write() as conn:
+        return _insert(conn, (date, start, end, duration_seconds), details)
+
+def set_entry_details(db_path: str, entry_id: int, details: EntryDetails):
+    with get_manager(db_path).write() as conn:
+        _save_details(conn, entry_id, details)
+
+def project_names(db_path: str) -> list[str]:
+    with get_manager(db_path).read() as conn:
+        return [r[0] for r in conn.execute(_conf.txt_project_names)]
+
+def delete_entry(db_path: str, entry_id: int):
+    with get_manager(db_path).write() as conn:
+        conn.execute(_conf.txt_delete_entry, (entry_id,))
+
+# Bulk deletes run as one statement in one transaction; the rollup triggers
+# adjust the affected days, and the returned dates tell the summary which
+# rows to refresh.
+
+def delete_entries(db_path: str, entry_ids: list[int]) -> list[str]:
+    with get_manager(db_path).write() as conn:
+        rows = conn.execute(_conf.txt_delete_entries, (json.dumps(list(entry_ids)),)).fetchall()
+    return sorted({row[0] for row in rows})
+
+def delete_matching(db_path: str, date_from: str | None = None, date_to: str | None = None,
+                    search: str | None = None) -> list[str]:
+    clauses, params = _search_range(date_from, date_to, search)
+    sql = _conf.txt_delete_matching
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    with get_manager(db_path).write() as conn:
+        rows = conn.execute(sql + " RETURNING date", params).fetchall()
+    return sorted({row[0] for row in rows})
+
+class SessionError(Exception):
+    pass
 
+@dataclass
+class RunningSession:
+    date: str
+    start_time: str
+    started_at: float
+    elapsed: float
+    paused: bool
+    checkpoint_at: float | None = None
+
+    def elapsed_at(self, now: float) -> float:
+        return self.elapsed if self.paused else now - self.started_at
+
+def _load_session(conn) -> RunningSession | None:
+    row = conn.execute(_conf.txt_session_get).fetchone()
+    if row is None:
+        return None
+    date, start, started_at, elapsed, paused, checkpoint_at = row
+    return RunningSession(date, start, started_at, elapsed, bool(paused), checkpoint_at)
+
+def running_session(db_path: str) -> RunningSession | None:
+    with get_manager(db_path).read() as conn:
+        return _load_session(conn)
+
+def start_session(db_path: str, now: float | None = None) -> RunningSession:
+    now = time.time() if now is None else now
+    stamp = datetime.fromtimestamp(now)
+    session = RunningSession(stamp.date().isoformat(), stamp.strftime("%H:%M:%S"), now, 0, False)
+    with get_manager(db_path).write() as conn:
+        if _load_session(conn) is not None:
+            raise SessionError("Es läuft bereits eine Session.")
+        conn.execute(_conf.txt_session_start, (session.date, session.start_time, now))
+    return session
+
+def pause_session(db_path: str, now: float | None = None) -> RunningSession:
+    now = time.time() if now is None else now
+    with get_manager(db_path).write() as conn:
+        session = _load_session(conn)
+        if session is None or session.paused:
+            raise SessionError("Es läuft keine Session.")
+        session.elapsed = session.elapsed_at(now)
+        session.paused = True
+        conn.execute(_conf.txt_session_pause, (session.elapsed,))
+    return session
+
+def continue_session(db_path: str, now: float | None = None) -> RunningSession:
+    now = time.time() if now is None else now
+    with get_manager(db_path).write() as conn:
+        session = _load_session(conn)
+        if session is None or not session.paused:
+            raise SessionError("Es gibt keine pausierte Session.")
+        session.started_at = now - session.elapsed
+        session.paused = False
+        conn.execute(_conf.txt_session_continue, (session.started_at,))
+    return session
+
+def stop_session(db_path: str, now: float | None = None,
+                 details: EntryDetails | None = None) -> tuple[str, str, str, int]:
+    now = time.time() if now is None else now
+    with get_manager(db_path).write() as conn:
+        session = _load_session(conn)
+        if session is None:
+            raise SessionError("Es läuft keine Session.")
+        entry = (session.date, session.start_time, datetime.fromtimestamp(now).strftime("%H:%M:%S"),
+                 int(session.elapsed_at(now)))
+        _insert(conn, entry, details)
+        conn.execute(_conf.txt_session_clear)
+    return entry
+
+def save_session(db_path: str, session: RunningSession):
+    with get_manager(db_path).write() as conn:
+        conn.execute(_conf.txt_session_save, (session.date, session.start_time, session.started_at,
+                                              session.elapsed, int(session.paused), session.checkpoint_at))
+
+def clear_session(db_path: str):
+    with get_manager(db_path).write() as conn:
+        conn.execute(_conf.txt_session_clear)
+
+def checkpoint_session(db_path: str, now: float | None = None) -> tuple[RunningSession | None, float]:
+    # WAL with synchronous=NORMAL commits without fsync, so a checkpoint costs
+    # one small page write; the measured time is returned to the caller.
+    now = time.time() if now is None else now
+    started = time.perf_counter()
+    with get_manager(db_path).write() as conn:
+        conn.execute(_conf.txt_session_checkpoint, (now,))
+        session = _load_session(conn)
+    return session, time.perf_counter() - started
+
+def complete_session(db_path: str, date: str, start: str, end: str, duration_seconds: int,
+                     details: EntryDetails | None = None):
+    with get_manager(db_path).write() as conn:
+        _insert(conn, (date, start, end, duration_seconds), details)
+        conn.execute(_conf.txt_session_clear)
+
+@cached
 def summary_by_date(db_path: str):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute(_conf.txt_summary_by_date)
-    rows = cursor.fetchall()
-    conn.close()
+    with get_manager(db_path).read() as conn:
+        rows = conn.execute(_conf.txt_summary_by_date).fetchall()
     return [
         {
             "date": r[0],
             "count": r[1],
             "total_seconds": r[2] or 0,
-            "total_str": time.strftime("%H:%M:%S", time.gmtime(r[2] or 0)),
+            "total_str": format_duration(r[2]),
         }
         for r in rows
     ]
 
-def export_csv(db_path: str, path: str):
-    conn = sqlite3.connect(db_path)
-    rows = conn.execute(_conf.txt_export_csv).fetchall()
-    conn.close()
-    import csv
-    with open(path, "w", newline="", encoding="utf-8") as f:
+@cached
+def summary_page(db_path: str, before: str | None = None,
+                 limit: int = _conf.summary_page_size):
+    with get_manager(db_path).read() as conn:
+        # "~" sorts after every digit, so no bound means "from the newest day".
+        return conn.execute(_conf.txt_summary_page, (before or "~", limit)).fetchall()
+
+@cached
+def summary_for_date(db_path: str, date: str):
+    with get_manager(db_path).read() as conn:
+        return conn.execute(_conf.txt_summary_day, (date,)).fetchone()
+
+def _date_range(date_from: str | None, date_to: str | None, column: str = "date"):
+    clauses, params = [], []
+    if date_from:
+        clauses.append(f"{column} >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append(f"{column} <= ?")
+        params.append(date_to)
+    return clauses, params
+
+def _search_range(date_from: str | None, date_to: str | None, search: str | None):
+    clauses, params = _date_range(date_from, date_to)
+    query = search_query(search or "")
+    if query is not None:
+        clauses.append(_conf.txt_search_match)
+        params.append(query)
+    return clauses, params
+
+def _where(sql: str, date_from: str | None, date_to: str | None, column: str = "date"):
+    # Range predicates on the leading column of idx_work_time_date / the rollup_day key.
+    clauses, params = _date_range(date_from, date_to, column)
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return sql, params
+
+class ExportCancelled(Exception):
+    pass
+
+def _open_export(path: str, newline: str | None = None):
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline=newline)
+    if path.endswith(".xz"):
+        return lzma.open(path, "wt", preset=3, encoding="utf-8", newline=newline)
+    return open(path, "w", encoding="utf-8", newline=newline)
+
+def _stream_rows(conn, query: str, params, total: int, progress=None, cancelled=None):
+    total = total or 1
+    cursor = conn.execute(query, params)
+    done = 0
+    while rows := cursor.fetchmany(_conf.export_batch_size):
+        if cancelled and cancelled():
+            raise ExportCancelled()
+        yield from rows
+        done += len(rows)
+        if progress:
+            progress(min(done / total, 1.0))
+
+def _export(db_path: str, path: str, write, progress=None, cancelled=None, newline=None,
+            date_from: str | None = None, date_to: str | None = None) -> int:
+    with get_manager(db_path).read() as conn:
+        conn.execute("BEGIN")
+        count_sql, count_params = _where(_conf.txt_count_range, date_from, date_to)
+        total = conn.execute(count_sql, count_params).fetchone()[0]
+
+        def stream(query: str, order: str):
+            sql, params = _where(query, date_from, date_to)
+            return _stream_rows(conn, sql + order, params, total, progress, cancelled)
+
+        try:
+            with _open_export(path, newline) as f:
+                return write(f, stream, total)
+        except ExportCancelled:
+            os.remove(path)
+            raise
+
+def export_csv(db_path: str, path: str, progress=None, cancelled=None,
+               date_from: str | None = None, date_to: str | None = None) -> int:
+    def write(f, stream, total):
         w = csv.writer(f)
         w.writerow(["Datum", 
                     "Anfangszeit", 
                     "Endzeit", 
-                    "Dauer"])
-        w.writerows(rows)
-    return len(rows)
-
-def import_csv(db_path: str, path: str):
-    imported = 0
-    errors = 0
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        conn = sqlite3.connect(db_path)
-        for row in reader:
-            try:
-                conn.execute(
-                    _conf.txt_import_csv,
-                    (
-                        row.get("Datum") or row.get("Date", ""),
-                        row.get("Anfangszeit") or row.get("Start Time", ""),
-                        row.get("Endzeit") or row.get("End Time", ""),
-                        row.get("Dauer") or row.get("Duration", ""),
-                    ),
-                )
-                imported += 1
-            except Exception:
-                errors += 1
-        conn.commit()
-        conn.close()
-    return imported, errors
-
-def export_json(db_path: str, path: str):
-    conn = sqlite3.connect(db_path)
-    rows = conn.execute(
-        _conf.txt_export_json
-    ).fetchall()
-    conn.close()
-    data = {
-        "exported_at":   datetime.now().strftime("%d.%m.%Y %H:%M:%S"),
-        "total_entries": len(rows),
-        "entries": [
-            {"id": r[0], "date": r[1], "start_time": r[2], "end_time": r[3], "duration": r[4]}
-            for r in rows
-        ],
-    }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-    return len(rows)
+                    "Dauer",
+                    "Projekt",
+                    "Tags",
+                    "Notiz"])
+        count = 0
+        for d, start, end, secs, project, tags, note in stream(_conf.txt_export_csv, " ORDER BY date, start_time"):
+            w.writerow((display_date(d), start, end, format_duration(secs), project or "", tags or "", note or ""))
+            count += 1
+        return count
+    return _export(db_path, path, write, progress, cancelled, "", date_from, date_to)
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    duplicates: int = 0
+    error_count: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    conflict_count: int = 0
+    conflicts: list[tuple[int, str]] = field(default_factory=list)
+    cancelled: bool = False
+
+    def add_error(self, line: int, reason: str):
+        self.error_count += 1
+        if len(self.errors) < _conf.import_max_reported_errors:
+            self.errors.append((line, reason))
+
+    def add_conflict(self, line: int, reason: str):
+        self.conflict_count += 1
+        if len(self.conflicts) < _conf.import_max_reported_errors:
+            self.conflicts.append((line, reason))
+
+def _csv_records(reader: csv.DictReader):
+    for row in reader:
+        yield reader.line_num, row
+
+def _convert_records(records, report: ImportReport):
+    for line, row in records:
+        try:
+            entry = (
+                to_iso_date(row.get("Datum") or row.get("Date") or ""),
+                normalize_time(row.get("Anfangszeit") or row.get("Start Time") or ""),
+                normalize_time(row.get("Endzeit") or row.get("End Time") or ""),
+                parse_duration(row.get("Dauer") or row.get("Duration") or ""),
+            )
+        except ValueError as e:
+            report.add_error(line, str(e))
+            continue
+        details = EntryDetails(
+            (row.get("Projekt") or row.get("Project") or "").strip(),
+            parse_tags(row.get("Tags") or ""),
+            (row.get("Notiz") or row.get("Note") or "").strip(),
+        )
+        yield line, entry, details
+
+def _batched(items, size: int):
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+def _import_batch(conn, batch: list[tuple[int, tuple, EntryDetails]], report: ImportReport):
+    archived = _archived(conn, [entry for _, entry, _ in batch])
+    if archived:
+        for i in sorted(archived):
+            line, (d, start, end, secs), _ = batch[i]
+            if archived[i] == secs:
+                report.duplicates += 1
+            else:
+                report.add_conflict(line, f"{display_date(d)} {start}–{end}: archiviert {format_duration(archived[i])}, "
+                                          f"in der Datei {format_duration(secs)}")
+        batch = [row for i, row in enumerate(batch) if i not in archived]
+        if not batch:
+            return
+    conn.execute(_conf.txt_import_stage_table)
+    conn.execute(_conf.txt_import_stage_clear)
+    conn.executemany(_conf.txt_import_stage, [(line, *entry) for line, entry, _ in batch])
+    last_id = conn.execute(_conf.txt_max_entry_id).fetchone()[0]
+    imported = conn.execute(_conf.txt_import_csv).rowcount
+    details = {line: d for line, _, d in batch if d}
+    if details:
+        new_ids = conn.execute(_conf.txt_import_new_ids, (last_id,)).fetchall()
+        _save_details_many(conn, [(entry_id, details[line]) for entry_id, line in new_ids if line in details])
+    conflicts = 0
+    for line, d, start, end, existing, imported_secs in conn.execute(_conf.txt_import_conflicts):
+        conflicts += 1
+        report.add_conflict(line, f"{display_date(d)} {start}–{end}: vorhanden {format_duration(existing)}, "
+                                  f"in der Datei {format_duration(imported_secs)}")
+    report.imported += imported
+    report.duplicates += len(batch) - imported - conflicts
 
+def import_csv(db_path: str, path: str, progress=None, cancelled=None,
+               chunk_size: int = _conf.import_chunk_size) -> ImportReport:
+    report = ImportReport()
+    manager = get_manager(db_path)
+    total_bytes = os.path.getsize(path) or 1
+    with open(path, "rb") as raw, io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as f:
+        rows = _convert_records(_csv_records(csv.DictReader(f)), report)
+        for batch in _batched(rows, chunk_size):
+            if cancelled and cancelled():
+                report.cancelled = True
+                break
+            with manager.write() as conn:
+                _import_batch(conn, batch, report)
+            if progress:
+                progress(min(raw.tell() / total_bytes, 1.0))
+    return report
+
+def _json_entry(row) -> dict:
+    entry = {"id": row[0], "date": display_date(row[1]), "start_time": row[2], "end_time": row[3],
+             "duration": format_duration(row[4])}
+    if row[5]:
+        entry["project"] = row[5]
+    if row[6]:
+        entry["tags"] = row[6].split(", ")
+    if row[7]:
+        entry["note"] = row[7]
+    return entry
+
+# Same layout json.dump(indent=4) produced for the whole document,
+# written entry by entry so the export never holds all rows in memory.
+def write_json(f, entries, total: int, ndjson: bool = False, date_from: str | None = None,
+               date_to: str | None = None, sources: list[str] | None = None) -> int:
+    count = 0
+    if ndjson:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+        return count
+    exported_at = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+    f.write("{\n")
+    f.write(f'    "exported_at": {json.dumps(exported_at)},\n')
+    f.write(f'    "total_entries": {total},\n')
+    if sources is not None:
+        f.write(f'    "sources": {json.dumps(sources, ensure_ascii=False)},\n')
+    if date_from or date_to:
+        f.write(f'    "date_from": {json.dumps(date_from)},\n')
+        f.write(f'    "date_to": {json.dumps(date_to)},\n')
+    f.write('    "entries": [')
+    for entry in entries:
+        text = json.dumps(entry, indent=4, ensure_ascii=False)
+        f.write(",\n" if count else "\n")
+        f.write("        " + text.replace("\n", "\n        "))
+        count += 1
+    f.write("\n    ]\n}" if count else "]\n}")
+    return count
+
+def export_json(db_path: str, path: str, ndjson: bool = False, progress=None, cancelled=None,
+                date_from: str | None = None, date_to: str | None = None) -> int:
+    order = " ORDER BY date DESC, start_time DESC"
+
+    def write(f, stream, total):
+        entries = (_json_entry(row) for row in stream(_conf.txt_entries_page, order))
+        return write_json(f, entries, total, ndjson, date_from, date_to)
+
+    return _export(db_path, path, write, progress, cancelled, date_from=date_from, date_to=date_to)
+
+@cached
+def entries_page(db_path: str, sort: str = "date", descending: bool = True, after: tuple | None = None,
+                 limit: int = _conf.entries_page_size, date_from: str | None = None,
+                 date_to: str | None = None, search: str | None = None):
+    key = _conf.entry_sort_keys[sort]
+    direction = "DESC" if descending else "ASC"
+    clauses, params = _search_range(date_from, date_to, search)
+    if after is not None:
+        placeholders = ", ".join("?" * len(key))
+        clauses.append(f"({', '.join(key)}) {'<' if descending else '>'} ({placeholders})")
+        params.extend(after)
+    order = " ORDER BY " + ", ".join(f"{c} {direction}" for c in key)
+    # The page is chosen on the bare columns first, so project and tags are
+    # looked up for its rows only and not for every search hit.
+    ids = _conf.txt_entries_page_ids
+    if clauses:
+        ids += " WHERE " + " AND ".join(clauses)
+    sql = f"{_conf.txt_entries_page} WHERE id IN ({ids}{order} LIMIT ?){order}"
+    with get_manager(db_path).read() as conn:
+        rows = conn.execute(sql, (*params, limit)).fetchall()
+    if not rows:
+        return rows, None
+    positions = {"id": 0, "date": 1, "start_time": 2, "end_time": 3, "duration_seconds": 4}
+    return rows, tuple(rows[-1][positions[c]] for c in key)
+
+@cached
+def count_entries(db_path: str, date_from: str | None = None, date_to: str | None = None,
+                  search: str | None = None) -> int:
+    if search_query(search or "") is None:
+        sql, params = _where(_conf.txt_count_range, date_from, date_to)
+    else:
+        clauses, params = _search_range(date_from, date_to, search)
+        sql = _conf.txt_count_search + " WHERE " + " AND ".join(clauses)
+    with get_manager(db_path).read() as conn:
+        return conn.execute(sql, params).fetchone()[0]
+
+@cached
 def all_entries(db_path: str):
-    conn = sqlite3.connect(db_path)
-    rows = conn.execute(_conf.txt_all_entries).fetchall()
-    conn.close()
-    return rows
-
-def month_and_week_stats(db_path: str):
-    conn = sqlite3.connect(db_path)
-    month_rows = conn.execute(_conf.txt_month_rows).fetchall()
-    week_rows = conn.execute(_conf.txt_week_rows).fetchall()
-    conn.close()
+    with get_manager(db_path).read() as conn:
+        return conn.execute(_conf.txt_all_entries).fetchall()
+
+@cached
+def month_and_week_stats(db_path: str, date_from: str | None = None, date_to: str | None = None):
+    with get_manager(db_path).read() as conn:
+        if not date_from and not date_to:
+            month_rows = conn.execute(_conf.txt_month_rows).fetchall()
+            week_rows = conn.execute(_conf.txt_week_rows).fetchall()
+            return month_rows, week_rows
+        conn.execute("BEGIN")
+        month_sql, params = _where(_conf.txt_month_rows_range, date_from, date_to)
+        month_rows = conn.execute(month_sql + " GROUP BY month ORDER BY month DESC", params).fetchall()
+        week_sql, params = _where(_conf.txt_week_rows_range, date_from, date_to)
+        week_rows = conn.execute(week_sql + " GROUP BY week_start ORDER BY week_start DESC", params).fetchall()
     return month_rows, week_rows
+
+def _chart_query(table: str, unit: str, date_from: str, date_to: str | None, per_bucket: int,
+                 ranged: bool = True) -> tuple[str, list]:
+    index = _conf.txt_chart_index[unit]
+    clauses, params = _date_range(date_from, date_to) if ranged else ([], [])
+    sql = _conf.txt_chart_series.format(
+        index=index.format(col="date"), origin=index.format(col="?"), key=_conf.txt_chart_keys[unit],
+        table=table, where=" WHERE " + " AND ".join(clauses) if clauses else "",
+    )
+    return sql, [*[date_from] * index.count("{col}"), per_bucket, *params]
+
+@cached
+def chart_series(db_path: str, unit: str, date_from: str, date_to: str | None = None, per_bucket: int = 1):
+    # (bucket, first unit, seconds, busiest unit) with bucket counted from date_from.
+    with get_manager(db_path).read() as conn:
+        return conn.execute(*_chart_query("rollup_day", unit, date_from, date_to, per_bucket)).fetchall()
+
+def rebuild_rollups(db_path: str):
+    with get_manager(db_path).write() as conn:
+        _rebuild_rollups(conn)
+
+def repair_rollups(db_path: str):
+    mismatches = check_rollups(db_path)
+    if mismatches:
+        rebuild_rollups(db_path)
+    return mismatches
+
+def check_rollups(db_path: str):
+    mismatches = []
+    with get_manager(db_path).read() as conn:
+        conn.execute("BEGIN")
+        for table, raw_query in _conf.txt_rollup_check.items():
+            expected = {r[0]: tuple(r[1:]) for r in conn.execute(raw_query)}
+            actual = {r[0]: tuple(r[1:]) for r in conn.execute(f"SELECT * FROM {table}")}
+            for key in expected.keys() | actual.keys():
+                if expected.get(key) != actual.get(key):
+                    mismatches.append((table, key, expected.get(key), actual.get(key)))
+        conn.execute("COMMIT")
+    return mismatches
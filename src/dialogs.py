@@ -1,28 +1,129 @@
 import time
 from datetime import datetime
-import sqlite3
 
-from PySide6.QtCore import QDate, QTime, Qt
-from PySide6.QtGui import QFont
+from PySide6.QtCore import QDate, QTime, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QDateEdit, QTimeEdit,
     QSpinBox, QHBoxLayout, QMessageBox, QPushButton, QTableWidget,
-    QTableWidgetItem, QHeaderView, QAbstractSpinBox
+    QTableWidgetItem, QHeaderView, QAbstractSpinBox, QTableView, QLineEdit, QPlainTextEdit,
+    QTabWidget, QWidget, QComboBox,
 )
 
-from .styles import dialog_style, spinbox_style, dialog_title, info_label, warning_label, cancel_button, primary_button
-from .db import insert_entry, all_entries, month_and_week_stats
+from .styles import (
+    dialog_title, section_title, info_label, warning_label, error_label, cancel_button, primary_button,
+    danger_button,
+)
+from .db import insert_entry, delete_entries, delete_matching, complete_session, project_names
+from .federation import month_and_week_stats_for, source_totals, source_labels
+from .formats import display_date, display_month, display_week, format_duration, parse_date_filter, period_range
+from .executor import get_executor
+from .models import EntriesModel, RowsModel
+from .widgets import EntryDetailsForm
+from .analytics import combined_report
+from .charts import HoursChart, UNITS
+from . import cache, tracing
 
 from .config import Config as _conf
 
 
+class DateRangeFilter(QWidget):
+    range_changed = Signal(object, object)
+    PERIODS = [("Alle Einträge", None), ("Diese Woche", "week"), ("Dieser Monat", "month"),
+               ("Zeitraum ...", "custom")]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.period = QComboBox()
+        for text, key in self.PERIODS:
+            self.period.addItem(text, key)
+        self.period.currentIndexChanged.connect(self._period_changed)
+        layout.addWidget(self.period)
+
+        today = QDate.currentDate()
+        self.date_from = QDateEdit(QDate(today.year(), today.month(), 1))
+        self.date_to = QDateEdit(today)
+        self.to_label = QLabel("bis")
+        for edit in (self.date_from, self.date_to):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("dd.MM.yyyy")
+            edit.dateChanged.connect(self._emit)
+        layout.addWidget(self.date_from)
+        layout.addWidget(self.to_label)
+        layout.addWidget(self.date_to)
+        layout.addStretch()
+        self._show_custom(False)
+
+    def _show_custom(self, visible: bool):
+        for widget in (self.date_from, self.to_label, self.date_to):
+            widget.setVisible(visible)
+
+    def _period_changed(self):
+        self._show_custom(self.period.currentData() == "custom")
+        self._emit()
+
+    def _emit(self):
+        self.range_changed.emit(*self.date_range())
+
+    def date_range(self) -> tuple[str | None, str | None]:
+        key = self.period.currentData()
+        if key is None:
+            return None, None
+        if key == "custom":
+            first, last = sorted((self.date_from.date(), self.date_to.date()))
+            return first.toString("yyyy-MM-dd"), last.toString("yyyy-MM-dd")
+        return period_range(key)
+
+    def set_range(self, date_from: str | None, date_to: str | None):
+        # Sets all widgets first so only one range_changed is emitted.
+        self.blockSignals(True)
+        if date_from is None and date_to is None:
+            self.period.setCurrentIndex(0)
+        else:
+            self.date_from.setDate(QDate.fromString(date_from, "yyyy-MM-dd"))
+            self.date_to.setDate(QDate.fromString(date_to, "yyyy-MM-dd"))
+            self.period.setCurrentIndex(self.period.findData("custom"))
+        self.blockSignals(False)
+        self._emit()
+
+
+class ExportRangeDialog(QDialog):
+    def __init__(self, title: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumWidth(420)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+        layout.addWidget(dialog_title(title))
+        layout.addWidget(info_label("Welche Einträge sollen exportiert werden?"))
+
+        self.range_filter = DateRangeFilter()
+        layout.addWidget(self.range_filter)
+
+        btn_layout = QHBoxLayout()
+        btn_cancel = cancel_button()
+        btn_cancel.clicked.connect(self.reject)
+        btn_ok = primary_button("Weiter")
+        btn_ok.clicked.connect(self.accept)
+        btn_layout.addWidget(btn_cancel)
+        btn_layout.addWidget(btn_ok)
+        layout.addLayout(btn_layout)
+
+    def date_range(self) -> tuple[str | None, str | None]:
+        return self.range_filter.date_range()
+
+
 class ManualEntryDialog(QDialog):
     def __init__(self, db_path: str, parent=None):
         super().__init__(parent)
         self.db_path = db_path
         self.setWindowTitle("Manueller Eintrag")
         self.setMinimumWidth(400)
-        self.setStyleSheet(dialog_style())
         self._build_ui()
 
     def _build_ui(self):
@@ -36,12 +137,7 @@ class ManualEntryDialog(QDialog):
         self.date_input.setCalendarPopup(True)
         self.date_input.setDisplayFormat("dd.MM.yyyy")
         self.date_input.setMinimumHeight(40)
-        self.date_input.setStyleSheet("""
-            QDateEdit::drop-down {
-                width: 0px;
-                border: none;
-            }
-        """)
+        self.date_input.setObjectName("plainDate")
 
         self.start_input = QTimeEdit()
         self.start_input.setDisplayFormat("HH:mm:ss")
@@ -59,7 +155,6 @@ class ManualEntryDialog(QDialog):
         self.pause_input.setSuffix(" min")
         self.pause_input.setMinimumHeight(40)
         self.pause_input.setButtonSymbols(QAbstractSpinBox.NoButtons)
-        self.pause_input.setStyleSheet(spinbox_style())
 
         for text, widget in [
             ("Datum", self.date_input),
@@ -72,17 +167,34 @@ class ManualEntryDialog(QDialog):
             layout.addWidget(lbl)
             layout.addWidget(widget)
 
+        self.details_form = EntryDetailsForm(labels=True)
+        layout.addWidget(self.details_form)
+        self._load_projects()
+
         btn_layout = QHBoxLayout()
         btn_cancel = cancel_button()
         btn_cancel.clicked.connect(self.reject)
         
-        btn_save = primary_button("Speichern")
-        btn_save.clicked.connect(self._save)
+        self.btn_save = primary_button("Speichern")
+        self.btn_save.clicked.connect(self._save)
 
         btn_layout.addWidget(btn_cancel)
-        btn_layout.addWidget(btn_save)
+        btn_layout.addWidget(self.btn_save)
         layout.addLayout(btn_layout)
 
+    def _load_projects(self):
+        get_executor().read(project_names, self.db_path, on_done=self.details_form.set_projects)
+
+    def refresh(self, db_path: str):
+        self.db_path = db_path
+        self.date_input.setDate(QDate.currentDate())
+        self.start_input.setTime(QTime(0, 0))
+        self.end_input.setTime(QTime.currentTime())
+        self.pause_input.setValue(0)
+        self.details_form.clear()
+        self.btn_save.setEnabled(True)
+        self._load_projects()
+
     def _save(self):
         if self.start_input.time() >= self.end_input.time():
             QMessageBox.warning(self, 
@@ -93,14 +205,22 @@ class ManualEntryDialog(QDialog):
         end_secs   = self.end_input.time().msecsSinceStartOfDay() // 1000
         net_secs   = max(0, end_secs - start_secs - self.pause_input.value() * 60)
 
-        insert_entry(
+        self.btn_save.setEnabled(False)
+        get_executor().write(
+            insert_entry,
             self.db_path,
-            self.date_input.date().toString("dd.MM.yyyy"),
+            self.date_input.date().toString("yyyy-MM-dd"),
             self.start_input.time().toString("HH:mm:ss"),
             self.end_input.time().toString("HH:mm:ss"),
-            time.strftime("%H:%M:%S", time.gmtime(net_secs)),
+            net_secs,
+            self.details_form.details(),
+            on_done=lambda _: self.accept(),
+            on_error=self._save_failed,
         )
-        self.accept()
+
+    def _save_failed(self, error):
+        self.btn_save.setEnabled(True)
+        QMessageBox.critical(self, "Fehler", f"Eintrag konnte nicht gespeichert werden:\n{error}")
 
 class StartTimeDialog(QDialog):
     def __init__(self, parent_window, parent=None):
@@ -108,7 +228,6 @@ class StartTimeDialog(QDialog):
         self.parent_window = parent_window
         self.setWindowTitle("Anfangszeit nachtragen")
         self.setMinimumWidth(380)
-        self.setStyleSheet(dialog_style())
         self._build_ui()
 
     def _build_ui(self):
@@ -132,9 +251,7 @@ class StartTimeDialog(QDialog):
         self.start_input.setButtonSymbols(QAbstractSpinBox.NoButtons)
         layout.addWidget(self.start_input)
 
-        self.warn = QLabel("⚠️ Die Anfangszeit darf nicht in der Zukunft liegen.")
-        self.warn.setFont(QFont(_conf.font, 9))
-        self.warn.setStyleSheet("color: #dc2626; padding: 4px;")
+        self.warn = error_label("⚠️ Die Anfangszeit darf nicht in der Zukunft liegen.")
         self.warn.setVisible(False)
         layout.addWidget(self.warn)
 
@@ -167,12 +284,15 @@ class StartTimeDialog(QDialog):
         now_secs   = QTime.currentTime().msecsSinceStartOfDay() // 1000
         start_secs = selected.msecsSinceStartOfDay() // 1000
         
+        self.parent_window.session_date  = datetime.now().date().isoformat()
         self.parent_window.session_start = selected.toString("HH:mm:ss")
         self.parent_window.elapsed_time  = 0
         self.parent_window.start_time    = time.time() - (now_secs - start_secs)
+        self.parent_window.clock.start(now_secs - start_secs)
         self.parent_window.running = True
         self.parent_window.status_label.setText("⏱  Läuft ...")
         self.parent_window._set_button_states(start=False, pause=True, cont=False, stop=True)
+        self.parent_window._session_changed()
         self.accept()
 
 class EndTimeDialog(QDialog):
@@ -181,7 +301,6 @@ class EndTimeDialog(QDialog):
         self.parent_window = parent_window
         self.setWindowTitle("Endzeit nachtragen")
         self.setMinimumWidth(380)
-        self.setStyleSheet(dialog_style())
         self._build_ui()
 
     def _build_ui(self):
@@ -197,7 +316,7 @@ class EndTimeDialog(QDialog):
         else:
             layout.addWidget(info_label(
                 "⏱ Timer gestartet um: {x}".replace("{x}", self.parent_window.session_start),
-                color="#2563eb", bg="#eff6ff",
+                tone="accent",
             ))
 
         end_label = QLabel("Wann hast du aufgehört?")
@@ -210,9 +329,7 @@ class EndTimeDialog(QDialog):
         self.end_input.setButtonSymbols(QAbstractSpinBox.NoButtons)
         layout.addWidget(self.end_input)
 
-        self.warn = QLabel()
-        self.warn.setFont(QFont(_conf.font, 9))
-        self.warn.setStyleSheet("color: #dc2626; padding: 4px;")
+        self.warn = error_label()
         self.warn.setVisible(False)
         self.warn.setWordWrap(True)
         layout.addWidget(self.warn)
@@ -259,20 +376,25 @@ class EndTimeDialog(QDialog):
         start_secs = t_start.msecsSinceStartOfDay() // 1000
         end_secs   = sel.msecsSinceStartOfDay() // 1000
         net_secs   = max(0, end_secs - start_secs)
-        import time as _time
         self.parent_window.session_end  = sel.toString("HH:mm:ss")
         self.parent_window.elapsed_time = net_secs
         self.parent_window.running = False
 
-        insert_entry(
+        today = self.parent_window.session_date
+        details = self.parent_window.take_details()
+        parent_window = self.parent_window
+        get_executor().write(
+            complete_session,
             self.parent_window.database_path,
-            datetime.now().strftime("%d.%m.%Y"),
+            today,
             self.parent_window.session_start,
             self.parent_window.session_end,
-            _time.strftime("%H:%M:%S", _time.gmtime(net_secs)),
+            net_secs,
+            details=details,
+            on_done=lambda _: parent_window.entry_saved(today, details),
+            on_error=self.parent_window._db_error,
         )
         self.parent_window._reset_timer()
-        self.parent_window.update_summary()
         self.parent_window.status_label.setText("Bereit zum Starten3")
         self.parent_window._set_button_states(start=True, pause=False, cont=False, stop=False)
         self.accept()
@@ -281,191 +403,297 @@ class AllEntriesDialog(QDialog):
     def __init__(self, db_path: str, parent=None):
         super().__init__(parent)
         self.db_path = db_path
+        self.deleted_dates: set[str] = set()
+        self._all_matching = False
+        self._selecting_all = False
         self.setWindowTitle("Alle Einträge")
-        self.setMinimumSize(700, 500)
+        self.setMinimumSize(900, 500)
         self._build_ui()
 
     def _build_ui(self):
-        self.setStyleSheet("""
-            QDialog { background-color: #ffffff; }
-            QLabel  { color: #111827; font-family: 'Segoe UI'; }
-            QTableWidget {
-                background-color: #ffffff;
-                border: 1px solid #e5e7eb;
-                border-radius: 8px;
-                gridline-color: #f3f4f6;
-                font-family: 'Segoe UI'; font-size: 10pt;
-            }
-            QTableWidget::item { padding: 8px; color: #111827; }
-            QTableWidget::item:selected { background-color: #eff6ff; color: #2563eb; }
-            QHeaderView::section {
-                background-color: #f9fafb; color: #6b7280;
-                font-weight: bold; font-family: 'Segoe UI'; font-size: 10pt;
-                padding: 8px; border: none; border-bottom: 1px solid #e5e7eb;
-            }
-            QPushButton {
-                background-color: #f3f4f6; color: #1f2937;
-                border: 1px solid #e5e7eb; border-radius: 8px;
-                padding: 8px 16px; font-family: 'Segoe UI'; font-size: 10pt;
-            }
-            QPushButton:hover { background-color: #e5e7eb; }
-        """)
+        self.setProperty("density", "compact")
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(24, 24, 24, 24)
         layout.setSpacing(16)
 
         header_layout = QHBoxLayout()
-        title = QLabel("Alle Datenbankeinträge")
-        title.setFont(QFont(_conf.font, 14, QFont.Bold))
-        header_layout.addWidget(title)
+        header_layout.addWidget(dialog_title("Alle Datenbankeinträge"))
         header_layout.addStretch()
         self.count_lbl = QLabel()
         self.count_lbl.setFont(QFont(_conf.font, 10))
-        self.count_lbl.setStyleSheet(
-            "color: #2563eb; background-color: #eff6ff; border-radius: 8px; padding: 4px 10px;"
-        )
+        self.count_lbl.setProperty("role", "badge")
         header_layout.addWidget(self.count_lbl)
         layout.addLayout(header_layout)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["ID", 
-                                              "Datum", 
-                                              "Anfangszeit",
-                                              "Endzeit",
-                                              "Dauer"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        filter_layout = QHBoxLayout()
+        self.range_filter = DateRangeFilter()
+        filter_layout.addWidget(self.range_filter)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Jahr (2026), Monat (03.2026) oder Tag (11.03.2026)")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(250)
+        self.filter_timer.timeout.connect(self._apply_filter)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        filter_layout.addWidget(self.filter_input)
+        layout.addLayout(filter_layout)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Suche in Projekt, Tags und Notiz — projekt:name, #tag, \"genauer Text\"")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(lambda: self.model.set_search(self.search_input.text()))
+        self.search_input.textChanged.connect(self.search_timer.start)
+        layout.addWidget(self.search_input)
+
+        self.model = EntriesModel(self.db_path, self)
+        self.model.total_changed.connect(self._update_count)
+        self.model.load_failed.connect(self._load_failed)
+        self.model.rowsInserted.connect(self._extend_selection)
+        self.range_filter.range_changed.connect(self.model.set_date_range)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        # Size columns from the rows on screen, not from every row paged in so far.
+        self.table.horizontalHeader().setResizeContentsPrecision(0)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(7, QHeaderView.Stretch)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self._on_sort_changed)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.ExtendedSelection)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(36)
+        # Enabling sorting sorts by the indicator once, which loads the first page.
+        self.table.horizontalHeader().setSortIndicator(self.model.sort_column, self.model.sort_order)
+        self.table.setSortingEnabled(True)
         layout.addWidget(self.table)
-
-        self._load_data()
+        self.table.selectionModel().selectionChanged.connect(self._on_selection_changed)
+        QShortcut(QKeySequence.Delete, self.table, activated=self._delete_entry)
 
         btn_layout = QHBoxLayout()
-        btn_delete = QPushButton("🗑  Eintrag löschen")
-        btn_delete.setCursor(Qt.PointingHandCursor)
-        btn_delete.setStyleSheet("""
-            QPushButton { background-color: #fef2f2; color: #dc2626;
-                          border: 1px solid #fecaca; border-radius: 8px; padding: 8px 16px; }
-            QPushButton:hover { background-color: #fee2e2; }
-            QPushButton:disabled { background-color: #f9fafb; color: #9ca3af; border-color: #e5e7eb; }
-        """)
+        btn_select_all = QPushButton("Alle Treffer auswählen")
+        btn_select_all.setCursor(Qt.PointingHandCursor)
+        btn_select_all.clicked.connect(self._select_all_matching)
 
+        self.btn_delete = btn_delete = danger_button("🗑  Eintrag löschen")
+        btn_delete.setEnabled(False)
         btn_delete.clicked.connect(self._delete_entry)
 
         btn_close = QPushButton("Schließen")
         btn_close.setCursor(Qt.PointingHandCursor)
         btn_close.clicked.connect(self.accept)
 
+        btn_layout.addWidget(btn_select_all)
         btn_layout.addWidget(btn_delete)
         btn_layout.addStretch()
         btn_layout.addWidget(btn_close)
         layout.addLayout(btn_layout)
 
-    def _load_data(self):
-        rows = all_entries(self.db_path)
-        self.table.setRowCount(len(rows))
-        for r, row in enumerate(rows):
-            for c, val in enumerate(row):
-                item = QTableWidgetItem(str(val))
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(r, c, item)
-        self.count_lbl.setText(f"{len(rows)} Einträge")
+    def refresh(self, db_path: str):
+        self.db_path = self.model.db_path = db_path
+        self.model.search = ""
+        self.deleted_dates = set()
+        self._all_matching = False
+        for edit, timer in ((self.filter_input, self.filter_timer), (self.search_input, self.search_timer)):
+            edit.blockSignals(True)
+            edit.clear()
+            edit.blockSignals(False)
+            timer.stop()
+        self.table.clearSelection()
+        self.table.scrollToTop()
+        self.range_filter.set_range(None, None)
+
+    def _load_failed(self, error):
+        QMessageBox.critical(self, "Datenbankfehler", f"Einträge konnten nicht geladen werden:\n{error}")
+
+    def _update_count(self, total: int):
+        self.count_lbl.setText(f"{total} Einträge")
+        self._update_delete_button()
+
+    def _select_all_matching(self):
+        # Selects every entry the filter and search match, including rows not
+        # loaded yet; deleting then runs on the same predicate in SQL.
+        self._selecting_all = True
+        self.table.selectAll()
+        self._selecting_all = False
+        self._all_matching = True
+        self._update_delete_button()
+
+    def _extend_selection(self, *_):
+        if self._all_matching:
+            self._select_all_matching()
+
+    def _on_selection_changed(self, *_):
+        if not self._selecting_all:
+            self._all_matching = False
+        self._update_delete_button()
+
+    def _update_delete_button(self):
+        if not hasattr(self, "btn_delete"):
+            return
+        if self._all_matching:
+            count = self.model.total
+        else:
+            count = len(self.table.selectionModel().selectedRows())
+        self.btn_delete.setEnabled(count > 0)
+        self.btn_delete.setText("🗑  Eintrag löschen" if count <= 1 else f"🗑  {count} Einträge löschen")
+
+    def _on_sort_changed(self, column: int, order):
+        # Only indexed columns can be sorted in SQL; keep the indicator on the active sort.
+        if column not in EntriesModel.SORT_FIELDS:
+            header = self.table.horizontalHeader()
+            header.blockSignals(True)
+            header.setSortIndicator(self.model.sort_column, self.model.sort_order)
+            header.blockSignals(False)
+
+    def _apply_filter(self):
+        try:
+            date_from, date_to = parse_date_filter(self.filter_input.text())
+        except ValueError:
+            self.count_lbl.setText("Ungültiger Filter")
+            return
+        self.range_filter.set_range(date_from, date_to)
 
     def _delete_entry(self):
-        row = self.table.currentRow()
-        if row < 0:
+        if self._all_matching:
+            if QMessageBox.question(
+                self, "Einträge löschen",
+                f"Alle {self.model.total} Einträge, die Filter und Suche entsprechen, wirklich löschen?",
+                QMessageBox.Yes | QMessageBox.No
+            ) == QMessageBox.Yes:
+                get_executor().write(
+                    delete_matching, self.db_path, self.model.date_from, self.model.date_to, self.model.search,
+                    on_done=self._matching_deleted, on_error=self._delete_failed,
+                )
+            return
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        if not rows:
             QMessageBox.information(self, 
                                     "Kein Eintrag gewählt", 
                                     "Bitte wähle zuerst einen Eintrag aus.")
             return
-        entry_id   = self.table.item(row, 0).text()
-        entry_date = self.table.item(row, 1).text()
-        
+        entry_ids = [self.model.entry_at(row)[0] for row in rows]
+        if len(rows) == 1:
+            entry_date = self.model.entry_at(rows[0])[1]
+            question = "Eintrag vom {x} (ID: {y}) wirklich löschen?".format(x=display_date(entry_date), y=entry_ids[0])
+        else:
+            question = f"{len(rows)} ausgewählte Einträge wirklich löschen?"
+
         if QMessageBox.question(
-            self, "Eintrag löschen",
-            "Eintrag vom {x} (ID: {y}) wirklich löschen?".format(x=entry_date, y=entry_id),
+            self, "Eintrag löschen", question,
             QMessageBox.Yes | QMessageBox.No
         ) == QMessageBox.Yes:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("DELETE FROM work_time WHERE id = ?", (entry_id,))
-            conn.commit()
-            conn.close()
-            self._load_data()
+            get_executor().write(
+                delete_entries, self.db_path, entry_ids,
+                on_done=lambda dates: self._entries_deleted(entry_ids, dates),
+                on_error=self._delete_failed,
+            )
+
+    def _entries_deleted(self, entry_ids: list[int], dates: list[str]):
+        self.model.remove_entries(entry_ids)
+        self.deleted_dates.update(dates)
+
+    def _matching_deleted(self, dates: list[str]):
+        self.model.remove_all()
+        self.deleted_dates.update(dates)
+
+    def _delete_failed(self, error):
+        QMessageBox.critical(self, "Fehler", f"Löschen fehlgeschlagen:\n{error}")
 
 class StatisticsDialog(QDialog):
-    def __init__(self, db_path: str, parent=None):
+    WEEKDAYS = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+    MONTH_HEADERS = ["Monat", "Sessions", "Gesamtzeit"]
+    WEEK_HEADERS = ["Woche", "Sessions", "Gesamtzeit"]
+
+    def __init__(self, db_path: str, parent=None, sources: list[str] | None = None):
         super().__init__(parent)
         self.db_path = db_path
+        self.sources = [db_path, *(sources or [])]
+        self._generation = 0
         self.setWindowTitle("Monats- und Wochenübersicht")
         self.setMinimumSize(650, 480)
         self._build_ui()
 
     def _build_ui(self):
-        self.setStyleSheet("""
-            QDialog { background-color: #ffffff; }
-            QLabel  { color: #111827; font-family: 'Segoe UI'; }
-            QTableWidget {
-                background-color: #ffffff; border: 1px solid #e5e7eb;
-                border-radius: 8px; gridline-color: #f3f4f6;
-                font-family: 'Segoe UI'; font-size: 10pt;
-            }
-            QTableWidget::item { padding: 8px; color: #111827; }
-            QHeaderView::section {
-                background-color: #f9fafb; color: #6b7280; font-weight: bold;
-                padding: 8px; border: none; border-bottom: 1px solid #e5e7eb;
-            }
-            QPushButton {
-                background-color: #f3f4f6; color: #1f2937;
-                border: 1px solid #e5e7eb; border-radius: 8px; padding: 8px 16px;
-            }
-            QPushButton:hover { background-color: #e5e7eb; }
-        """)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(24, 24, 24, 24)
         layout.setSpacing(16)
 
-        title = QLabel("📊 Monats- und Wochenübersicht")
-        title.setFont(QFont(_conf.font, 14, QFont.Bold))
-        layout.addWidget(title)
-
-        month_title = QLabel("Monatsübersicht")
-        month_title.setFont(QFont(_conf.font, 11, QFont.Bold))
-        month_title.setStyleSheet("color: #2563eb;")
-        layout.addWidget(month_title)
-
-        self.month_table = QTableWidget()
-        self.month_table.setColumnCount(3)
-        self.month_table.setHorizontalHeaderLabels(["Monat", 
-                                                    "Sessions", 
-                                                    "Gesamtzeit"])
-        self.month_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.month_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.month_table.verticalHeader().setVisible(False)
-        self.month_table.setAlternatingRowColors(True)
-        layout.addWidget(self.month_table)
-
-        week_title = QLabel("Wochenübersicht")
-        week_title.setFont(QFont(_conf.font, 11, QFont.Bold))
-        week_title.setStyleSheet("color: #2563eb;")
-        layout.addWidget(week_title)
-
-        self.week_table = QTableWidget()
-        self.week_table.setColumnCount(3)
-        self.week_table.setHorizontalHeaderLabels(["Woche", 
-                                                   "Sessions", 
-                                                   "Gesamtzeit"])
-        self.week_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.week_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.week_table.verticalHeader().setVisible(False)
-        self.week_table.setAlternatingRowColors(True)
-        layout.addWidget(self.week_table)
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(dialog_title("📊 Monats- und Wochenübersicht"))
+        header_layout.addStretch()
+        self.range_filter = DateRangeFilter()
+        self.range_filter.range_changed.connect(lambda *_: self._load_stats())
+        header_layout.addWidget(self.range_filter)
+        layout.addLayout(header_layout)
 
+        self.tabs = tabs = QTabWidget()
+        layout.addWidget(tabs)
+
+        overview = QWidget()
+        overview_layout = QVBoxLayout(overview)
+        overview_layout.setContentsMargins(0, 12, 0, 0)
+
+        overview_layout.addWidget(section_title("Monatsübersicht"))
+        self.month_table = self._table(self.MONTH_HEADERS)
+        overview_layout.addWidget(self.month_table)
+
+        overview_layout.addWidget(section_title("Wochenübersicht"))
+        self.week_table = self._table(self.WEEK_HEADERS)
+        overview_layout.addWidget(self.week_table)
+        tabs.addTab(overview, "Monate und Wochen")
+
+        trend = QWidget()
+        trend_layout = QVBoxLayout(trend)
+        trend_layout.setContentsMargins(0, 12, 0, 0)
+        controls = QHBoxLayout()
+        self.chart_unit = QComboBox()
+        for unit, (_, many) in UNITS.items():
+            self.chart_unit.addItem(many, unit)
+        self.chart_style = QComboBox()
+        self.chart_style.addItems(["Balken", "Linie"])
+        hint = QLabel("Ziehen verschiebt, Mausrad zoomt, Doppelklick zeigt alles.")
+        hint.setProperty("role", "muted")
+        controls.addWidget(self.chart_unit)
+        controls.addWidget(self.chart_style)
+        controls.addStretch()
+        controls.addWidget(hint)
+        trend_layout.addLayout(controls)
+        self.chart = HoursChart()
+        self.chart_unit.setCurrentIndex(self.chart_unit.findData(self.chart.unit))
+        self.chart_unit.currentIndexChanged.connect(lambda: self.chart.set_unit(self.chart_unit.currentData()))
+        self.chart_style.currentIndexChanged.connect(lambda index: self.chart.set_line(index == 1))
+        trend_layout.addWidget(self.chart, 1)
+        tabs.addTab(trend, "Verlauf")
+
+        self.weekday_table = self._table(["Wochentag", "Arbeitstage", "Gesamtzeit", "Ø pro Arbeitstag"])
+        tabs.addTab(self.weekday_table, "Wochentage")
+
+        self.heatmap_table = QTableWidget(7, 24)
+        self.heatmap_table.setHorizontalHeaderLabels([f"{h:02d}" for h in range(24)])
+        self.heatmap_table.setVerticalHeaderLabels([d[:2] for d in self.WEEKDAYS])
+        self.heatmap_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.heatmap_table.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.heatmap_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.heatmap_table.setSelectionMode(QTableWidget.NoSelection)
+        tabs.addTab(self.heatmap_table, "Tageszeiten")
+
+        self.length_table = self._table(["Sessionlänge", "Sessions", "Anteil"])
+        tabs.addTab(self.length_table, "Sessionlängen")
+
+        self.rolling_table = self._table(
+            ["Woche", "Gesamtzeit", f"Ø {_conf.analytics_rolling_weeks} Wochen"])
+        tabs.addTab(self.rolling_table, "Trend")
+
+        self.source_table = self._table(["Datenbank", "Sessions", "Gesamtzeit", "Erster Tag", "Letzter Tag"])
+        tabs.addTab(self.source_table, "Quellen")
+
+        self._set_sources()
         self._load_stats()
 
         btn_close = QPushButton("Schließen")
@@ -473,21 +701,180 @@ class StatisticsDialog(QDialog):
         btn_close.clicked.connect(self.accept)
         layout.addWidget(btn_close, alignment=Qt.AlignRight)
 
+    def refresh(self, db_path: str, sources: list[str] | None = None):
+        self.db_path = db_path
+        self.sources = [db_path, *(sources or [])]
+        self._set_sources()
+        self.range_filter.set_range(None, None)
+
+    def _set_sources(self):
+        many = len(self.sources) > 1
+        per_source = source_labels(self.sources) if many else []
+        self.month_table.model().set_headers([*self.MONTH_HEADERS, *per_source])
+        self.week_table.model().set_headers([*self.WEEK_HEADERS, *per_source])
+        self.source_table.model().set_rows([])
+        self.tabs.setTabVisible(self.tabs.indexOf(self.source_table), many)
+
+    def _table(self, headers: list[str]) -> QTableView:
+        table = QTableView()
+        table.setModel(RowsModel(headers, table))
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.setAlternatingRowColors(True)
+        return table
+
+    @staticmethod
+    def _fill_table(table: QTableView, rows, format_row=None):
+        table.model().set_rows(rows, format_row)
+
     def _load_stats(self):
-        month_rows, week_rows = month_and_week_stats(self.db_path)
+        self._generation += 1
+        generation = self._generation
+        date_range = self.range_filter.date_range()
+
+        def current(fill):
+            return lambda result: fill(result) if generation == self._generation else None
+
+        get_executor().read(month_and_week_stats_for, self.sources, *date_range,
+                            on_done=current(self._fill_stats))
+        get_executor().read(combined_report, self.sources, *date_range, on_done=current(self._fill_analytics))
+        get_executor().read(source_totals, self.sources, *date_range, on_done=current(self._fill_sources))
+
+    def _fill_stats(self, stats):
+        month_rows, week_rows = stats
+        many = len(self.sources) > 1
+
+        def formatter(display):
+            def format_row(row):
+                period, sessions, seconds, per_source = row
+                return (display(period), str(sessions), format_duration(seconds),
+                        *(format_duration(s) for s in per_source if many))
+            return format_row
+
+        self._fill_table(self.month_table, month_rows, formatter(display_month))
+        self._fill_table(self.week_table, week_rows, formatter(display_week))
+
+    def _fill_sources(self, totals):
+        firsts = [first for _, _, _, first, _ in totals if first]
+        lasts = [last for _, _, _, _, last in totals if last]
+        self.chart.set_data(self.sources, min(firsts, default=None), max(lasts, default=None))
+        if len(self.sources) == 1:
+            return
+        self._fill_table(self.source_table, [
+            (label, str(sessions), format_duration(seconds),
+             display_date(first) if first else "–", display_date(last) if last else "–")
+            for label, (_, sessions, seconds, first, last) in zip(source_labels(self.sources), totals)
+        ])
+
+    def _fill_analytics(self, report):
+        self._fill_table(self.weekday_table, [
+            (name, str(days), format_duration(total), format_duration(int(avg)))
+            for name, (days, total, avg) in zip(self.WEEKDAYS, report["weekdays"])
+        ])
+
+        heatmap = report["heatmap"]
+        peak = max(max(row) for row in heatmap) or 1
+        for weekday, row in enumerate(heatmap):
+            for hour, seconds in enumerate(row):
+                item = QTableWidgetItem()
+                item.setToolTip(f"{self.WEEKDAYS[weekday]} {hour:02d}–{hour + 1:02d} Uhr: {format_duration(seconds)}")
+                shade = int(235 * (1 - seconds / peak))
+                item.setBackground(QColor(shade, shade + (255 - shade) // 3, 255))
+                self.heatmap_table.setItem(weekday, hour, item)
+
+        bounds = _conf.analytics_length_bounds
+        labels = [f"< {format_duration(bounds[0])}"]
+        labels += [f"{format_duration(lo)} – {format_duration(hi)}" for lo, hi in zip(bounds, bounds[1:])]
+        labels.append(f"≥ {format_duration(bounds[-1])}")
+        sessions = report["sessions"] or 1
+        self._fill_table(self.length_table, [
+            (label, str(count), f"{count / sessions:.1%}")
+            for label, count in zip(labels, report["lengths"])
+        ])
+
+        self._fill_table(self.rolling_table, reversed(report["rolling"]), lambda row: (
+            display_week(row[0]), format_duration(row[1]), format_duration(int(row[2]))))
+
+
+class DiagnosticsDialog(QDialog):
+    HEADERS = ["Anweisung", "Anzahl", "p50 ms", "p90 ms", "p99 ms", "max ms", "Ø Zeilen", "Lock ms"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnose: Datenbankabfragen")
+        self.setMinimumSize(900, 600)
+        self._build_ui()
 
-        self.month_table.setRowCount(len(month_rows))
-        for r, row in enumerate(month_rows):
-            total = time.strftime("%H:%M:%S", time.gmtime(row[2] or 0))
-            for c, val in enumerate([row[0], str(row[1]), total]):
-                item = QTableWidgetItem(val)
-                item.setTextAlignment(Qt.AlignCenter)
-                self.month_table.setItem(r, c, item)
+    def _build_ui(self):
 
-        self.week_table.setRowCount(len(week_rows))
-        for r, row in enumerate(week_rows):
-            total = time.strftime("%H:%M:%S", time.gmtime(row[2] or 0))
-            for c, val in enumerate([row[0], str(row[1]), total]):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        layout.addWidget(dialog_title("🔍 Datenbankabfragen"))
+        layout.addWidget(info_label(
+            f"Laufzeiten der letzten {_conf.trace_history} Ausführungen je Anweisung, "
+            f"langsamer als {_conf.slow_query_ms} ms werden mit Abfrageplan protokolliert."
+        ))
+        self.cache_label = QLabel()
+        self.cache_label.setProperty("role", "muted")
+        layout.addWidget(self.cache_label)
+
+        self.table = QTableWidget()
+        self.table.setObjectName("diagnosticsTable")
+        self.table.setColumnCount(len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        layout.addWidget(self.table, 3)
+
+        layout.addWidget(section_title("Langsame Abfragen"))
+
+        self.slow_view = QPlainTextEdit()
+        self.slow_view.setReadOnly(True)
+        layout.addWidget(self.slow_view, 2)
+
+        btn_layout = QHBoxLayout()
+        btn_reset = QPushButton("Zurücksetzen")
+        btn_reset.clicked.connect(self._reset)
+        btn_refresh = QPushButton("Aktualisieren")
+        btn_refresh.clicked.connect(self._refresh)
+        btn_close = QPushButton("Schließen")
+        btn_close.clicked.connect(self.accept)
+        for btn in (btn_reset, btn_refresh, btn_close):
+            btn.setCursor(Qt.PointingHandCursor)
+        btn_layout.addWidget(btn_reset)
+        btn_layout.addStretch()
+        btn_layout.addWidget(btn_refresh)
+        btn_layout.addWidget(btn_close)
+        layout.addLayout(btn_layout)
+
+        self._refresh()
+
+    def _refresh(self):
+        stats = tracing.snapshot()
+        self.table.setRowCount(len(stats))
+        for r, (name, count, p50, p90, p99, worst, rows, lock_wait, _) in enumerate(stats):
+            values = [name, str(count)] + [f"{v * 1000:.2f}" for v in (p50, p90, p99, worst)]
+            values += [f"{rows:.0f}", f"{lock_wait * 1000:.1f}"]
+            for c, val in enumerate(values):
                 item = QTableWidgetItem(val)
-                item.setTextAlignment(Qt.AlignCenter)
-                self.week_table.setItem(r, c, item)
+                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter if c == 0 else Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(r, c, item)
+
+        lines = []
+        for slow in reversed(tracing.slow_queries()):
+            lines.append(f"{slow.at:%H:%M:%S}  {slow.name}  {slow.seconds * 1000:.1f} ms, {slow.rows} Zeilen")
+            lines.extend("    " + line for line in slow.plan.splitlines())
+        self.slow_view.setPlainText("\n".join(lines) or "Keine langsamen Abfragen.")
+        hits, misses, entries, rows = cache.results.stats()
+        self.cache_label.setText(f"Ergebniscache: {hits} Treffer, {misses} Abfragen, "
+                                 f"{entries} Ergebnisse mit {rows} Zeilen gespeichert")
+
+    def _reset(self):
+        tracing.reset()
+        self._refresh()
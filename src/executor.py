@@ -0,0 +1,86 @@
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Qt, Signal
+
+from .config import Config as _conf
+
+
+class DbTask:
+    def __init__(self, future: Future, cancel_event: threading.Event):
+        self.future = future
+        self._cancel = cancel_event
+
+    def cancel(self):
+        self._cancel.set()
+
+
+class DbExecutor(QObject):
+    # Emitted from worker threads; the queued connections deliver every
+    # callback on the thread that owns the executor (the GUI thread).
+    _delivered = Signal(object, object, object)
+    _progressed = Signal(object, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=_conf.db_readers, thread_name_prefix="db-reader")
+        self._jobs = ThreadPoolExecutor(max_workers=_conf.db_job_threads, thread_name_prefix="db-job")
+        self._delivered.connect(self._deliver, Qt.QueuedConnection)
+        self._progressed.connect(self._report_progress, Qt.QueuedConnection)
+
+    def read(self, fn, *args, on_done=None, on_error=None, **kwargs) -> Future:
+        return self._submit(self._readers, fn, args, kwargs, on_done, on_error)
+
+    def write(self, fn, *args, on_done=None, on_error=None, **kwargs) -> Future:
+        return self._submit(self._writer, fn, args, kwargs, on_done, on_error)
+
+    def job(self, fn, *args, on_progress=None, on_done=None, on_error=None, **kwargs) -> DbTask:
+        cancel_event = threading.Event()
+        kwargs["cancelled"] = cancel_event.is_set
+        if on_progress is not None:
+            kwargs["progress"] = lambda fraction: self._progressed.emit(on_progress, fraction)
+        future = self._submit(self._jobs, fn, args, kwargs, on_done, on_error)
+        return DbTask(future, cancel_event)
+
+    def shutdown(self):
+        for pool in (self._jobs, self._readers, self._writer):
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, pool, fn, args, kwargs, on_done, on_error) -> Future:
+        future = pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda f: self._delivered.emit(f, on_done, on_error))
+        return future
+
+    def _deliver(self, future: Future, on_done, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                traceback.print_exception(error)
+        elif on_done is not None:
+            on_done(future.result())
+
+    def _report_progress(self, callback, fraction: float):
+        callback(fraction)
+
+
+_executor: DbExecutor | None = None
+
+
+def get_executor() -> DbExecutor:
+    global _executor
+    if _executor is None:
+        _executor = DbExecutor()
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,290 @@
+import csv
+import heapq
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import db
+from .archive import archives
+from .config import Config as _conf
+from .connection import is_archive, archive_uri
+from .db import (
+    ExportCancelled, _open_export, _date_range, _json_entry, _chart_query,
+    summary_page, summary_for_date, month_and_week_stats, chart_series,
+)
+from .formats import display_date, format_duration
+from .tracing import TracedConnection
+
+# Reports across several tracker databases. Each source is attached read-only
+# to an in-memory connection and queried in place; nothing is copied. Year
+# archives of a source join in whenever the requested range reaches them and
+# are counted for the source they belong to.
+
+
+class SourceError(Exception):
+    pass
+
+def source_labels(paths: list[str]) -> list[str]:
+    # Several folders usually each hold a work_time.db, so a label takes in
+    # parent folders until it tells its file apart from all the others.
+    parts = [Path(os.path.abspath(path)).parts for path in paths]
+    depth = [1] * len(paths)
+    while True:
+        labels = [os.path.join(*p[-d:]) for p, d in zip(parts, depth)]
+        grow = [i for i, label in enumerate(labels) if labels.count(label) > 1 and depth[i] < len(parts[i])]
+        if not grow:
+            return labels
+        for i in grow:
+            depth[i] += 1
+
+def prepare_sources(paths: list[str]) -> list[str]:
+    # Sources are only ever read. A file with an older schema is refused
+    # rather than migrated, since migrating rewrites (and may clean up) it.
+    for path in paths:
+        if is_archive(path):
+            continue
+        if not os.path.isfile(path):
+            raise SourceError(f"{path} existiert nicht.")
+        with _attached([path]) as conn:
+            version = conn.execute(_conf.txt_fed_user_version.format(alias="s0")).fetchone()[0]
+            tracker = conn.execute(_conf.txt_fed_table_exists.format(alias="s0"), ("work_time",)).fetchone()
+        if tracker is None:
+            raise SourceError(f"{path} ist keine Arbeitszeit-Datenbank.")
+        if version < _conf.schema_version:
+            raise SourceError(f"{path} hat ein älteres Format. Bitte die Datei einmal als aktuelle "
+                              f"Datenbank öffnen, damit sie aktualisiert wird, und dann erneut einbeziehen.")
+    return paths
+
+def _batches(paths: list[str]):
+    for first in range(0, len(paths), _conf.federation_attach_limit):
+        yield first, paths[first:first + _conf.federation_attach_limit]
+
+def _expand(paths: list[str], date_from: str | None = None, date_to: str | None = None,
+            before: str | None = None) -> tuple[list[str], list[int]]:
+    sources, owners = [], []
+    for owner, path in enumerate(paths):
+        sources.append(path)
+        owners.append(owner)
+        if is_archive(path):
+            continue
+        for year, archive in archives(path):
+            first, last = f"{year:04d}-01-01", f"{year:04d}-12-31"
+            if (date_from and date_from > last) or (date_to and date_to < first) or (before and before <= first):
+                continue
+            sources.append(archive)
+            owners.append(owner)
+    return sources, owners
+
+@contextmanager
+def _attached(paths: list[str]):
+    conn = sqlite3.connect("file::memory:", uri=True, isolation_level=None,
+                           check_same_thread=False, factory=TracedConnection)
+    try:
+        for i, path in enumerate(paths):
+            if is_archive(path):
+                conn.execute(_conf.txt_fed_attach.format(alias=f"s{i}"), (archive_uri(path),))
+                conn.execute(f"PRAGMA s{i}.mmap_size = {_conf.archive_mmap_size}")
+            else:
+                conn.execute(_conf.txt_fed_attach.format(alias=f"s{i}"), (Path(path).resolve().as_uri() + "?mode=ro",))
+        conn.execute("BEGIN")
+        yield conn
+    finally:
+        conn.close()
+
+def _union(paths: list[str], template: str, date_from: str | None = None, date_to: str | None = None,
+           **fields) -> tuple[str, list]:
+    # The date range is applied inside every source so each one uses its own index.
+    clauses, params = _date_range(date_from, date_to)
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    sql = " UNION ALL ".join(template.format(alias=f"s{i}", source=i, where=where, **fields)
+                             for i in range(len(paths)))
+    return sql, params * len(paths)
+
+def rollup(paths: list[str], table: str, key: str, before: str | None = None, limit: int | None = None,
+           only: str | None = None, date_from: str | None = None, date_to: str | None = None):
+    # One aggregate query per batch of attached sources; per-source totals come
+    # from FILTER clauses so the breakdown costs no extra pass.
+    sources, owners = _expand(paths, date_from, date_to, before if table == "rollup_day" else None)
+    merged: dict[str, list] = {}
+    for first, batch in _batches(sources):
+        union, params = _union(batch, _conf.txt_fed_rollup_source, date_from, date_to, table=table, key=key)
+        clauses = []
+        if before is not None:
+            clauses.append("key < ?")
+            params.append(before)
+        if only is not None:
+            clauses.append("key = ?")
+            params.append(only)
+        sql = _conf.txt_fed_rollup.format(
+            per_source=", ".join(f"SUM(seconds) FILTER (WHERE source = {i})" for i in range(len(batch))),
+            union=union,
+            where=" WHERE " + " AND ".join(clauses) if clauses else "",
+        )
+        sql += " ORDER BY key DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with _attached(batch) as conn:
+            for key_value, sessions, seconds, *per_source in conn.execute(sql, params):
+                row = merged.get(key_value)
+                if row is None:
+                    row = merged[key_value] = [key_value, 0, 0, [0] * len(paths)]
+                row[1] += sessions
+                row[2] += seconds
+                for i, value in enumerate(per_source):
+                    row[3][owners[first + i]] += value or 0
+    rows = sorted(merged.values(), reverse=True)
+    if limit is not None:
+        rows = rows[:limit]
+    return [(key_value, sessions, seconds, tuple(sources)) for key_value, sessions, seconds, sources in rows]
+
+def summary_page_for(paths: list[str], before: str | None = None, limit: int = _conf.summary_page_size):
+    sources, _ = _expand(paths, before=before)
+    if len(sources) == 1:
+        return summary_page(paths[0], before, limit)
+    if len(paths) == 1:
+        # Archives hold closed years only; a full page that ends after the
+        # newest of them cannot contain archived days.
+        rows = summary_page(paths[0], before, limit)
+        if len(rows) == limit and rows[-1][0] > f"{max(archives(paths[0]))[0]:04d}-12-31":
+            return rows
+    return [row[:3] for row in rollup(paths, "rollup_day", "date", before, limit)]
+
+def summary_for_date_for(paths: list[str], date: str):
+    if len(_expand(paths, date, date)[0]) == 1:
+        return summary_for_date(paths[0], date)
+    rows = rollup(paths, "rollup_day", "date", only=date)
+    return rows[0][:3] if rows else None
+
+_WEEK_KEY = "COALESCE(date(date, '-6 days', 'weekday 1'), date)"
+
+def month_and_week_stats_for(paths: list[str], date_from: str | None = None, date_to: str | None = None):
+    if len(_expand(paths, date_from, date_to)[0]) == 1:
+        month_rows, week_rows = month_and_week_stats(paths[0], date_from, date_to)
+        return ([(*r, (r[2],)) for r in month_rows], [(*r, (r[2],)) for r in week_rows])
+    if not date_from and not date_to:
+        return rollup(paths, "rollup_month", "month"), rollup(paths, "rollup_week", "week_start")
+    return (rollup(paths, "rollup_day", "substr(date, 1, 7)", date_from=date_from, date_to=date_to),
+            rollup(paths, "rollup_day", _WEEK_KEY, date_from=date_from, date_to=date_to))
+
+def chart_series_for(paths: list[str], unit: str, date_from: str, date_to: str | None = None,
+                     per_bucket: int = 1):
+    sources, _ = _expand(paths, date_from, date_to)
+    if len(sources) == 1:
+        return chart_series(paths[0], unit, date_from, date_to, per_bucket)
+    batches = list(_batches(sources))
+    if len(batches) > 1:
+        # A unit can span batches, so they are merged per unit before folding.
+        per_unit: dict[int, list] = {}
+        for _, batch in batches:
+            for index, unit_key, seconds, _peak in _chart_batch(batch, unit, date_from, date_to, 1):
+                row = per_unit.setdefault(index, [unit_key, 0])
+                row[1] += seconds
+        buckets: dict[int, list] = {}
+        for index in sorted(per_unit):
+            unit_key, seconds = per_unit[index]
+            row = buckets.get(index // per_bucket)
+            if row is None:
+                buckets[index // per_bucket] = [index // per_bucket, unit_key, seconds, seconds]
+            else:
+                row[2] += seconds
+                row[3] = max(row[3], seconds)
+        return [tuple(row) for row in buckets.values()]
+    return _chart_batch(batches[0][1], unit, date_from, date_to, per_bucket)
+
+def _chart_batch(batch: list[str], unit: str, date_from: str, date_to: str | None, per_bucket: int):
+    union, params = _union(batch, _conf.txt_fed_chart_source, date_from, date_to)
+    sql, head = _chart_query(f"({union})", unit, date_from, date_to, per_bucket, ranged=False)
+    with _attached(batch) as conn:
+        return conn.execute(sql, head + params).fetchall()
+
+def source_totals(paths: list[str], date_from: str | None = None, date_to: str | None = None):
+    sources, owners = _expand(paths, date_from, date_to)
+    totals = [[path, 0, 0, None, None] for path in paths]
+    for first, batch in _batches(sources):
+        sql, params = _union(batch, _conf.txt_fed_source_totals, date_from, date_to)
+        with _attached(batch) as conn:
+            for source, sessions, seconds, first_day, last_day in conn.execute(sql, params):
+                total = totals[owners[first + source]]
+                total[1] += sessions
+                total[2] += seconds or 0
+                if first_day and (total[3] is None or first_day < total[3]):
+                    total[3] = first_day
+                if last_day and (total[4] is None or last_day > total[4]):
+                    total[4] = last_day
+    return [tuple(total) for total in totals]
+
+def _entries(sources: list[str], date_from: str | None = None, date_to: str | None = None,
+             descending: bool = False):
+    # Each batch is sorted by SQLite; batches are merged lazily in Python.
+    order = " ORDER BY date DESC, start_time DESC" if descending else " ORDER BY date, start_time"
+
+    def batch_rows(first, batch):
+        sql, params = _union(batch, _conf.txt_fed_entries, date_from, date_to)
+        with _attached(batch) as conn:
+            cursor = conn.execute(sql + order, params)
+            while rows := cursor.fetchmany(_conf.export_batch_size):
+                for source, *row in rows:
+                    yield (row[0], row[1], first + source, *row[2:])
+    streams = [batch_rows(first, batch) for first, batch in _batches(sources)]
+    for d, start, source, entry_id, end, secs, project, tags, note in heapq.merge(*streams, reverse=descending):
+        yield source, (entry_id, d, start, end, secs, project, tags, note)
+
+def _export(paths: list[str], path: str, write, progress=None, cancelled=None, newline=None,
+            date_from: str | None = None, date_to: str | None = None, descending: bool = False) -> int:
+    sources, owners = _expand(paths, date_from, date_to)
+    total = sum(t[1] for t in source_totals(paths, date_from, date_to))
+
+    # Archive rows carry the index of the database that owns the archive.
+    def rows():
+        done = 0
+        for source, row in _entries(sources, date_from, date_to, descending):
+            if done % _conf.export_batch_size == 0:
+                if cancelled and cancelled():
+                    raise ExportCancelled()
+                if progress:
+                    progress(min(done / (total or 1), 1.0))
+            yield owners[source], row
+            done += 1
+
+    try:
+        with _open_export(path, newline) as f:
+            return write(f, source_labels(paths), rows(), total)
+    except ExportCancelled:
+        os.remove(path)
+        raise
+
+# Several requested databases get a source column; a single database whose
+# archives joined in is exported exactly like the database alone.
+
+def export_csv(paths: list[str], path: str, progress=None, cancelled=None,
+               date_from: str | None = None, date_to: str | None = None) -> int:
+    if len(_expand(paths, date_from, date_to)[0]) == 1:
+        return db.export_csv(paths[0], path, progress, cancelled, date_from, date_to)
+    labelled = len(paths) > 1
+
+    def write(f, names, rows, total):
+        w = csv.writer(f)
+        w.writerow(["Datum", "Anfangszeit", "Endzeit", "Dauer", "Projekt", "Tags", "Notiz"]
+                   + (["Quelle"] if labelled else []))
+        count = 0
+        for source, (_, d, start, end, secs, project, tags, note) in rows:
+            row = [display_date(d), start, end, format_duration(secs), project or "", tags or "", note or ""]
+            w.writerow(row + [names[source]] if labelled else row)
+            count += 1
+        return count
+    return _export(paths, path, write, progress, cancelled, "", date_from, date_to)
+
+def export_json(paths: list[str], path: str, ndjson: bool = False, progress=None, cancelled=None,
+                date_from: str | None = None, date_to: str | None = None) -> int:
+    if len(_expand(paths, date_from, date_to)[0]) == 1:
+        return db.export_json(paths[0], path, ndjson, progress, cancelled, date_from, date_to)
+    labelled = len(paths) > 1
+
+    def write(f, names, rows, total):
+        entries = ({**_json_entry(row), "source": names[source]} if labelled else _json_entry(row)
+                   for source, row in rows)
+        return db.write_json(f, entries, total, ndjson, date_from, date_to,
+                             names if labelled else None)
+    return _export(paths, path, write, progress, cancelled, date_from=date_from, date_to=date_to,
+                   descending=not labelled)
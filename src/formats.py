@@ -0,0 +1,124 @@
+import re
+from datetime import date
+from functools import lru_cache
+
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_DE_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+_TIME = re.compile(r"(\d{1,2}):(\d{2})(?::(\d{2}))?")
+
+
+@lru_cache(maxsize=4096)
+def to_iso_date(text: str) -> str:
+    text = text.strip()
+    if m := _ISO_DATE.fullmatch(text):
+        year, month, day = m.groups()
+    elif m := _DE_DATE.fullmatch(text):
+        day, month, year = m.groups()
+    else:
+        raise ValueError(f"Ungültiges Datum: {text!r}")
+    try:
+        return date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        raise ValueError(f"Ungültiges Datum: {text!r}") from None
+
+@lru_cache(maxsize=4096)
+def display_date(iso: str) -> str:
+    try:
+        return date.fromisoformat(iso).strftime("%d.%m.%Y")
+    except ValueError:
+        return iso
+
+def display_month(iso_month: str) -> str:
+    year, _, month = iso_month.partition("-")
+    return f"{month}.{year}" if month else iso_month
+
+def display_week(week_start: str) -> str:
+    try:
+        year, week, _ = date.fromisoformat(week_start).isocalendar()
+    except ValueError:
+        return week_start
+    return f"{year}-KW{week:02d}"
+
+@lru_cache(maxsize=65536)
+def parse_duration(text: str) -> int:
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    parts = text.split(":")
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        raise ValueError(f"Ungültige Dauer: {text!r}")
+    hours, minutes, seconds = (int(p) for p in parts)
+    if minutes > 59 or seconds > 59:
+        raise ValueError(f"Ungültige Dauer: {text!r}")
+    return hours * 3600 + minutes * 60 + seconds
+
+def format_duration(seconds: int | None) -> str:
+    minutes, secs = divmod(int(seconds or 0), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+@lru_cache(maxsize=65536)
+def normalize_time(text: str) -> str:
+    text = text.strip()
+    m = _TIME.fullmatch(text)
+    if not m:
+        raise ValueError(f"Ungültige Uhrzeit: {text!r}")
+    hours, minutes, seconds = int(m[1]), int(m[2]), int(m[3] or 0)
+    if hours > 23 or minutes > 59 or seconds > 59:
+        raise ValueError(f"Ungültige Uhrzeit: {text!r}")
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+def parse_date_filter(text: str) -> tuple[str | None, str | None]:
+    text = text.strip()
+    if not text:
+        return None, None
+    if re.fullmatch(r"\d{4}", text):
+        return f"{text}-01-01", f"{text}-12-31"
+    if m := re.fullmatch(r"(\d{1,2})\.(\d{4})|(\d{4})-(\d{1,2})", text):
+        month, year = (m[1], m[2]) if m[1] else (m[4], m[3])
+        first = date(int(year), int(month), 1)
+        following = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        return first.isoformat(), date.fromordinal(following.toordinal() - 1).isoformat()
+    day = to_iso_date(text)
+    return day, day
+
+def parse_tags(text: str) -> list[str]:
+    tags: dict[str, str] = {}
+    for tag in re.split(r"[,;\s]+", text):
+        tag = tag.strip().lstrip("#")
+        if tag:
+            tags.setdefault(tag.casefold(), tag)
+    return list(tags.values())
+
+_SEARCH_COLUMNS = {"projekt": "project", "project": "project", "tag": "tags", "notiz": "note", "note": "note"}
+_SEARCH_TERM = re.compile(r'(?:(\w+):)?(#)?("[^"]*"?|[^\s"]+)')
+
+def search_query(text: str) -> str | None:
+    # Turns the search box text into an FTS5 query: words are prefix matches,
+    # "quoted text" a phrase, projekt:/tag:/notiz: or #tag limit the column.
+    terms = []
+    for m in _SEARCH_TERM.finditer(text):
+        column = _SEARCH_COLUMNS.get((m[1] or "").casefold())
+        word = m[3] if column or not m[1] else f"{m[1]} {m[3]}"
+        if m[2]:
+            column = "tags"
+        tokens = re.findall(r"\w+", word)
+        if not tokens:
+            continue
+        phrase = '"' + " ".join(tokens) + '"' + ("" if word.startswith('"') else "*")
+        terms.append(f"{column} : {phrase}" if column else phrase)
+    return " AND ".join(terms) or None
+
+def period_range(period: str, today: date | None = None) -> tuple[str, str]:
+    today = today or date.today()
+    if period == "week":
+        first = date.fromordinal(today.toordinal() - today.weekday())
+        return first.isoformat(), date.fromordinal(first.toordinal() + 6).isoformat()
+    if period == "month":
+        return parse_date_filter(f"{today.month}.{today.year}")
+    raise ValueError(f"Unbekannter Zeitraum: {period!r}")
+
+def display_range(date_from: str | None, date_to: str | None) -> str:
+    if not date_from and not date_to:
+        return "Alle Einträge"
+    return f"{display_date(date_from) if date_from else '…'} – {display_date(date_to) if date_to else '…'}"
@@ -3,21 +3,34 @@ import sys
 import time
 from datetime import datetime
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QEvent
 from PySide6.QtGui import QFont, QAction
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QTextEdit, QSizePolicy, QFrame, QPushButton,
-    QFileDialog, QMessageBox,
+    QLabel, QListView, QSizePolicy, QFrame, QPushButton,
+    QFileDialog, QMessageBox, QProgressDialog, QInputDialog, QDialog,
 )
 
 from .config import Config as _conf
-from .styles import ModernButton, ButtonStyle, main_window_style
+from .styles import ModernButton, ButtonStyle, apply_app_style
 from .db import (
     ensure_database, change_database, clone_database, new_database,
-    summary_by_date, export_csv, import_csv, export_json, insert_entry
+    import_csv,
+    repair_rollups, ExportCancelled,
+    RunningSession, running_session, save_session, clear_session, checkpoint_session, complete_session,
+    EntryDetails, project_names,
 )
-from .dialogs import ManualEntryDialog, StartTimeDialog, EndTimeDialog, AllEntriesDialog, StatisticsDialog
+from .backup import scheduled_backup, BackupCancelled
+from .schema import MigrationReport
+from .archive import archives, archivable_years, archive_year, archive_path, ArchiveError, ArchiveCancelled
+from . import federation
+from .federation import prepare_sources, SourceError
+from .executor import get_executor, DbTask
+from .models import SummaryModel
+from .clock import SessionClock
+from .widgets import EntryDetailsForm
+from .formats import display_date, format_duration
+from . import startup
 
 
 class WorkTimeTracker(QMainWindow):
@@ -29,11 +42,18 @@ class WorkTimeTracker(QMainWindow):
         self.start_time: float | None = None
         self.elapsed_time: float = 0
         self.running: bool = False
+        self.session_date: str = ""
         self.session_start: str = ""
         self.session_end: str = ""
 
+        self.executor = get_executor()
+        self._tasks: set[DbTask] = set()
+        self._backup_task: DbTask | None = None
+
         self.database_folder = os.getcwd()
-        self.database_path   = ensure_database(self.database_folder)
+        self.database_path   = os.path.join(self.database_folder, _conf.db_file)
+        self.report_sources: list[str] = []
+        self._dialogs: dict[type, QDialog] = {}
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -44,6 +64,8 @@ class WorkTimeTracker(QMainWindow):
         layout.addWidget(self._create_header())
         layout.addWidget(self._create_timer_card())
         layout.addLayout(self._create_button_layout())
+        self.details_form = EntryDetailsForm()
+        layout.addWidget(self.details_form)
         layout.addLayout(self._create_button_2_layout())
         layout.addWidget(self._create_summary_card())
         layout.addLayout(self._create_actions_layout())
@@ -51,32 +73,53 @@ class WorkTimeTracker(QMainWindow):
         layout.addLayout(self._create_database_layout())
         layout.addStretch()
 
-        self.db_path_label.setText(self._format_path(self.database_path))
-        self.update_summary()
+        self._update_path_label()
+        self._database_requested = False
         self._apply_styles()
         self._setup_menu()
-
-        self.clock_timer = QTimer(self)
-        self.clock_timer.timeout.connect(self._update_clock)
-        self.clock_timer.start(1000)
+        self.btn_start.setEnabled(False)
+        self._set_database_controls(False)
+
+        self.clock = SessionClock(self)
+        self.clock.tick.connect(self._show_elapsed)
+
+        self.backup_timer = QTimer(self)
+        self.backup_timer.timeout.connect(self._scheduled_backup)
+        self.backup_timer.start(_conf.backup_interval_ms)
+
+        self.checkpoint_timer = QTimer(self)
+        self.checkpoint_timer.setInterval(_conf.session_checkpoint_ms)
+        self.checkpoint_timer.timeout.connect(self._checkpoint_session)
+        self._checkpoint_pending = False
+        self._session_generation = 0
+        self.checkpoint_cost: float = 0
+
+    def _open_database(self):
+        report = MigrationReport()
+        self.executor.write(ensure_database, self.database_folder, report=report,
+                            on_done=lambda path: self._database_ready(path, report), on_error=self._open_failed)
+
+    def _open_failed(self, error):
+        # Another folder can still be chosen from the menu.
+        self.menuBar().setEnabled(True)
+        self._db_error(error)
+
+    def _set_database_controls(self, enabled: bool):
+        # Start is enabled separately, once the running session has been restored.
+        for widget in (self.man_entry_button, self.btn_start_time, self.btn_end_time, self.btn_csv_export,
+                       self.btn_json_exp, self.btn_csv_import, self.btn_all_entries, self.menuBar()):
+            widget.setEnabled(enabled)
 
     def _create_header(self) -> QLabel:
         lbl = QLabel(_conf.lbl_title)
         lbl.setFont(QFont(_conf.font, 24, QFont.Bold))
-        lbl.setStyleSheet("color: #111827; margin-bottom: 10px;")
+        lbl.setObjectName("appTitle")
         lbl.setAlignment(Qt.AlignCenter)
         return lbl
 
     def _create_timer_card(self) -> QFrame:
         card = QFrame()
-        card.setStyleSheet("""
-            QFrame {
-                background-color: #f9fafb;
-                border-radius: 16px;
-                border: 1px solid #e5e7eb;
-                padding: 30px;
-            }
-        """)
+        card.setObjectName("timerCard")
         layout = QVBoxLayout(card)
         layout.setAlignment(Qt.AlignCenter)
 
@@ -84,11 +127,7 @@ class WorkTimeTracker(QMainWindow):
         wrapper.setContentsMargins(10, 0, 10, 0)
         self.status_label = QLabel(_conf.lbl_status)
         self.status_label.setFont(QFont(_conf.font, 15, QFont.Bold))
-        self.status_label.setStyleSheet("""
-            color: #6b7280; margin-bottom: 20px;
-            background-color: #e0e7ff;
-            border-radius: 12px; padding: 10px;
-        """)
+        self.status_label.setObjectName("statusLabel")
         self.status_label.setAlignment(Qt.AlignCenter)
         self.status_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         wrapper.addWidget(self.status_label)
@@ -96,11 +135,7 @@ class WorkTimeTracker(QMainWindow):
 
         self.time_label = QLabel(_conf.lbl_time)
         self.time_label.setFont(QFont(_conf.font, 56, QFont.Bold))
-        self.time_label.setStyleSheet("""
-            color: #2563eb; margin: 10px 0;
-            background-color: #e0e7ff;
-            border-radius: 12px; padding: 20px;
-        """)
+        self.time_label.setObjectName("timeLabel")
         self.time_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.time_label)
         return card
@@ -183,48 +218,43 @@ class WorkTimeTracker(QMainWindow):
     def _create_summary_card(self) -> QFrame:
         card = QFrame()
         card.setObjectName("summaryCard")
-        card.setStyleSheet("""
-            QFrame#summaryCard {
-                background-color: #f9fafb;
-                border-radius: 16px;
-                border: 1px solid #e5e7eb;
-                padding: 20px;
-            }
-        """)
         layout = QVBoxLayout(card)
         layout.setContentsMargins(20, 20, 20, 20)
 
         title = QLabel("Zusammenfassung")
         title.setFont(QFont(_conf.font, 16, QFont.Bold))
-        title.setStyleSheet("color: #111827; margin-bottom: 10px;")
+        title.setObjectName("cardTitle")
         layout.addWidget(title)
 
-        self.summary_text = QTextEdit()
-        self.summary_text.setReadOnly(True)
-        self.summary_text.setMaximumHeight(150)
-        self.summary_text.setStyleSheet("""
-            QTextEdit {
-                background-color: white;
-                border: 1px solid #e5e7eb;
-                border-radius: 8px;
-                padding: 10px;
-                color: #374151;
-                font-family: 'Segoe UI';
-                font-size: 11pt;
-            }
-        """)
-        layout.addWidget(self.summary_text)
+        self.summary_model = SummaryModel(self.database_path, self)
+        self.summary_view = QListView()
+        self.summary_view.setModel(self.summary_model)
+        self.summary_view.setMaximumHeight(150)
+        self.summary_view.setUniformItemSizes(True)
+        self.summary_view.setSelectionMode(QListView.NoSelection)
+        self.summary_view.setFocusPolicy(Qt.NoFocus)
+        self.summary_view.setObjectName("summaryView")
+        layout.addWidget(self.summary_view)
+
+        self.summary_empty = QLabel("Noch keine Einträge vorhanden.")
+        self.summary_empty.setObjectName("summaryEmpty")
+        layout.addWidget(self.summary_empty)
+        self.summary_model.page_loaded.connect(lambda: startup.finish("Zusammenfassung geladen"))
+        self.summary_model.load_failed.connect(self._db_error)
+        for signal in (self.summary_model.modelReset, self.summary_model.rowsInserted,
+                       self.summary_model.rowsRemoved):
+            signal.connect(self._update_summary_placeholder)
         return card
 
     def _create_database_layout(self) -> QHBoxLayout:
         layout = QHBoxLayout()
         lbl = QLabel("Datenbank:")
         lbl.setFont(QFont(_conf.font, 10))
-        lbl.setStyleSheet("color: #6b7280;")
+        lbl.setProperty("role", "muted")
 
         self.db_path_label = QLabel("Noch kein Pfad gewählt")
         self.db_path_label.setFont(QFont(_conf.font, 10))
-        self.db_path_label.setStyleSheet("color: #2563eb;")
+        self.db_path_label.setProperty("role", "accent")
         self.db_path_label.setWordWrap(True)
 
         layout.addWidget(lbl)
@@ -243,6 +273,7 @@ class WorkTimeTracker(QMainWindow):
         self._add_action(file_menu, "Datenbank-Speicherort ändern", self.change_database_folder)
         self._add_action(file_menu, "Datenbank klonen", self.clone_database_ui)
         self._add_action(file_menu, "Neue Datenbank erstellen", self.create_new_database_ui)
+        self._add_action(file_menu, "Abgeschlossenes Jahr archivieren ...", self.archive_year_ui)
 
         edit_menu = mb.addMenu("&Bearbeiten")
         self._add_action(edit_menu, "Manueller Eintrag", self.setup_man_entry)
@@ -251,9 +282,16 @@ class WorkTimeTracker(QMainWindow):
 
         view_menu = mb.addMenu("&Ansicht")
         self._add_action(view_menu, "Alle Datenbankeinträge anzeigen", self.show_all_entries)
+        view_menu.addSeparator()
+        self._add_action(view_menu, "Diagnose: Datenbankabfragen", self.show_diagnostics)
 
         stats_menu = mb.addMenu("&Statistik")
         self._add_action(stats_menu, "Monats- und Wochenübersicht", self.show_statistics)
+        stats_menu.addSeparator()
+        self._add_action(stats_menu, "Weitere Datenbanken einbeziehen ...", self.choose_report_sources)
+        self._add_action(stats_menu, "Nur aktuelle Datenbank auswerten", self.reset_report_sources)
+        stats_menu.addSeparator()
+        self._add_action(stats_menu, "Statistiken prüfen und neu aufbauen", self.rebuild_statistics)
 
     @staticmethod
     def _add_action(menu, label: str, slot):
@@ -264,10 +302,44 @@ class WorkTimeTracker(QMainWindow):
     def change_database_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Datenbank-Speicherort wählen")
         if folder:
+            if self.start_time is not None:
+                # The running session moves along with the database.
+                self.executor.write(clear_session, self.database_path, on_error=self._db_error)
             self.database_folder = folder
-            self.database_path   = ensure_database(folder)
-            self.db_path_label.setText(self._format_path(self.database_path))
-            self.update_summary()
+            self.database_path   = os.path.join(folder, _conf.db_file)
+            report = MigrationReport()
+            self.executor.write(ensure_database, folder, report=report,
+                                on_done=lambda path: self._database_ready(path, report), on_error=self._db_error)
+
+    def _database_ready(self, path: str, report: MigrationReport | None = None):
+        if path != self.database_path:
+            return
+        startup.mark("Datenbank bereit")
+        self._set_database_controls(True)
+        if report is not None and report.removed_duplicates:
+            text = f"Beim Aktualisieren der Datenbank entfernte doppelte Einträge: {report.removed_duplicates}"
+            if report.backup_path:
+                text += f"\n\nDer vorherige Stand ist gesichert unter:\n{report.backup_path}"
+            QMessageBox.information(self, "Doppelte Einträge entfernt", text)
+        self._update_path_label()
+        self.update_summary()
+        self._load_projects()
+        self.executor.read(running_session, path, on_done=lambda session: self._restore_session(path, session),
+                           on_error=self._db_error)
+        self._scheduled_backup()
+
+    def _load_projects(self):
+        self.executor.read(project_names, self.database_path, on_done=self.details_form.set_projects)
+
+    def take_details(self) -> EntryDetails:
+        # Project, tags and note belong to the session being saved; the form is
+        # emptied for the next one.
+        details = self.details_form.details()
+        self.details_form.clear()
+        return details
+
+    def _db_error(self, error):
+        QMessageBox.critical(self, "Datenbankfehler", f"Die Datenbank meldet einen Fehler:\n{error}")
 
     def clone_database_ui(self):
         if not os.path.exists(self.database_path):
@@ -276,42 +348,151 @@ class WorkTimeTracker(QMainWindow):
         dest, _ = QFileDialog.getSaveFileName(
             self, "Datenbank klonen nach", "work_time_backup.db", "SQLite Datenbank (*.db)"
         )
-        if dest:
-            clone_database(self.database_path, dest)
-            QMessageBox.information(self, "Geklont", f"Datenbank wurde kopiert nach:\n{dest}")
+        if not dest:
+            return
+        if os.path.abspath(dest) == os.path.abspath(self.database_path):
+            QMessageBox.warning(self, "Ungültiges Ziel", "Die Datenbank kann nicht auf sich selbst geklont werden.")
+            return
+        self._run_task("Datenbank wird geklont ...",
+                       lambda _: QMessageBox.information(
+                           self, "Geklont", f"Datenbank wurde kopiert nach:\n{dest}"),
+                       self._clone_failed,
+                       clone_database, self.database_path, dest)
+
+    def _clone_failed(self, error):
+        if not isinstance(error, BackupCancelled):
+            self._db_error(error)
+
+    def _scheduled_backup(self):
+        if self._backup_task is not None and not self._backup_task.future.done():
+            return
+        folder = os.path.join(self.database_folder, _conf.backup_folder)
+        self._backup_task = self.executor.job(scheduled_backup, self.database_path, folder)
 
     def create_new_database_ui(self):
         dest, _ = QFileDialog.getSaveFileName(
             self, "Neue Datenbank erstellen", "work_time.db", "SQLite Datenbank (*.db)"
         )
         if dest:
+            if self.start_time is not None:
+                self.executor.write(clear_session, self.database_path, on_error=self._db_error)
             self.database_folder = os.path.dirname(dest)
             self.database_path   = dest
-            self.db_path_label.setText(self._format_path(dest))
-            new_database(dest)
-            self.update_summary()
-            QMessageBox.information(self, "Erstellt", f"Neue Datenbank erstellt:\n{dest}")
+            self._update_path_label()
+            self.executor.write(new_database, dest, on_done=lambda _: self._database_created(dest),
+                                on_error=self._db_error)
+
+    def _database_created(self, dest: str):
+        self._database_ready(dest)
+        QMessageBox.information(self, "Erstellt", f"Neue Datenbank erstellt:\n{dest}")
+
+    def _update_path_label(self):
+        text = self._format_path(self.database_path)
+        years = [year for year, _ in archives(self.database_path)]
+        if years:
+            text += f"  (Archive: {', '.join(map(str, years))})"
+        if self.report_sources:
+            text += f"  (+{len(self.report_sources)} weitere für Auswertungen)"
+        self.db_path_label.setText(text)
+
+    def _sources(self) -> list[str]:
+        return [self.database_path, *self.report_sources]
+
+    def choose_report_sources(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Weitere Datenbanken für Auswertungen wählen", self.database_folder,
+            "SQLite Datenbank (*.db)"
+        )
+        current = os.path.abspath(self.database_path)
+        extra = list(dict.fromkeys(os.path.abspath(p) for p in paths if os.path.abspath(p) != current))
+        if extra:
+            self.executor.read(prepare_sources, extra, on_done=self._report_sources_ready,
+                               on_error=self._report_sources_failed)
+
+    def _report_sources_ready(self, paths: list[str]):
+        self.report_sources = paths
+        self._update_path_label()
+        self.update_summary()
 
-    def update_summary(self):
-        rows = summary_by_date(self.database_path)
-        if not rows:
-            self.summary_text.setHtml("<i>Noch keine Einträge vorhanden.</i>")
+    def _report_sources_failed(self, error):
+        if isinstance(error, SourceError):
+            QMessageBox.warning(self, "Weitere Datenbanken", str(error))
+        else:
+            self._db_error(error)
+
+    def reset_report_sources(self):
+        self.report_sources = []
+        self._update_path_label()
+        self.update_summary()
+
+    def archive_year_ui(self):
+        self.executor.read(archivable_years, self.database_path,
+                           on_done=self._choose_archive_year, on_error=self._db_error)
+
+    def _choose_archive_year(self, years: list[int]):
+        if not years:
+            QMessageBox.information(self, "Archivieren", "Die aktuelle Datenbank enthält keine abgeschlossenen Jahre.")
             return
-        html = "<div style='font-family: Segoe UI;'>"
-        for row in rows:
-            total = row["total_str"]
-            html += (
-                f"<p style='margin: 5px 0;'>"
-                f"<b>📅 {row['date']}</b> — {row['count']} Session(s) — "
-                f"<span style='color:#2563eb;'>{total}</span></p>"
-            )
-        html += "</div>"
-        self.summary_text.setHtml(html)
+        choice, ok = QInputDialog.getItem(
+            self, "Jahr archivieren",
+            "Einträge dieses Jahres in eine schreibgeschützte Archivdatei verschieben.\n"
+            "Statistiken und Exporte beziehen das Archiv weiterhin ein.",
+            [str(year) for year in reversed(years)], 0, False,
+        )
+        if not ok:
+            return
+        year = int(choice)
+        self._run_task(f"{year} wird archiviert ...",
+                       lambda count: self._archive_finished(year, count), self._archive_failed,
+                       archive_year, self.database_path, year)
 
-    def _update_clock(self):
-        if self.running and self.start_time is not None:
-            elapsed = time.time() - self.start_time
-            self.time_label.setText(time.strftime("%H:%M:%S", time.gmtime(elapsed)))
+    def _archive_finished(self, year: int, count: int):
+        self._update_path_label()
+        self.update_summary()
+        QMessageBox.information(
+            self, "Archiviert",
+            f"✅ {count} Einträge aus {year} verschoben nach:\n{archive_path(self.database_path, year)}"
+        )
+
+    def _archive_failed(self, error):
+        if isinstance(error, ArchiveCancelled):
+            QMessageBox.information(self, "Archivieren abgebrochen", "Die aktuelle Datenbank ist unverändert.")
+        elif isinstance(error, ArchiveError):
+            QMessageBox.warning(self, "Archivieren", str(error))
+        else:
+            self._db_error(error)
+
+    def update_summary(self):
+        self.summary_model.reload(self.database_path, self.report_sources)
+
+    def _update_summary_placeholder(self):
+        empty = self.summary_model.rowCount() == 0
+        self.summary_empty.setVisible(empty)
+        self.summary_view.setVisible(not empty)
+
+    def _show_elapsed(self, seconds: int):
+        self.time_label.setText(format_duration(seconds))
+
+    def _update_clock_visibility(self):
+        self.clock.set_visible(self.isVisible() and not self.isMinimized())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_clock_visibility()
+        if not self._database_requested:
+            # Schema check and summary query start once the window is shown.
+            self._database_requested = True
+            startup.mark("Fenster angezeigt")
+            QTimer.singleShot(0, self._open_database)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_clock_visibility()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._update_clock_visibility()
 
     def _set_button_states(self, *, start, pause, cont, stop):
         self.btn_start.setEnabled(start)
@@ -323,110 +504,356 @@ class WorkTimeTracker(QMainWindow):
         if not self.running:
             self.start_time    = time.time()
             self.elapsed_time  = 0
+            self.clock.start()
+            self.session_date  = datetime.now().date().isoformat()
             self.session_start = datetime.now().strftime("%H:%M:%S")
             self.running = True
             self.status_label.setText("⏱  Läuft ...")
             self._set_button_states(start=False, pause=True, cont=False, stop=True)
+            self._session_changed()
 
     def pause_timer(self):
         if self.running and self.start_time is not None:
-            self.elapsed_time = time.time() - self.start_time
+            self.elapsed_time = self.clock.pause()
             self.running = False
             self.status_label.setText("⏸  Pausiert")
             self._set_button_states(start=False, pause=False, cont=True, stop=True)
+            self._session_changed()
 
     def continue_timer(self):
         if not self.running:
             self.start_time = time.time() - self.elapsed_time
+            self.clock.start(self.elapsed_time)
             self.running = True
             self.status_label.setText("⏱  Läuft ...")
             self._set_button_states(start=False, pause=True, cont=False, stop=True)
+            self._session_changed()
 
     def stop_timer(self):
         if self.start_time is not None:
-            self.elapsed_time = time.time() - self.start_time
+            self.elapsed_time = self.clock.elapsed()
             self.session_end  = datetime.now().strftime("%H:%M:%S")
             self.running = False
-            insert_entry(
+            date = self.session_date
+            details = self.take_details()
+            self.executor.write(
+                complete_session,
                 self.database_path,
-                datetime.now().strftime("%d.%m.%Y"),
+                date,
                 self.session_start,
                 self.session_end,
-                time.strftime("%H:%M:%S", time.gmtime(self.elapsed_time)),
+                int(self.elapsed_time),
+                details=details,
+                on_done=lambda _: self.entry_saved(date, details),
+                on_error=self._db_error,
             )
             self._reset_timer()
             self.status_label.setText(_conf.lbl_status)
             self._set_button_states(start=True, pause=False, cont=False, stop=False)
-            self.update_summary()
+
+    def entry_saved(self, date: str, details: EntryDetails):
+        self.summary_model.refresh_day(date)
+        if details.project:
+            self._load_projects()
 
     def _reset_timer(self):
+        self._session_generation += 1
         self.start_time   = None
         self.elapsed_time = 0
+        self.clock.reset()
+        self.checkpoint_timer.stop()
         self.time_label.setText(_conf.lbl_time)
 
+    def _current_session(self) -> RunningSession:
+        # The stored record uses wall-clock time so other processes can read
+        # it; it is re-anchored to the monotonic elapsed time on every save.
+        now = time.time()
+        elapsed = self.clock.elapsed()
+        self.start_time = now - elapsed
+        return RunningSession(self.session_date, self.session_start, self.start_time,
+                              elapsed, not self.running, now)
+
+    def _session_changed(self):
+        # Start, pause and continue are written right away; in between the
+        # checkpoint timer only records that the app is still alive and picks
+        # up changes made from the command line.
+        self._session_generation += 1
+        self.executor.write(save_session, self.database_path, self._current_session(),
+                            on_error=self._db_error)
+        self.checkpoint_timer.start()
+
+    def _checkpoint_session(self):
+        if self._checkpoint_pending:
+            return
+        self._checkpoint_pending = True
+        path = self.database_path
+        generation = self._session_generation
+        self.executor.write(checkpoint_session, path,
+                            on_done=lambda result: self._checkpointed(path, generation, *result),
+                            on_error=self._checkpoint_failed)
+
+    def _checkpointed(self, path: str, generation: int, session: RunningSession | None, cost: float):
+        self._checkpoint_pending = False
+        self.checkpoint_cost = cost
+        if cost * 1000 > _conf.session_checkpoint_budget_ms:
+            interval = min(self.checkpoint_timer.interval() * 2, _conf.session_checkpoint_max_ms)
+            self.checkpoint_timer.setInterval(interval)
+        # A result read before the last start, pause, continue or stop would undo it.
+        if path != self.database_path or generation != self._session_generation or self.start_time is None:
+            return
+        if session is None:
+            # Stopped from the command line.
+            self._reset_timer()
+            self.running = False
+            self.status_label.setText(_conf.lbl_status)
+            self._set_button_states(start=True, pause=False, cont=False, stop=False)
+            self.summary_model.refresh_day(self.session_date)
+        elif session.paused == self.running:
+            self._apply_session(session)
+
+    def _checkpoint_failed(self, error):
+        self._checkpoint_pending = False
+        self._db_error(error)
+
+    def _restore_session(self, path: str, session: RunningSession | None):
+        if path != self.database_path:
+            return
+        if self.start_time is not None:
+            self._session_changed()
+            return
+        if session is None:
+            self.btn_start.setEnabled(True)
+            return
+        now = time.time()
+        if (not session.paused and session.checkpoint_at is not None
+                and now - session.checkpoint_at > _conf.session_recovery_gap_s):
+            last_seen = datetime.fromtimestamp(session.checkpoint_at)
+            box = QMessageBox(QMessageBox.Question, "Session wiederherstellen",
+                              f"Die Session vom {display_date(session.date)} ab {session.start_time} lief noch, "
+                              f"als das Programm zuletzt beendet wurde.\n"
+                              f"Letztes Lebenszeichen: {last_seen.strftime('%d.%m.%Y %H:%M:%S')}", parent=self)
+            resume = box.addButton("Fortsetzen", QMessageBox.AcceptRole)
+            box.addButton("Bis zum letzten Lebenszeichen speichern", QMessageBox.RejectRole)
+            box.exec()
+            if box.clickedButton() is not resume:
+                self.btn_start.setEnabled(True)
+                self.executor.write(
+                    complete_session, path, session.date, session.start_time,
+                    last_seen.strftime("%H:%M:%S"), int(session.elapsed_at(session.checkpoint_at)),
+                    on_done=lambda _: self.summary_model.refresh_day(session.date),
+                    on_error=self._db_error,
+                )
+                return
+        self._apply_session(session)
+
+    def _apply_session(self, session: RunningSession):
+        self.session_date  = session.date
+        self.session_start = session.start_time
+        self.start_time    = session.started_at
+        self.elapsed_time  = session.elapsed
+        self.running       = not session.paused
+        if self.running:
+            self.status_label.setText("⏱  Läuft ...")
+            self._set_button_states(start=False, pause=True, cont=False, stop=True)
+            self.clock.start(session.elapsed_at(time.time()))
+        else:
+            self.status_label.setText("⏸  Pausiert")
+            self._set_button_states(start=False, pause=False, cont=True, stop=True)
+            self.clock.hold(session.elapsed)
+        self.checkpoint_timer.start()
+
     def setup_man_entry(self):
-        dlg = ManualEntryDialog(self.database_path, self)
+        from .dialogs import ManualEntryDialog
+        dlg = self._reused_dialog(ManualEntryDialog)
         if dlg.exec():
-            self.update_summary()
+            self.summary_model.refresh_day(dlg.date_input.date().toString("yyyy-MM-dd"))
 
     def man_start_time(self):
+        from .dialogs import StartTimeDialog
         dlg = StartTimeDialog(self, self)
         dlg.exec()
 
     def man_end_time(self):
+        from .dialogs import EndTimeDialog
         dlg = EndTimeDialog(self, self)
         dlg.exec()
 
+    def _export_range(self, title: str) -> tuple[str | None, str | None] | None:
+        from .dialogs import ExportRangeDialog
+        dlg = ExportRangeDialog(title, self)
+        return dlg.date_range() if dlg.exec() else None
+
     def export_to_csv(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Als CSV exportieren", "", "CSV-Dateien (*.csv)"
+        date_range = self._export_range("Als CSV exportieren")
+        if date_range is None:
+            return
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Als CSV exportieren", "",
+            "CSV-Dateien (*.csv);;CSV gzip-komprimiert (*.csv.gz);;CSV xz-komprimiert (*.csv.xz)"
         )
         if not path:
             return
-        count = export_csv(self.database_path, path)
+        path = self._with_suffix(path, selected)
+        self._run_task("CSV wird exportiert ...",
+                       lambda count: self._export_finished(count, path), self._export_failed,
+                       federation.export_csv, self._sources(), path, date_from=date_range[0], date_to=date_range[1])
+
+    def _export_finished(self, count: int, path: str):
         QMessageBox.information(
             self, "Export erfolgreich", f"✅ {count} Einträge exportiert nach:\n{path}"
         )
 
+    def _export_failed(self, error):
+        if isinstance(error, ExportCancelled):
+            QMessageBox.information(self, "Export abgebrochen", "Der Export wurde abgebrochen.")
+            return
+        QMessageBox.critical(self, "Fehler", f"Export fehlgeschlagen:\n{error}")
+
+    @staticmethod
+    def _with_suffix(path: str, selected_filter: str) -> str:
+        if "(*" not in selected_filter:
+            return path
+        suffix = selected_filter[selected_filter.index("(*") + 2:].rstrip(")").split()[0]
+        if path.endswith(suffix):
+            return path
+        ext = os.path.splitext(path)[1]
+        if ext and suffix.startswith(ext):
+            return path + suffix[len(ext):]
+        return path + suffix
+
     def import_from_csv(self):
         path, _ = QFileDialog.getOpenFileName(
             self, "CSV importieren", "", "CSV-Dateien (*.csv)"
         )
         if not path:
             return
-        try:
-            imported, errors = import_csv(self.database_path, path)
-        except Exception as e:
-            QMessageBox.critical(self, "Fehler", f"CSV konnte nicht gelesen werden:\n{e}")
-            return
+        self.btn_csv_import.setEnabled(False)
+        self._run_task("CSV wird importiert ...", self._import_finished, self._import_failed,
+                       import_csv, self.database_path, path)
+
+    def _import_finished(self, report):
+        self.btn_csv_import.setEnabled(True)
         self.update_summary()
-        msg = f"✅ {imported} Einträge importiert."
-        if errors:
-            msg += f"\n⚠️ {errors} Zeile(n) übersprungen (ungültiges Format)."
-        QMessageBox.information(self, "Import abgeschlossen", msg)
+        msg = f"✅ {report.imported} neue Einträge importiert."
+        if report.duplicates:
+            msg += f"\n↺ {report.duplicates} bereits vorhanden, übersprungen."
+        if report.conflict_count:
+            msg += f"\n⚠️ {report.conflict_count} Konflikt(e): gleiche Zeiten, andere Dauer — vorhandene Einträge behalten."
+        if report.cancelled:
+            msg += "\n⏹ Import abgebrochen, bereits importierte Einträge bleiben erhalten."
+        if report.error_count:
+            msg += f"\n⚠️ {report.error_count} Zeile(n) übersprungen (ungültiges Format)."
+        box = QMessageBox(QMessageBox.Information, "Import abgeschlossen", msg, QMessageBox.Ok, self)
+        sections = []
+        for title, items, count in (("Konflikte", report.conflicts, report.conflict_count),
+                                    ("Ungültige Zeilen", report.errors, report.error_count)):
+            if items:
+                lines = [f"Zeile {line}: {reason}" for line, reason in items]
+                if count > len(items):
+                    lines.append(f"... und {count - len(items)} weitere")
+                sections.append(f"{title}:\n" + "\n".join(lines))
+        if sections:
+            box.setDetailedText("\n\n".join(sections))
+        box.exec()
+
+    def _import_failed(self, error):
+        self.btn_csv_import.setEnabled(True)
+        self.update_summary()
+        QMessageBox.critical(self, "Fehler", f"CSV konnte nicht gelesen werden:\n{error}")
+
+    def _run_task(self, label: str, on_finished, on_failed, fn, *args, **kwargs):
+        dlg = QProgressDialog(label, "Abbrechen", 0, 1000, self)
+        dlg.setWindowTitle(_conf.lbl_title)
+        dlg.setMinimumDuration(300)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+
+        def done(handler, value):
+            self._tasks.discard(task)
+            dlg.close()
+            handler(value)
+
+        task = self.executor.job(
+            fn, *args,
+            on_progress=lambda fraction: dlg.setValue(int(fraction * 1000)),
+            on_done=lambda result: done(on_finished, result),
+            on_error=lambda error: done(on_failed, error),
+            **kwargs,
+        )
+        dlg.canceled.connect(task.cancel)
+        self._tasks.add(task)
+        return task
 
     def export_to_json(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Als JSON exportieren", "", "JSON-Dateien (*.json)"
+        date_range = self._export_range("Als JSON exportieren")
+        if date_range is None:
+            return
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Als JSON exportieren", "",
+            "JSON-Dateien (*.json);;NDJSON (eine Zeile pro Eintrag) (*.ndjson);;"
+            "JSON gzip-komprimiert (*.json.gz);;NDJSON gzip-komprimiert (*.ndjson.gz);;"
+            "JSON xz-komprimiert (*.json.xz);;NDJSON xz-komprimiert (*.ndjson.xz)"
         )
         if not path:
             return
-        count = export_json(self.database_path, path)
-        QMessageBox.information(
-            self, "Export erfolgreich", f"✅ {count} Einträge exportiert nach:\n{path}"
-        )
+        path = self._with_suffix(path, selected)
+        self._run_task("JSON wird exportiert ...",
+                       lambda count: self._export_finished(count, path), self._export_failed,
+                       federation.export_json, self._sources(), path, ndjson=".ndjson" in path,
+                       date_from=date_range[0], date_to=date_range[1])
 
     def show_all_entries(self):
-        dlg = AllEntriesDialog(self.database_path, self)
+        from .dialogs import AllEntriesDialog
+        dlg = self._reused_dialog(AllEntriesDialog)
         dlg.exec()
-        self.update_summary()
+        if len(dlg.deleted_dates) > _conf.summary_page_size:
+            self.update_summary()
+            return
+        for date in dlg.deleted_dates:
+            self.summary_model.refresh_day(date)
 
     def show_statistics(self):
-        dlg = StatisticsDialog(self.database_path, self)
+        from .dialogs import StatisticsDialog
+        dlg = self._reused_dialog(StatisticsDialog, self.report_sources)
+        dlg.exec()
+
+    def _reused_dialog(self, cls, *args):
+        # The heavier dialogs are built once and only reloaded on later opens.
+        dlg = self._dialogs.get(cls)
+        if dlg is None:
+            dlg = self._dialogs[cls] = cls(self.database_path, self, *args)
+        else:
+            dlg.refresh(self.database_path, *args)
+        return dlg
+
+    def show_diagnostics(self):
+        from .dialogs import DiagnosticsDialog
+        dlg = DiagnosticsDialog(self)
         dlg.exec()
 
+    def rebuild_statistics(self):
+        self.executor.write(repair_rollups, self.database_path,
+                            on_done=self._statistics_rebuilt, on_error=self._db_error)
+
+    def _statistics_rebuilt(self, mismatches):
+        self.update_summary()
+        if mismatches:
+            msg = f"⚠️ {len(mismatches)} abweichende Zeiträume gefunden und neu berechnet."
+        else:
+            msg = "✅ Alle Statistiken stimmen mit den Einträgen überein."
+        QMessageBox.information(self, "Statistiken neu aufgebaut", msg)
+
+    def closeEvent(self, event):
+        # Let running jobs stop at their next step instead of delaying the exit.
+        for task in (*self._tasks, self._backup_task):
+            if task is not None:
+                task.cancel()
+        if self.start_time is not None:
+            self.executor.write(checkpoint_session, self.database_path)
+        super().closeEvent(event)
+
     def _apply_styles(self):
-        self.setStyleSheet(main_window_style())
+        apply_app_style()
 
     @staticmethod
     def _format_path(path: str) -> str:
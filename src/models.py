@@ -0,0 +1,346 @@
+from PySide6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor
+
+from .config import Config as _conf
+from .db import entries_page, count_entries
+from .federation import summary_page_for, summary_for_date_for
+from .executor import get_executor
+from .formats import display_date, format_duration
+
+
+class EntriesModel(QAbstractTableModel):
+    HEADERS = ["ID", "Datum", "Anfangszeit", "Endzeit", "Dauer", "Projekt", "Tags", "Notiz"]
+    SORT_FIELDS = {0: "id", 1: "date", 4: "duration"}
+
+    total_changed = Signal(int)
+    load_failed = Signal(object)
+
+    def __init__(self, db_path: str, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.sort_column = 1
+        self.sort_order = Qt.DescendingOrder
+        self.date_from: str | None = None
+        self.date_to: str | None = None
+        self.search = ""
+        self.total = 0
+        self._rows: list[tuple] = []
+        self._after: tuple | None = None
+        self._exhausted = True
+        self._loading = False
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignLeft | Qt.AlignVCenter if column == 7 else Qt.AlignCenter
+        if role == Qt.ToolTipRole and column == 7:
+            return self._rows[index.row()][7]
+        if role != Qt.DisplayRole:
+            return None
+        entry_id, date, start, end, secs, project, tags, note = self._rows[index.row()]
+        if column == 0:
+            return str(entry_id)
+        if column == 1:
+            return display_date(date)
+        if column == 2:
+            return start
+        if column == 3:
+            return end
+        if column == 4:
+            return format_duration(secs)
+        return (project, tags, note)[column - 5] or ""
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        generation = self._generation
+        get_executor().read(
+            entries_page,
+            self.db_path,
+            sort=self.SORT_FIELDS[self.sort_column],
+            descending=self.sort_order == Qt.DescendingOrder,
+            after=self._after,
+            date_from=self.date_from,
+            date_to=self.date_to,
+            search=self.search,
+            on_done=lambda page: self._page_loaded(generation, page),
+            on_error=lambda error: self._load_error(generation, error),
+        )
+
+    def _page_loaded(self, generation: int, page):
+        if generation != self._generation:
+            return
+        rows, after = page
+        self._loading = False
+        self._exhausted = len(rows) < _conf.entries_page_size
+        if not rows:
+            return
+        self._after = after
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def _load_error(self, generation: int, error):
+        if generation != self._generation:
+            return
+        # The view would ask for the failed page again right away; the next
+        # reload (sort, filter or search) tries again instead.
+        if self._loading:
+            self._loading = False
+            self._exhausted = True
+        self.load_failed.emit(error)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if column not in self.SORT_FIELDS:
+            return
+        if (column, order) == (self.sort_column, self.sort_order) and self._rows:
+            return
+        self.sort_column = column
+        self.sort_order = order
+        self.reload()
+
+    def set_date_range(self, date_from: str | None, date_to: str | None):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.reload()
+
+    def set_search(self, text: str):
+        if text.strip() != self.search:
+            self.search = text.strip()
+            self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = []
+        self._after = None
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+        generation = self._generation
+        get_executor().read(
+            count_entries, self.db_path, self.date_from, self.date_to, self.search,
+            on_done=lambda total: self._total_loaded(generation, total),
+            on_error=lambda error: self._load_error(generation, error),
+        )
+        self.fetchMore()
+
+    def _total_loaded(self, generation: int, total: int):
+        if generation == self._generation:
+            self.total = total
+            self.total_changed.emit(total)
+
+    def entry_at(self, row: int) -> tuple:
+        return self._rows[row]
+
+    def remove_entries(self, entry_ids):
+        # Removes contiguous blocks from the bottom up, so the views keep their
+        # scroll position and nothing is read again.
+        entry_ids = set(entry_ids)
+        rows = [row for row, entry in enumerate(self._rows) if entry[0] in entry_ids]
+        while rows:
+            last = first = rows.pop()
+            while rows and rows[-1] == first - 1:
+                first = rows.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+            self.total -= last - first + 1
+        self.total_changed.emit(self.total)
+        if not self._rows:
+            self.fetchMore()
+
+    def remove_all(self):
+        # Everything matching the current filter is gone; there is nothing left to page in.
+        self.beginResetModel()
+        self._generation += 1
+        self._rows = []
+        self._exhausted = True
+        self._loading = False
+        self.endResetModel()
+        self.total = 0
+        self.total_changed.emit(0)
+
+
+class RowsModel(QAbstractTableModel):
+    # Read-only table for the statistics views. Rows are kept as the query
+    # returned them and only formatted once a view asks for a visible cell.
+
+    def __init__(self, headers: list[str], parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._rows: list = []
+        self._text: list[tuple | None] = []
+        self._format = None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role != Qt.DisplayRole:
+            return None
+        row = index.row()
+        text = self._text[row]
+        if text is None:
+            raw = self._rows[row]
+            text = self._text[row] = tuple(self._format(raw)) if self._format else raw
+        return text[index.column()]
+
+    def set_headers(self, headers: list[str]):
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._rows, self._text = [], []
+        self.endResetModel()
+
+    def set_rows(self, rows, format_row=None):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._text = [None] * len(self._rows)
+        self._format = format_row
+        self.endResetModel()
+
+
+class SummaryModel(QAbstractListModel):
+    page_loaded = Signal()
+    load_failed = Signal(object)
+
+    def __init__(self, db_path: str, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.extra_sources: list[str] = []
+        self._rows: list[tuple] = []
+        self._exhausted = True
+        self._loading = False
+        self._generation = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        date, sessions, seconds = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"📅 {display_date(date)} — {sessions} Session(s) — {format_duration(seconds)}"
+        if role == Qt.ForegroundRole:
+            return QColor("#374151")
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        generation = self._generation
+        before = self._rows[-1][0] if self._rows else None
+        get_executor().read(
+            summary_page_for, self.sources(), before,
+            on_done=lambda rows: self._page_loaded(generation, rows),
+            on_error=lambda error: self._load_error(generation, error),
+        )
+
+    def _page_loaded(self, generation: int, rows):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self._exhausted = len(rows) < _conf.summary_page_size
+        if rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        self.page_loaded.emit()
+
+    def _load_error(self, generation: int, error):
+        if generation != self._generation:
+            return
+        if self._loading:
+            self._loading = False
+            self._exhausted = True
+        self.load_failed.emit(error)
+
+    def sources(self) -> list[str]:
+        return [self.db_path, *self.extra_sources]
+
+    def reload(self, db_path: str | None = None, extra_sources: list[str] | None = None):
+        self.beginResetModel()
+        if db_path is not None:
+            self.db_path = db_path
+        if extra_sources is not None:
+            self.extra_sources = extra_sources
+        self._generation += 1
+        self._rows = []
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def refresh_day(self, date: str):
+        generation = self._generation
+        get_executor().read(
+            summary_for_date_for, self.sources(), date,
+            on_done=lambda row: self._day_loaded(generation, date, row),
+            on_error=lambda error: self._load_error(generation, error),
+        )
+
+    def _day_loaded(self, generation: int, date: str, row):
+        if generation != self._generation:
+            return
+        pos = self._position(date)
+        exists = pos < len(self._rows) and self._rows[pos][0] == date
+        if exists and row is None:
+            self.beginRemoveRows(QModelIndex(), pos, pos)
+            del self._rows[pos]
+            self.endRemoveRows()
+        elif exists:
+            self._rows[pos] = tuple(row)
+            index = self.index(pos)
+            self.dataChanged.emit(index, index)
+        elif row is not None and (pos < len(self._rows) or self._exhausted):
+            # Days older than the loaded window show up once the user scrolls there.
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            self._rows.insert(pos, tuple(row))
+            self.endInsertRows()
+
+    def _position(self, date: str) -> int:
+        lo, hi = 0, len(self._rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._rows[mid][0] > date:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
@@ -0,0 +1,176 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from .config import Config as _conf
+from .formats import to_iso_date, normalize_time, parse_duration
+
+
+@dataclass
+class MigrationReport:
+    # Anything a migration changed beyond the schema, for the user to see.
+    removed_duplicates: int = 0
+    backup_path: str | None = None
+
+def ensure_schema(conn: sqlite3.Connection, report: MigrationReport | None = None) -> MigrationReport:
+    report = MigrationReport() if report is None else report
+    version = conn.execute(_conf.txt_user_version).fetchone()[0]
+    if version == 0 and _table_exists(conn, "work_time"):
+        version = 1
+    if version == 0:
+        _create_latest(conn)
+        return report
+    while version < _conf.schema_version:
+        _MIGRATIONS[version](conn, report)
+        version = conn.execute(_conf.txt_user_version).fetchone()[0]
+    return report
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def _create_latest(conn: sqlite3.Connection):
+    with _transaction(conn):
+        conn.execute(_conf.txt_ensure_db)
+        _create_indexes(conn)
+        _create_rollups(conn)
+        conn.execute(_conf.txt_running_session_table)
+        _create_details(conn)
+        conn.execute(_conf.txt_natural_key_index)
+        conn.execute(f"PRAGMA user_version = {_conf.schema_version}")
+
+def _create_indexes(conn: sqlite3.Connection):
+    for statement in _conf.txt_ensure_indexes:
+        conn.execute(statement)
+
+def _create_rollups(conn: sqlite3.Connection):
+    for statement in _conf.txt_rollup_tables + _conf.txt_rollup_triggers:
+        conn.execute(statement)
+
+def _create_details(conn: sqlite3.Connection):
+    columns = {r[0] for r in conn.execute(_conf.txt_table_columns, ("work_time",))}
+    for column, statement in _conf.txt_detail_columns.items():
+        if column not in columns:
+            conn.execute(statement)
+    for statement in _conf.txt_detail_tables:
+        conn.execute(statement)
+
+def rebuild_rollups(conn: sqlite3.Connection):
+    for statement in _conf.txt_rollup_rebuild:
+        conn.execute(statement)
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(_conf.txt_table_exists, (name,)).fetchone() is not None
+
+def _migrate_v1(conn: sqlite3.Connection, report: MigrationReport):
+    # Copies the legacy table chunk by chunk so a large history never holds
+    # the write lock for long; an interrupted run resumes at the last copied id.
+    if not _table_exists(conn, "work_time_v1"):
+        with _transaction(conn):
+            conn.execute(_conf.txt_v1_rename)
+            conn.execute(_conf.txt_ensure_db)
+
+    last_id = conn.execute(_conf.txt_v1_resume).fetchone()[0]
+    while True:
+        with _transaction(conn):
+            rows = conn.execute(_conf.txt_v1_chunk, (last_id, _conf.migration_chunk_size)).fetchall()
+            conn.executemany(_conf.txt_v1_copy, [_convert_v1_row(r) for r in rows])
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+    with _transaction(conn):
+        conn.execute(_conf.txt_v1_drop)
+        _create_indexes(conn)
+        conn.execute("PRAGMA user_version = 2")
+
+def _convert_v1_row(row):
+    entry_id, date, start, end, duration = row
+    try:
+        date = to_iso_date(date)
+    except ValueError:
+        pass
+    # Same form as the importer writes, so re-imported sessions match on the natural key.
+    try:
+        start = normalize_time(start)
+    except ValueError:
+        pass
+    try:
+        end = normalize_time(end)
+    except ValueError:
+        pass
+    try:
+        seconds = parse_duration(duration)
+    except ValueError:
+        seconds = 0
+    return entry_id, date, start, end, seconds
+
+def _migrate_v2(conn: sqlite3.Connection, report: MigrationReport):
+    with _transaction(conn):
+        _create_rollups(conn)
+        rebuild_rollups(conn)
+        conn.execute("PRAGMA user_version = 3")
+
+def _migrate_v3(conn: sqlite3.Connection, report: MigrationReport):
+    with _transaction(conn):
+        _create_indexes(conn)
+        conn.execute("PRAGMA user_version = 4")
+
+def _migrate_v4(conn: sqlite3.Connection, report: MigrationReport):
+    with _transaction(conn):
+        conn.execute(_conf.txt_running_session_table)
+        conn.execute("PRAGMA user_version = 5")
+
+def _migrate_v5(conn: sqlite3.Connection, report: MigrationReport):
+    with _transaction(conn):
+        columns = {r[0] for r in conn.execute(_conf.txt_table_columns, ("running_session",))}
+        if "checkpoint_at" not in columns:
+            conn.execute(_conf.txt_session_add_checkpoint)
+        conn.execute("PRAGMA user_version = 6")
+
+def _migrate_v6(conn: sqlite3.Connection, report: MigrationReport):
+    with _transaction(conn):
+        _create_details(conn)
+        conn.execute("PRAGMA user_version = 7")
+
+def _migrate_v7(conn: sqlite3.Connection, report: MigrationReport):
+    # Earlier imports could add the same session twice. The copies (all but the
+    # oldest per day/start/end) are removed after a backup of the file, so the
+    # natural key can become unique. The write lock is taken first; a connection
+    # cannot back up a database it is writing, so a second one reads the file,
+    # which nobody else can change until the commit.
+    backup = None
+    with _transaction(conn):
+        duplicates = [r[0] for r in conn.execute(_conf.txt_duplicate_ids)]
+        path = conn.execute(_conf.txt_database_file).fetchone()[0]
+        if duplicates and path:
+            backup = os.path.splitext(path)[0] + "_vor_bereinigung.db"
+            source, target = sqlite3.connect(path), sqlite3.connect(backup)
+            try:
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+        conn.executemany(_conf.txt_delete_entry, [(entry_id,) for entry_id in duplicates])
+        conn.execute(_conf.txt_natural_key_index)
+        conn.execute("PRAGMA user_version = 8")
+    report.removed_duplicates += len(duplicates)
+    report.backup_path = backup or report.backup_path
+
+
+_MIGRATIONS = {
+    1: _migrate_v1,
+    2: _migrate_v2,
+    3: _migrate_v3,
+    4: _migrate_v4,
+    5: _migrate_v5,
+    6: _migrate_v6,
+    7: _migrate_v7,
+}
@@ -0,0 +1,39 @@
+import importlib
+import sys
+import time
+
+# Startup profile for `main.py --profile-startup`. Kept free of Qt so it can be
+# imported first and time everything that follows.
+
+_started = time.perf_counter()
+_imports: list[tuple[str, float]] = []
+_marks: list[tuple[str, float]] = []
+_reported = False
+enabled = False
+
+
+def timed_import(name: str):
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports.append((name, time.perf_counter() - start))
+    return module
+
+def mark(label: str):
+    _marks.append((label, time.perf_counter() - _started))
+
+def finish(label: str):
+    global _reported
+    if _reported:
+        return
+    mark(label)
+    _reported = True
+    if enabled:
+        report()
+
+def report(file=None):
+    file = file or sys.stderr
+    print("Startprofil", file=file)
+    for name, seconds in _imports:
+        print(f"  import {name:<26} {seconds * 1000:8.1f} ms", file=file)
+    for label, seconds in _marks:
+        print(f"  {label:<33} {seconds * 1000:8.1f} ms", file=file)
@@ -1,161 +1,198 @@
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QPushButton, QLabel
+from PySide6.QtWidgets import QApplication, QPushButton, QLabel
 
 from .config import Config as _conf
 
+# The whole application is styled by this one sheet, set on the QApplication
+# before the first window is built. Qt parses it once; widgets pick their
+# variant through object names and the dynamic properties "variant" (buttons)
+# and "role" (labels) instead of carrying style sheets of their own.
+APP_STYLESHEET = """
+    QMainWindow {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                    stop:0 #f5f7fa, stop:1 #e8ecf1);
+    }
+    QScrollBar:vertical {
+        background: #edf2f7; width: 10px; border-radius: 5px;
+    }
+    QScrollBar::handle:vertical {
+        background: #cbd5e0; border-radius: 5px; min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover { background: #a0aec0; }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
+
+    QLabel#appTitle, QLabel#cardTitle { color: #111827; margin-bottom: 10px; }
+    QFrame#timerCard, QFrame#summaryCard {
+        background-color: #f9fafb;
+        border-radius: 16px;
+        border: 1px solid #e5e7eb;
+    }
+    QFrame#timerCard   { padding: 30px; }
+    QFrame#summaryCard { padding: 20px; }
+    QLabel#statusLabel {
+        color: #6b7280; margin-bottom: 20px;
+        background-color: #e0e7ff; border: 1px solid #e5e7eb;
+        border-radius: 12px; padding: 10px;
+    }
+    QLabel#timeLabel {
+        color: #2563eb; margin: 10px 0;
+        background-color: #e0e7ff; border: 1px solid #e5e7eb;
+        border-radius: 12px; padding: 20px;
+    }
+    QListView#summaryView {
+        background-color: white;
+        border: 1px solid #e5e7eb;
+        border-radius: 8px;
+        padding: 10px;
+        color: #374151;
+        font-family: 'Segoe UI';
+        font-size: 11pt;
+    }
+    QListView#summaryView::item { padding: 3px 0; }
+    QLabel#summaryEmpty { color: #6b7280; font-style: italic; padding: 10px; }
+    QLabel[role="muted"]  { color: #6b7280; }
+    QLabel[role="accent"] { color: #2563eb; }
+
+    QPushButton {
+        background-color: #f3f4f6; color: #1f2937;
+        border: 1px solid #e5e7eb; border-radius: 8px;
+        padding: 8px 16px; font-family: 'Segoe UI'; font-size: 10pt;
+    }
+    QPushButton:hover { background-color: #e5e7eb; }
+    QPushButton[variant="secondary"], QPushButton[variant="action"] {
+        padding: 10px 20px; font-size: 11pt; font-weight: 500;
+    }
+    QPushButton[variant="secondary"]:hover, QPushButton[variant="action"]:hover { border-color: #d1d5db; }
+    QPushButton[variant="secondary"]:pressed { background-color: #d1d5db; }
+    QPushButton[variant="action"]:pressed    { background-color: #2563eb; color: white; }
+    QPushButton[variant="secondary"]:disabled, QPushButton[variant="action"]:disabled {
+        background-color: #f9fafb; color: #9ca3af;
+    }
+    QPushButton[variant="primary"] {
+        background-color: #2563eb; color: white;
+        border: none; border-radius: 8px;
+        padding: 10px 20px; font-size: 11pt; font-weight: 600;
+    }
+    QPushButton[variant="primary"]:hover    { background-color: #1d4ed8; }
+    QPushButton[variant="primary"]:pressed  { background-color: #1e40af; }
+    QPushButton[variant="primary"]:disabled { background-color: #9ca3af; }
+    QPushButton[variant="danger"] {
+        background-color: #fef2f2; color: #dc2626; border: 1px solid #fecaca;
+    }
+    QPushButton[variant="danger"]:hover { background-color: #fee2e2; }
+    QPushButton[variant="danger"]:disabled { background-color: #f9fafb; color: #9ca3af; border-color: #e5e7eb; }
+
+    QDialog { background-color: #ffffff; }
+    QDialog QLabel { color: #111827; font-family: 'Segoe UI'; }
+    QDialog QLineEdit, QDialog QTimeEdit, QDialog QDateEdit, QDialog QSpinBox {
+        background-color: #f9fafb; border: 1px solid #e5e7eb;
+        border-radius: 8px; padding: 8px 12px;
+        font-family: 'Segoe UI'; font-size: 11pt; color: #111827;
+    }
+    QDialog QLineEdit:focus, QDialog QTimeEdit:focus,
+    QDialog QDateEdit:focus, QDialog QSpinBox:focus { border: 1px solid #2563eb; }
+    QDialog[density="compact"] QLineEdit, QDialog[density="compact"] QDateEdit {
+        padding: 6px 10px; font-size: 10pt;
+    }
+    QDateEdit#plainDate::drop-down { width: 0px; border: none; }
+    QDialog QTableView, QDialog QPlainTextEdit {
+        background-color: #ffffff; border: 1px solid #e5e7eb;
+        border-radius: 8px; gridline-color: #f3f4f6;
+        font-family: 'Segoe UI'; font-size: 10pt;
+    }
+    QDialog QTableView::item { padding: 8px; color: #111827; }
+    QTableView#diagnosticsTable::item { padding: 6px; }
+    QDialog QTableView::item:selected { background-color: #eff6ff; color: #2563eb; }
+    QHeaderView::section {
+        background-color: #f9fafb; color: #6b7280;
+        font-weight: bold; font-family: 'Segoe UI'; font-size: 10pt;
+        padding: 8px; border: none; border-bottom: 1px solid #e5e7eb;
+    }
+    QTabWidget::pane { border: none; }
+    QTabBar::tab {
+        background-color: #f3f4f6; color: #6b7280; padding: 8px 14px;
+        border-top-left-radius: 8px; border-top-right-radius: 8px; margin-right: 2px;
+    }
+    QTabBar::tab:selected { background-color: #eff6ff; color: #2563eb; font-weight: bold; }
+
+    QDialog QLabel[role="title"] { color: #111827; margin-bottom: 8px; }
+    QDialog QLabel[role="info"] {
+        color: #6b7280; background-color: #f3f4f6; border-radius: 8px; padding: 10px;
+    }
+    QDialog QLabel[role="info"][tone="accent"] { color: #2563eb; background-color: #eff6ff; }
+    QDialog QLabel[role="warning"] {
+        color: #dc2626; background-color: #fef2f2;
+        border: 1px solid #fecaca; border-radius: 8px; padding: 8px;
+    }
+    QDialog QLabel[role="error"] { color: #dc2626; padding: 4px; }
+    QDialog QLabel[role="badge"] {
+        color: #2563eb; background-color: #eff6ff; border-radius: 8px; padding: 4px 10px;
+    }
+"""
+
+
+def apply_app_style(app: QApplication | None = None):
+    app = app or QApplication.instance()
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
+
+def _button(button: QPushButton, variant: str, height: int = 45, bold: bool = False) -> QPushButton:
+    button.setProperty("variant", variant)
+    button.setMinimumHeight(height)
+    button.setFont(QFont(_conf.font, 11, QFont.Bold if bold else QFont.Normal))
+    button.setCursor(Qt.PointingHandCursor)
+    return button
 
 class ButtonStyle:
     @staticmethod
     def action_button_style(button: QPushButton):
-        button.setMinimumHeight(45)
-        button.setFont(QFont(_conf.font, 11))
-        button.setCursor(Qt.PointingHandCursor)
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: #f3f4f6;
-                color: #1f2937;
-                border: 1px solid #e5e7eb;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: 500;
-            }
-            QPushButton:hover  { background-color: #e5e7eb; border-color: #d1d5db; }
-            QPushButton:pressed { background-color: #2563eb; color: white; }
-            QPushButton:disabled { background-color: #f9fafb; color: #9ca3af; }
-        """)
+        _button(button, "action")
 
     @staticmethod
     def layout_button_style(button: QPushButton):
-        button.setMinimumHeight(45)
-        button.setFont(QFont(_conf.font, 11))
-        button.setCursor(Qt.PointingHandCursor)
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: #2563eb;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: 600;
-            }
-            QPushButton:hover   { background-color: #1d4ed8; }
-            QPushButton:pressed { background-color: #1e40af; }
-            QPushButton:disabled { background-color: #9ca3af; }
-        """)
+        _button(button, "primary")
 
 class ModernButton(QPushButton):
     def __init__(self, text: str, primary: bool = False):
         super().__init__(text)
-        self.setMinimumHeight(45)
-        self.setFont(QFont(_conf.font, 11))
-        self.setCursor(Qt.PointingHandCursor)
-        if primary:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #2563eb; color: white;
-                    border: none; border-radius: 8px;
-                    padding: 10px 20px; font-weight: 600;
-                }
-                QPushButton:hover   { background-color: #1d4ed8; }
-                QPushButton:pressed { background-color: #1e40af; }
-                QPushButton:disabled { background-color: #9ca3af; }
-            """)
-        else:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #f3f4f6; color: #1f2937;
-                    border: 1px solid #e5e7eb; border-radius: 8px;
-                    padding: 10px 20px; font-weight: 500;
-                }
-                QPushButton:hover   { background-color: #e5e7eb; border-color: #d1d5db; }
-                QPushButton:pressed { background-color: #d1d5db; }
-                QPushButton:disabled { background-color: #f9fafb; color: #9ca3af; }
-            """)
-
-def main_window_style() -> str:
-    return """
-        QMainWindow {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                        stop:0 #f5f7fa, stop:1 #e8ecf1);
-        }
-        QScrollBar:vertical {
-            background: #edf2f7; width: 10px; border-radius: 5px;
-        }
-        QScrollBar::handle:vertical {
-            background: #cbd5e0; border-radius: 5px; min-height: 20px;
-        }
-        QScrollBar::handle:vertical:hover { background: #a0aec0; }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
-    """
-
-def dialog_style() -> str:
-    return """
-        QDialog { background-color: #ffffff; }
-        QLabel  { color: #111827; font-family: 'Segoe UI'; }
-        QLineEdit, QTimeEdit, QDateEdit {
-            background-color: #f9fafb; border: 1px solid #e5e7eb;
-            border-radius: 8px; padding: 8px 12px;
-            font-family: 'Segoe UI'; font-size: 11pt; color: #111827;
-        }
-        QLineEdit:focus, QTimeEdit:focus, QDateEdit:focus { border: 1px solid #2563eb; }
-    """
-
-def spinbox_style() -> str:
-    return """
-        QSpinBox {
-            background-color: #f9fafb; border: 1px solid #e5e7eb;
-            border-radius: 8px; padding: 8px 12px;
-            font-family: 'Segoe UI'; font-size: 11pt; color: #111827;
-        }
-        QSpinBox:focus { border: 1px solid #2563eb; }
-    """
+        _button(self, "primary" if primary else "secondary")
 
-def dialog_title(text: str) -> QLabel:
+def _label(text: str, role: str, size: int, bold: bool = False) -> QLabel:
     lbl = QLabel(text)
-    lbl.setFont(QFont(_conf.font, 14, QFont.Bold))
-    lbl.setStyleSheet("color: #111827; margin-bottom: 8px;")
+    lbl.setProperty("role", role)
+    lbl.setFont(QFont(_conf.font, size, QFont.Bold if bold else QFont.Normal))
     return lbl
 
-def info_label(text: str, color: str = "#6b7280", bg: str = "#f3f4f6") -> QLabel:
-    lbl = QLabel(text)
-    lbl.setFont(QFont(_conf.font, 10))
-    lbl.setStyleSheet(f"color: {color}; background-color: {bg}; border-radius: 8px; padding: 10px;")
+def dialog_title(text: str) -> QLabel:
+    return _label(text, "title", 14, bold=True)
+
+def section_title(text: str) -> QLabel:
+    return _label(text, "accent", 11, bold=True)
+
+def info_label(text: str, tone: str = "") -> QLabel:
+    lbl = _label(text, "info", 10)
+    if tone:
+        lbl.setProperty("tone", tone)
     lbl.setWordWrap(True)
     return lbl
 
 def warning_label(text: str) -> QLabel:
-    lbl = QLabel(text)
-    lbl.setFont(QFont(_conf.font, 9))
-    lbl.setStyleSheet("""
-        color: #dc2626; background-color: #fef2f2;
-        border: 1px solid #fecaca; border-radius: 8px; padding: 8px;
-    """)
+    lbl = _label(text, "warning", 9)
     lbl.setWordWrap(True)
     return lbl
 
+def error_label(text: str = "") -> QLabel:
+    return _label(text, "error", 9)
+
 def cancel_button() -> QPushButton:
-    btn = QPushButton("Abbrechen")
-    btn.setMinimumHeight(42)
-    btn.setFont(QFont(_conf.font, 11))
-    btn.setCursor(Qt.PointingHandCursor)
-    btn.setStyleSheet("""
-        QPushButton { background-color: #f3f4f6; color: #1f2937;
-                      border: 1px solid #e5e7eb; border-radius: 8px; padding: 10px 20px; }
-        QPushButton:hover { background-color: #e5e7eb; }
-    """)
-    return btn
+    return _button(QPushButton("Abbrechen"), "secondary", height=42)
 
 def primary_button(text: str) -> QPushButton:
-    btn = QPushButton(text)
-    btn.setMinimumHeight(42)
-    btn.setFont(QFont(_conf.font, 11, QFont.Bold))
-    btn.setCursor(Qt.PointingHandCursor)
-    btn.setStyleSheet("""
-        QPushButton { background-color: #2563eb; color: white;
-                      border: none; border-radius: 8px; padding: 10px 20px; }
-        QPushButton:hover    { background-color: #1d4ed8; }
-        QPushButton:pressed  { background-color: #1e40af; }
-        QPushButton:disabled { background-color: #9ca3af; }
-    """)
-    return btn
+    return _button(QPushButton(text), "primary", height=42, bold=True)
+
+def danger_button(text: str) -> QPushButton:
+    button = QPushButton(text)
+    button.setProperty("variant", "danger")
+    button.setCursor(Qt.PointingHandCursor)
+    return button
@@ -0,0 +1,215 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+from .config import Config as _conf
+
+log = logging.getLogger("work_time.sql")
+
+
+class Execution:
+    __slots__ = ("name", "sql", "params", "seconds", "rows", "lock_wait", "logged")
+
+    def __init__(self, name: str, sql: str, params, seconds: float, lock_wait: float):
+        self.name = name
+        self.sql = sql
+        self.params = params
+        self.seconds = seconds
+        self.rows = 0
+        self.lock_wait = lock_wait
+        self.logged = False
+
+
+class SlowQuery:
+    __slots__ = ("at", "name", "seconds", "rows", "plan")
+
+    def __init__(self, at: datetime, name: str, seconds: float, rows: int, plan: str):
+        self.at = at
+        self.name = name
+        self.seconds = seconds
+        self.rows = rows
+        self.plan = plan
+
+
+_lock = threading.Lock()
+_history: dict[str, deque] = {}
+_slow: deque = deque(maxlen=_conf.slow_query_history)
+
+
+def _config_statements() -> list[tuple[str, str]]:
+    statements = []
+    for attr, value in vars(_conf).items():
+        if not attr.startswith("txt_"):
+            continue
+        name = attr[4:]
+        if isinstance(value, str):
+            statements.append((name, value))
+        elif isinstance(value, tuple):
+            statements.extend((f"{name}[{i}]", v) for i, v in enumerate(value))
+        elif isinstance(value, dict):
+            statements.extend((f"{name}.{k}", v) for k, v in value.items())
+    # Longest first, so statements built on top of a base query match the base.
+    return sorted(statements, key=lambda s: len(s[1]), reverse=True)
+
+_STATEMENTS = _config_statements()
+
+@lru_cache(maxsize=1024)
+def statement_name(sql: str) -> str:
+    for name, text in _STATEMENTS:
+        if sql == text:
+            return name
+    for name, text in _STATEMENTS:
+        if sql.startswith(text):
+            return name + "+"
+    return " ".join(sql.split())[:60]
+
+def _record(name: str, sql: str, params, seconds: float, lock_wait: float) -> Execution:
+    execution = Execution(name, sql, params, seconds, lock_wait)
+    with _lock:
+        history = _history.get(name)
+        if history is None:
+            history = _history[name] = deque(maxlen=_conf.trace_history)
+        history.append(execution)
+    return execution
+
+def _explain(conn: sqlite3.Connection, execution: Execution) -> str:
+    if execution.params is None:
+        return "(executemany, kein Plan)"
+    if not execution.sql.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+        return ""
+    try:
+        plan = conn.cursor().execute("EXPLAIN QUERY PLAN " + execution.sql, execution.params).fetchall()
+    except sqlite3.Error as e:
+        return f"(kein Plan: {e})"
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in plan:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return "\n".join(lines)
+
+def _check_slow(conn: sqlite3.Connection, execution: Execution):
+    if execution.logged or execution.seconds * 1000 < _conf.slow_query_ms:
+        return
+    execution.logged = True
+    plan = _explain(conn, execution)
+    with _lock:
+        _slow.append(SlowQuery(datetime.now(), execution.name, execution.seconds, execution.rows, plan))
+    log.warning("slow query %s: %.1f ms, %d rows\n%s", execution.name, execution.seconds * 1000,
+                execution.rows, plan)
+
+
+class TracedCursor(sqlite3.Cursor):
+    # Fetch time and row counts are added to the execution that produced them;
+    # the slow-query check runs once the result is used up.
+    _execution: Execution | None = None
+
+    def execute(self, sql, parameters=()):
+        self._execution = self._run(super().execute, sql, parameters, parameters)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._execution = self._run(super().executemany, sql, seq_of_parameters, None)
+        return self
+
+    def _run(self, method, sql, parameters, explain_params) -> Execution:
+        conn = self.connection
+        start = time.perf_counter()
+        method(sql, parameters)
+        seconds = time.perf_counter() - start
+        name = statement_name(sql)
+        if name.startswith("BEGIN"):
+            # Waiting for the database lock happens here; charge it to the next statement.
+            conn.lock_wait += seconds
+            lock_wait = 0.0
+        else:
+            lock_wait, conn.lock_wait = conn.lock_wait, 0.0
+        execution = _record(name, sql, explain_params, seconds, lock_wait)
+        if self.rowcount > 0:
+            execution.rows = self.rowcount
+        if self.description is None:
+            _check_slow(conn, execution)
+        return execution
+
+    def _fetched(self, seconds: float, rows: int, done: bool):
+        execution = self._execution
+        if execution is not None:
+            execution.seconds += seconds
+            execution.rows += rows
+            if done:
+                _check_slow(self.connection, execution)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - start, row is not None, True)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(time.perf_counter() - start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - start, 0, True)
+            raise
+        self._fetched(time.perf_counter() - start, 1, False)
+        return row
+
+
+class TracedConnection(sqlite3.Connection):
+    lock_wait = 0.0
+
+    def execute(self, sql, parameters=()):
+        return self.cursor(TracedCursor).execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor(TracedCursor).executemany(sql, seq_of_parameters)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def snapshot() -> list[tuple]:
+    with _lock:
+        histories = {name: list(h) for name, h in _history.items()}
+    stats = []
+    for name, executions in histories.items():
+        times = sorted(e.seconds for e in executions)
+        stats.append((
+            name,
+            len(times),
+            _percentile(times, 0.5),
+            _percentile(times, 0.9),
+            _percentile(times, 0.99),
+            times[-1],
+            sum(e.rows for e in executions) / len(times),
+            sum(e.lock_wait for e in executions),
+            sum(times),
+        ))
+    return sorted(stats, key=lambda s: s[-1], reverse=True)
+
+def slow_queries() -> list[SlowQuery]:
+    with _lock:
+        return list(_slow)
+
+def reset():
+    with _lock:
+        _history.clear()
+        _slow.clear()
@@ -0,0 +1,55 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit, QCompleter
+
+from .config import Config as _conf
+from .db import EntryDetails
+from .formats import parse_tags
+
+
+class EntryDetailsForm(QWidget):
+    def __init__(self, labels: bool = False, parent=None):
+        super().__init__(parent)
+        self.project = QComboBox()
+        self.project.setEditable(True)
+        self.project.setInsertPolicy(QComboBox.NoInsert)
+        self.project.lineEdit().setPlaceholderText("Projekt")
+        self.project.completer().setCaseSensitivity(Qt.CaseInsensitive)
+        self.project.completer().setCompletionMode(QCompleter.PopupCompletion)
+
+        self.tags = QLineEdit()
+        self.tags.setPlaceholderText("Tags, z. B. meeting, kunde-a")
+        self.note = QLineEdit()
+        self.note.setPlaceholderText("Notiz")
+
+        fields = [("Projekt", self.project), ("Tags", self.tags), ("Notiz", self.note)]
+        if labels:
+            layout = QVBoxLayout(self)
+            layout.setSpacing(16)
+            for text, widget in fields:
+                widget.setMinimumHeight(40)
+                lbl = QLabel(text)
+                lbl.setFont(QFont(_conf.font, 10, QFont.Bold))
+                layout.addWidget(lbl)
+                layout.addWidget(widget)
+        else:
+            layout = QHBoxLayout(self)
+            layout.setSpacing(12)
+            for _, widget in fields:
+                layout.addWidget(widget, 2 if widget is self.note else 1)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def set_projects(self, names: list[str]):
+        text = self.project.currentText()
+        self.project.clear()
+        self.project.addItems(names)
+        self.project.setEditText(text)
+
+    def details(self) -> EntryDetails:
+        return EntryDetails(self.project.currentText().strip(), parse_tags(self.tags.text()),
+                            self.note.text().strip())
+
+    def clear(self):
+        self.project.setEditText("")
+        self.tags.clear()
+        self.note.clear()
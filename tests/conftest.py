@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import cache  # noqa: E402
+from src.connection import close_all  # noqa: E402
+from src.db import ensure_database  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    cache.results.clear()
+    yield
+    close_all()
+    cache.results.clear()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return ensure_database(str(tmp_path))
@@ -0,0 +1,99 @@
+import pytest
+
+from src import analytics
+from src.db import delete_entry, ensure_database, insert_entry
+
+SESSIONS = [
+    ("2025-03-03", "08:00:00", "10:00:00", 7200),   # Monday, two full hours
+    ("2025-03-03", "23:30:00", "00:30:00", 3600),   # runs into Tuesday
+    ("2025-03-05", "10:00:00", "10:10:00", 600),    # Wednesday, short
+    ("2025-03-24", "09:00:00", "10:00:00", 3600),   # three weeks later
+]
+
+
+@pytest.fixture(autouse=True)
+def _no_cached_aggregates():
+    analytics._caches.clear()
+    yield
+    analytics._caches.clear()
+
+
+@pytest.fixture
+def filled(db_path):
+    return db_path, [insert_entry(db_path, *session) for session in SESSIONS]
+
+
+def test_report_aggregates(filled):
+    db_path, _ = filled
+    report = analytics.analytics_report(db_path)
+
+    assert report["sessions"] == 4
+    assert report["weekdays"][0] == (2, 14400, 7200.0)
+    assert report["weekdays"][2] == (1, 600, 600.0)
+    assert sum(days for days, _, _ in report["weekdays"]) == 3
+
+    heatmap = report["heatmap"]
+    assert heatmap[0][8] == 3600
+    assert heatmap[0][9] == 7200  # 03-03 and 03-24
+    assert heatmap[0][23] == heatmap[1][0] == 1800
+    assert heatmap[2][10] == 600
+    assert sum(map(sum, heatmap)) == 15000
+
+    # Bounds 15 min, 30 min, 1 h, 2 h, 4 h, 8 h; a bound belongs to the slot above it.
+    assert report["lengths"] == [1, 0, 0, 2, 1, 0, 0]
+
+    # Empty weeks count towards the rolling average.
+    assert report["rolling"] == [
+        ("2025-03-03", 11400, 11400.0),
+        ("2025-03-10", 0, 5700.0),
+        ("2025-03-17", 0, 3800.0),
+        ("2025-03-24", 3600, 3750.0),
+    ]
+
+
+def test_refresh_reads_only_new_sessions(filled):
+    db_path, _ = filled
+    aggregates = analytics.get_aggregates(db_path)
+    assert aggregates.refresh() == 4
+    assert aggregates.refresh() == 0
+
+    insert_entry(db_path, "2025-03-25", "08:00:00", "08:20:00", 1200)
+    assert aggregates.refresh() == 1
+    report = analytics.analytics_report(db_path)
+    assert report["sessions"] == 5
+    assert report["lengths"][1] == 1
+
+
+def test_refresh_reloads_after_delete(filled):
+    db_path, ids = filled
+    analytics.analytics_report(db_path)
+
+    delete_entry(db_path, ids[0])
+    report = analytics.analytics_report(db_path)
+    assert report["sessions"] == 3
+    assert report["weekdays"][0] == (2, 7200, 3600.0)
+    assert report["heatmap"][0][8] == 0
+
+    # A delete and an insert between two refreshes keep the row count the same.
+    delete_entry(db_path, ids[1])
+    insert_entry(db_path, "2025-03-06", "08:00:00", "09:00:00", 3600)
+    report = analytics.analytics_report(db_path)
+    assert report["sessions"] == 3
+    assert report["heatmap"][0][23] == 0
+    assert report["weekdays"][3] == (1, 3600, 3600.0)
+
+
+def test_combined_report_sums_sources_and_ranges(filled, tmp_path):
+    db_path, _ = filled
+    other = ensure_database(str(tmp_path / "b"))
+    insert_entry(other, "2025-03-03", "12:00:00", "13:00:00", 3600)
+
+    combined = analytics.combined_report([db_path, other])
+    assert combined["sessions"] == 5
+    assert combined["weekdays"][0] == (2, 18000, 9000.0)
+    assert combined["heatmap"][0][12] == 3600
+
+    ranged = analytics.combined_report([db_path, other], "2025-03-01", "2025-03-09")
+    assert ranged["sessions"] == 4
+    assert [week for week, _, _ in ranged["rolling"]] == ["2025-03-03"]
+    assert ranged["rolling"][0][1] == 15000
@@ -0,0 +1,94 @@
+import os
+from datetime import date
+
+import pytest
+
+from src import db, federation
+from src.archive import ArchiveError, archive_path, archive_year, archives, archivable_years
+from src.connection import get_manager
+
+CSV = (
+    "Datum,Anfangszeit,Endzeit,Dauer\n"
+    "01.03.2024,08:00,12:00,04:00:00\n"
+    "02.03.2024,08:00,12:00,04:00:00\n"
+    "05.03.2025,08:00,12:00,04:00:00\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "zeiten.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+def _report(report) -> tuple:
+    return report.imported, report.duplicates, report.conflict_count, report.error_count
+
+
+@pytest.fixture
+def history(db_path):
+    for day in ("2023-12-29", "2024-01-02", "2024-06-03", "2024-12-30", "2025-01-06"):
+        db.insert_entry(db_path, day, "08:00:00", "12:00:00", 14400,
+                        db.EntryDetails("Projekt", ["tag"], f"Notiz {day}"))
+    return db_path
+
+
+def test_archive_moves_year_and_federation_reads_it_back(history, tmp_path):
+    before = tmp_path / "vorher.csv"
+    db.export_csv(history, str(before))
+    stats_before = db.month_and_week_stats(history)
+
+    assert archive_year(history, 2024, today=date(2026, 1, 1)) == 3
+
+    dest = archive_path(history, 2024)
+    assert archives(history) == [(2024, dest)]
+    assert not os.stat(dest).st_mode & 0o222
+    assert archivable_years(history, today=date(2026, 1, 1)) == [2023, 2025]
+    with get_manager(history).read() as conn:
+        assert conn.execute("SELECT date FROM work_time ORDER BY date").fetchall() == [("2023-12-29",), ("2025-01-06",)]
+
+    month_rows, week_rows = federation.month_and_week_stats_for([history])
+    assert [row[:3] for row in month_rows] == stats_before[0]
+    assert [row[:3] for row in week_rows] == stats_before[1]
+    assert [row[0] for row in federation.summary_page_for([history])] == [
+        "2025-01-06", "2024-12-30", "2024-06-03", "2024-01-02", "2023-12-29"]
+    assert federation.summary_for_date_for([history], "2024-06-03") == ("2024-06-03", 1, 14400)
+    assert federation.source_totals([history]) == [(history, 5, 72000, "2023-12-29", "2025-01-06")]
+
+    after = tmp_path / "nachher.csv"
+    federation.export_csv([history], str(after))
+    assert after.read_text(encoding="utf-8") == before.read_text(encoding="utf-8")
+
+
+def test_archive_rejects_open_and_archived_years(history):
+    with pytest.raises(ArchiveError):
+        archive_year(history, 2025, today=date(2025, 6, 1))
+    archive_year(history, 2024, today=date(2026, 1, 1))
+    with pytest.raises(ArchiveError, match="bereits archiviert"):
+        archive_year(history, 2024, today=date(2026, 1, 1))
+
+
+
+def test_import_after_archiving_skips_archived_sessions(db_path, csv_path):
+    db.import_csv(db_path, csv_path)
+    assert archive_year(db_path, 2024, today=date(2026, 1, 1)) == 2
+
+    assert _report(db.import_csv(db_path, csv_path)) == (0, 3, 0, 0)
+    month_rows, _ = federation.month_and_week_stats_for([db_path])
+    assert [row[:3] for row in month_rows] == [("2025-03", 1, 14400), ("2024-03", 2, 28800)]
+    with pytest.raises(ValueError):
+        db.insert_entry(db_path, "2024-03-01", "08:00:00", "12:00:00", 14400)
+
+
+def test_import_after_archiving_reports_archived_conflicts(db_path, csv_path, tmp_path):
+    db.import_csv(db_path, csv_path)
+    archive_year(db_path, 2024, today=date(2026, 1, 1))
+    changed = tmp_path / "geaendert.csv"
+    changed.write_text(CSV.replace("01.03.2024,08:00,12:00,04:00:00", "01.03.2024,08:00,12:00,05:00:00")
+                       + "03.03.2024,08:00,10:00,02:00:00\n", encoding="utf-8")
+    report = db.import_csv(db_path, str(changed))
+    assert _report(report) == (1, 2, 1, 0)
+    assert "archiviert 04:00:00" in report.conflicts[0][1]
+    month_rows, _ = federation.month_and_week_stats_for([db_path])
+    assert [row[:3] for row in month_rows] == [("2025-03", 1, 14400), ("2024-03", 3, 36000)]
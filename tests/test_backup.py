@@ -0,0 +1,52 @@
+import os
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src import db
+from src.backup import BackupCancelled, backup_database, scheduled_backup
+
+
+@pytest.fixture
+def entries(db_path):
+    db.insert_entry(db_path, "2025-03-03", "08:00:00", "12:00:00", 14400)
+    return db_path
+
+
+def test_backup_is_a_standalone_copy(entries, tmp_path):
+    dest = str(tmp_path / "kopie.db")
+    fractions = []
+    assert backup_database(entries, dest, progress=fractions.append, pages=1) == dest
+    assert fractions and fractions[-1] == 1.0
+    conn = sqlite3.connect(dest)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("SELECT date FROM work_time").fetchall() == [("2025-03-03",)]
+    conn.close()
+
+
+def test_cancelled_backup_leaves_nothing_behind(entries, tmp_path):
+    dest = tmp_path / "kopie.db"
+    with pytest.raises(BackupCancelled):
+        backup_database(entries, str(dest), cancelled=lambda: True, pages=1)
+    assert not any(name.startswith("kopie") for name in os.listdir(tmp_path))
+
+
+def test_scheduled_backup_runs_once_a_day(entries, tmp_path):
+    folder = str(tmp_path / "backups")
+    first = scheduled_backup(entries, folder, today=date(2025, 3, 3))
+    assert first == os.path.join(folder, "work_time_2025-03-03.db")
+    assert scheduled_backup(entries, folder, today=date(2025, 3, 3)) is None
+
+
+def test_rotation_keeps_seven_daily_and_four_weekly(entries, tmp_path):
+    folder = str(tmp_path / "backups")
+    day = date(2025, 3, 1)
+    while day <= date(2025, 3, 30):
+        scheduled_backup(entries, folder, keep_daily=7, keep_weekly=4, today=day)
+        day += timedelta(days=1)
+    # The seven newest days, plus the newest backup of each of the four newest
+    # ISO weeks; the current week is already covered by the daily ones.
+    kept = sorted(name[len("work_time_"):-len(".db")] for name in os.listdir(folder))
+    assert kept == ["2025-03-09", "2025-03-16", "2025-03-23", "2025-03-24", "2025-03-25", "2025-03-26",
+                    "2025-03-27", "2025-03-28", "2025-03-29", "2025-03-30"]
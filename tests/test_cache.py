@@ -0,0 +1,43 @@
+import sqlite3
+
+from src import cache
+from src.db import count_entries, insert_entry, summary_by_date
+
+
+def test_repeated_reads_are_served_from_the_cache(db_path):
+    insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200)
+    first = summary_by_date(db_path)
+    hits = cache.results.stats()[0]
+    assert summary_by_date(db_path) == first
+    assert cache.results.stats()[0] == hits + 1
+
+
+def test_cached_results_are_copies(db_path):
+    insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200)
+    summary_by_date(db_path).clear()
+    assert len(summary_by_date(db_path)) == 1
+
+
+def test_writes_through_the_app_invalidate(db_path):
+    assert count_entries(db_path) == 0
+    insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200)
+    assert count_entries(db_path) == 1
+
+
+def test_writes_from_another_connection_invalidate(db_path):
+    insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200)
+    assert [row["total_seconds"] for row in summary_by_date(db_path)] == [7200]
+    assert count_entries(db_path) == 1
+
+    other = sqlite3.connect(db_path)
+    other.execute("INSERT INTO work_time (date, start_time, end_time, duration_seconds) "
+                  "VALUES ('2025-03-03', '13:00:00', '14:00:00', 3600)")
+    other.commit()
+    assert [row["total_seconds"] for row in summary_by_date(db_path)] == [10800]
+    assert count_entries(db_path) == 2
+
+    other.execute("DELETE FROM work_time")
+    other.commit()
+    other.close()
+    assert summary_by_date(db_path) == []
+    assert count_entries(db_path) == 0
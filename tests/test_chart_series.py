@@ -0,0 +1,51 @@
+import pytest
+
+from src import db
+
+
+@pytest.fixture
+def entries(db_path):
+    # 2024-12-30 and 2025-01-05 share ISO week 1 of 2025 across the year end;
+    # 2025-01-31 and 2025-02-01 share a week across a month end.
+    for day, seconds in (("2024-12-30", 3600), ("2025-01-05", 7200), ("2025-01-06", 1800),
+                         ("2025-01-31", 600), ("2025-02-01", 900), ("2025-03-03", 1200)):
+        db.insert_entry(db_path, day, "08:00:00", "09:00:00", seconds)
+    return db_path
+
+
+def test_days_are_counted_from_date_from(entries):
+    assert db.chart_series(entries, "day", "2024-12-30") == [
+        (0, "2024-12-30", 3600, 3600), (6, "2025-01-05", 7200, 7200), (7, "2025-01-06", 1800, 1800),
+        (32, "2025-01-31", 600, 600), (33, "2025-02-01", 900, 900), (63, "2025-03-03", 1200, 1200)]
+
+
+def test_weeks_start_on_monday_across_year_and_month_ends(entries):
+    assert db.chart_series(entries, "week", "2024-12-30") == [
+        (0, "2024-12-30", 10800, 10800), (1, "2025-01-06", 1800, 1800),
+        (4, "2025-01-27", 1500, 1500), (9, "2025-03-03", 1200, 1200)]
+    # A range starting mid-week still numbers from that week's Monday.
+    assert db.chart_series(entries, "week", "2025-01-01", "2025-01-31") == [
+        (0, "2024-12-30", 7200, 7200), (1, "2025-01-06", 1800, 1800), (4, "2025-01-27", 600, 600)]
+
+
+def test_months_split_at_the_month_end(entries):
+    assert db.chart_series(entries, "month", "2024-12-01") == [
+        (0, "2024-12", 3600, 3600), (1, "2025-01", 9600, 9600), (2, "2025-02", 900, 900),
+        (3, "2025-03", 1200, 1200)]
+    assert db.chart_series(entries, "month", "2025-01-06", "2025-02-28") == [
+        (0, "2025-01", 2400, 2400), (1, "2025-02", 900, 900)]
+
+
+@pytest.mark.parametrize("unit, date_from, expected", [
+    ("day", "2024-12-30", [(0, "2024-12-30", 3600, 3600), (2, "2025-01-05", 9000, 7200),
+                           (10, "2025-01-31", 600, 600), (11, "2025-02-01", 900, 900),
+                           (21, "2025-03-03", 1200, 1200)]),
+    ("week", "2024-12-30", [(0, "2024-12-30", 12600, 10800), (2, "2025-01-27", 1500, 1500),
+                            (4, "2025-03-03", 1200, 1200)]),
+    ("month", "2024-12-01", [(0, "2024-12", 13200, 9600), (1, "2025-02", 2100, 1200)]),
+])
+def test_downsampled_buckets_sum_units_and_keep_the_busiest(entries, unit, date_from, expected):
+    per_bucket = 3 if unit == "day" else 2
+    rows = db.chart_series(entries, unit, date_from, per_bucket=per_bucket)
+    assert rows == expected
+    assert sum(row[2] for row in rows) == sum(row[2] for row in db.chart_series(entries, unit, date_from))
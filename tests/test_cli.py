@@ -0,0 +1,91 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src import db
+from src.archive import archive_path
+from src.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def run(tmp_path, capsys):
+    def run(*argv):
+        code = main(["--folder", str(tmp_path), *argv])
+        out, err = capsys.readouterr()
+        return code, out, err
+    return run
+
+
+def test_session_commands_record_an_entry(run, db_path):
+    assert run("status")[1] == "Keine laufende Session.\n"
+    code, out, _ = run("start")
+    assert code == 0 and out.startswith("Session gestartet um ")
+    assert run("pause")[1].startswith("Session pausiert")
+    assert run("status")[1].startswith("Pausiert seit ")
+    assert run("continue")[1] == "Session fortgesetzt.\n"
+    code, out, _ = run("stop", "--project", "Alpha", "--tag", "a", "--tag", "#b", "--note", "Notiz")
+    assert code == 0 and out.startswith("Gespeichert: ")
+    rows, _ = db.entries_page(db_path)
+    assert rows[0][5:] == ("Alpha", "a, b", "Notiz")
+
+
+def test_session_errors_exit_with_one(run):
+    code, out, err = run("pause")
+    assert (code, out) == (1, "")
+    assert err == "Fehler: Es läuft keine Session.\n"
+    run("start")
+    assert run("start")[0] == 1
+
+
+def test_import_report_search_and_export(run, tmp_path):
+    source = tmp_path / "zeiten.csv"
+    source.write_text("Datum,Anfangszeit,Endzeit,Dauer,Projekt\n"
+                      "03.03.2025,08:00,12:00,04:00:00,Alpha\n"
+                      "04.03.2025,08:00,10:00,02:00:00,Beta\n"
+                      "kaputt\n", encoding="utf-8")
+    code, out, err = run("import", str(source))
+    assert code == 1
+    assert out == "2 neu, 0 bereits vorhanden, 0 Konflikt(e), 1 Zeile(n) ungültig.\n"
+    assert err.startswith("Zeile 4: ")
+
+    assert run("report", "--by", "month")[1].split() == ["03.2025", "2", "Session(s)", "06:00:00"]
+    assert run("search", "projekt:beta")[1].startswith("04.03.2025 08:00:00–10:00:00")
+    assert run("search", "gamma")[1] == "Keine Treffer.\n"
+
+    target = tmp_path / "export.ndjson.gz"
+    assert run("export", str(target), "--from", "04.03.2025")[1] == f"1 Einträge exportiert nach {target}.\n"
+    with gzip.open(target, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["project"] for line in f] == ["Beta"]
+
+
+def test_report_includes_other_databases(run, tmp_path, db_path):
+    other = tmp_path / "andere"
+    other.mkdir()
+    other_db = db.ensure_database(str(other))
+    db.insert_entry(db_path, "2025-03-03", "08:00:00", "12:00:00", 14400)
+    db.insert_entry(other_db, "2025-03-03", "13:00:00", "14:00:00", 3600)
+    assert run("report", "--with", other_db)[1].split() == ["03.03.2025", "2", "Session(s)", "05:00:00"]
+    assert run("report", "--with", str(tmp_path / "fehlt.db"))[0] == 1
+
+
+def test_archive_lists_and_moves_closed_years(run, db_path):
+    db.insert_entry(db_path, "2024-03-03", "08:00:00", "12:00:00", 14400)
+    assert run("archive")[1].splitlines()[-1] == "Archivierbar: 2024"
+    code, out, _ = run("archive", "2024")
+    assert code == 0 and out == f"1 Einträge aus 2024 verschoben nach {archive_path(db_path, 2024)}.\n"
+    assert run("archive", "2024")[0] == 1
+
+
+def test_command_line_runs_without_qt(tmp_path):
+    # A None entry in sys.modules makes any import of PySide6 fail.
+    script = ("import runpy, sys; sys.modules['PySide6'] = None; sys.argv[1:] = ['--folder', sys.argv[1], 'status'];"
+              "runpy.run_module('src', run_name='__main__')")
+    result = subprocess.run([sys.executable, "-c", script, str(tmp_path)], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "Keine laufende Session.\n"
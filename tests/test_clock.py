@@ -0,0 +1,87 @@
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from src import clock  # noqa: E402
+from src.clock import SessionClock  # noqa: E402
+
+
+class FakeTime:
+    def __init__(self):
+        self.monotonic = 1000.0
+        self.wall = 1_750_000_000.0
+
+
+@pytest.fixture
+def now(monkeypatch):
+    # Timers need an application object, but no event loop or display; the
+    # tests fire the single-shot themselves after moving the fake clock.
+    QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    fake = FakeTime()
+    monkeypatch.setattr(clock.time, "monotonic", lambda: fake.monotonic)
+    monkeypatch.setattr(clock.time, "time", lambda: fake.wall)
+    return fake
+
+
+@pytest.fixture
+def session_clock(now):
+    c = SessionClock()
+    c.ticks = []
+    c.tick.connect(c.ticks.append)
+    yield c
+    c.reset()
+
+
+def _advance(now, c, seconds: float):
+    now.monotonic += seconds
+    c._on_timeout()
+
+
+def test_ticks_once_per_elapsed_second(now, session_clock):
+    session_clock.start(5)
+    assert session_clock.ticks == [5]
+    assert session_clock._timer.interval() == 1000
+
+    _advance(now, session_clock, 0.3)
+    assert session_clock.ticks == [5]
+    assert session_clock._timer.interval() in (700, 701)
+    _advance(now, session_clock, 0.7)
+    assert session_clock.ticks == [5, 6]
+
+
+def test_early_timeout_still_shows_the_next_second(now, session_clock):
+    session_clock.start()
+    _advance(now, session_clock, 0.995)
+    assert session_clock.ticks == [0, 1]
+    assert session_clock._timer.interval() >= 1000
+
+
+def test_wall_clock_jumps_do_not_move_the_display(now, session_clock):
+    session_clock.start()
+    now.wall -= 3600
+    _advance(now, session_clock, 2)
+    assert session_clock.elapsed() == 2
+    assert session_clock.ticks == [0, 2]
+
+
+def test_hidden_clock_does_not_wake_up_and_catches_up_when_shown(now, session_clock):
+    session_clock.start()
+    session_clock.set_visible(False)
+    assert not session_clock._timer.isActive()
+    now.monotonic += 42.5
+    session_clock.set_visible(True)
+    assert session_clock.ticks == [0, 42]
+    assert session_clock._timer.isActive()
+
+
+def test_pause_holds_the_elapsed_time(now, session_clock):
+    session_clock.start(10)
+    now.monotonic += 3.5
+    assert session_clock.pause() == 13.5
+    assert not session_clock.running and not session_clock._timer.isActive()
+    now.monotonic += 100
+    assert session_clock.elapsed() == 13.5
+    session_clock.start(session_clock.elapsed())
+    _advance(now, session_clock, 0.5)
+    # A (re)started clock always shows its current second once.
+    assert session_clock.ticks == [10, 13, 13, 14]
@@ -0,0 +1,40 @@
+from src.connection import get_manager
+from src.db import EntryDetails, count_entries, delete_entries, delete_matching, entries_page, insert_entry
+
+from test_rollups import assert_consistent
+
+
+def _ids(db_path: str, **filters) -> list[int]:
+    rows, _ = entries_page(db_path, sort="id", descending=False, limit=100, **filters)
+    return [row[0] for row in rows]
+
+
+def _fill(db_path: str) -> list[int]:
+    return [
+        insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200, EntryDetails("Kunde A", ["review"])),
+        insert_entry(db_path, "2025-03-03", "11:00:00", "12:00:00", 3600, EntryDetails("Kunde B")),
+        insert_entry(db_path, "2025-03-10", "08:00:00", "09:00:00", 3600, EntryDetails("Kunde A")),
+        insert_entry(db_path, "2025-04-01", "08:00:00", "09:00:00", 3600),
+    ]
+
+
+def test_delete_entries_returns_touched_days(db_path):
+    ids = _fill(db_path)
+    assert delete_entries(db_path, [ids[0], ids[1], ids[3]]) == ["2025-03-03", "2025-04-01"]
+    assert _ids(db_path) == [ids[2]]
+    assert delete_entries(db_path, []) == []
+    assert_consistent(db_path)
+
+
+def test_delete_matching_uses_range_and_search(db_path):
+    ids = _fill(db_path)
+    assert delete_matching(db_path, "2025-03-01", "2025-03-31", "projekt:kunde-a") == ["2025-03-03", "2025-03-10"]
+    assert _ids(db_path) == [ids[1], ids[3]]
+    assert count_entries(db_path, search="projekt:kunde-a") == 0
+    with get_manager(db_path).read() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM entry_tags").fetchone()[0] == 0
+    assert_consistent(db_path)
+
+    assert delete_matching(db_path) == ["2025-03-03", "2025-04-01"]
+    assert count_entries(db_path) == 0
+    assert_consistent(db_path)
@@ -0,0 +1,82 @@
+import csv
+import gzip
+import json
+import lzma
+
+import pytest
+
+from src import db
+from src.config import Config
+
+
+@pytest.fixture
+def entries(db_path, monkeypatch):
+    monkeypatch.setattr(Config, "export_batch_size", 2)
+    for day in ("2025-03-03", "2025-03-04", "2025-03-05", "2025-03-06", "2025-03-07"):
+        db.insert_entry(db_path, day, "08:00:00", "12:00:00", 14400,
+                        db.EntryDetails("Projekt", ["a", "b"], f"Notiz {day}"))
+    return db_path
+
+
+def test_csv_export_writes_rows_in_date_order(entries, tmp_path):
+    path = tmp_path / "zeiten.csv"
+    fractions = []
+    assert db.export_csv(entries, str(path), progress=fractions.append, date_from="2025-03-04") == 4
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Datum", "Anfangszeit", "Endzeit", "Dauer", "Projekt", "Tags", "Notiz"]
+    assert [row[0] for row in rows[1:]] == ["04.03.2025", "05.03.2025", "06.03.2025", "07.03.2025"]
+    assert rows[1][3:] == ["04:00:00", "Projekt", "a, b", "Notiz 2025-03-04"]
+    assert fractions == [0.5, 1.0]
+
+
+def test_json_export_keeps_document_layout(entries, tmp_path):
+    path = tmp_path / "zeiten.json"
+    assert db.export_json(entries, str(path), date_to="2025-03-04") == 2
+    document = json.loads(path.read_text(encoding="utf-8"))
+    assert document["total_entries"] == 2
+    assert (document["date_from"], document["date_to"]) == (None, "2025-03-04")
+    assert document["entries"][0] == {"id": 2, "date": "04.03.2025", "start_time": "08:00:00",
+                                      "end_time": "12:00:00", "duration": "04:00:00", "project": "Projekt",
+                                      "tags": ["a", "b"], "note": "Notiz 2025-03-04"}
+
+
+def test_empty_json_export_is_valid(db_path, tmp_path):
+    path = tmp_path / "leer.json"
+    assert db.export_json(db_path, str(path)) == 0
+    assert json.loads(path.read_text(encoding="utf-8"))["entries"] == []
+
+
+@pytest.mark.parametrize("suffix, opener", [(".ndjson", open), (".ndjson.gz", gzip.open), (".ndjson.xz", lzma.open)])
+def test_ndjson_export_writes_one_entry_per_line(entries, tmp_path, suffix, opener):
+    path = tmp_path / f"zeiten{suffix}"
+    assert db.export_json(entries, str(path), ndjson=True) == 5
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["date"] for line in lines] == [
+        "07.03.2025", "06.03.2025", "05.03.2025", "04.03.2025", "03.03.2025"]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".csv.gz", ".csv.xz"])
+def test_compressed_csv_matches_plain_export(entries, tmp_path, suffix):
+    plain, packed = tmp_path / "plain.csv", tmp_path / f"packed{suffix}"
+    db.export_csv(entries, str(plain))
+    db.export_csv(entries, str(packed))
+    opener = {".gz": gzip.open, ".xz": lzma.open}.get(packed.suffix, open)
+    with opener(packed, "rb") as f:
+        assert f.read() == plain.read_bytes()
+
+
+@pytest.mark.parametrize("export", [db.export_csv, db.export_json])
+def test_cancelled_export_removes_the_file(entries, tmp_path, export):
+    path = tmp_path / "abgebrochen.gz"
+    checks = []
+
+    def cancelled():
+        checks.append(1)
+        return len(checks) > 1
+
+    with pytest.raises(db.ExportCancelled):
+        export(entries, str(path), cancelled=cancelled)
+    assert len(checks) == 2
+    assert not path.exists()
@@ -0,0 +1,62 @@
+import csv
+import json
+import os
+from datetime import date
+
+import pytest
+
+from src import db, federation
+from src.archive import archive_year
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = []
+    for name, days in (("buero", ("2024-06-03", "2025-01-06")), ("home", ("2025-01-07",))):
+        folder = tmp_path / name
+        folder.mkdir()
+        path = db.ensure_database(str(folder))
+        for day in days:
+            db.insert_entry(path, day, "08:00:00", "12:00:00", 14400)
+        paths.append(path)
+    return paths
+
+
+def test_source_labels_take_in_parent_folders():
+    assert federation.source_labels(["/a/x/work_time.db", "/b/x/work_time.db", "/c/y.db"]) == [
+        os.path.join("a", "x", "work_time.db"), os.path.join("b", "x", "work_time.db"), "y.db"]
+
+
+def test_stats_cover_both_sources(sources):
+    month_rows, _ = federation.month_and_week_stats_for(sources)
+    assert [row[:3] for row in month_rows] == [("2025-01", 2, 28800), ("2024-06", 1, 14400)]
+    assert [row[1:3] for row in federation.source_totals(sources)] == [(2, 28800), (1, 14400)]
+
+
+def test_archive_rows_are_labelled_with_their_database(sources, tmp_path):
+    archive_year(sources[0], 2024, today=date(2026, 1, 1))
+    labels = federation.source_labels(sources)
+
+    csv_path = tmp_path / "alle.csv"
+    assert federation.export_csv(sources, str(csv_path)) == 3
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))[1:]
+    assert [(row[0], row[-1]) for row in rows] == [
+        ("03.06.2024", labels[0]), ("06.01.2025", labels[0]), ("07.01.2025", labels[1])]
+
+    json_path = tmp_path / "alle.json"
+    assert federation.export_json(sources, str(json_path)) == 3
+    with open(json_path, encoding="utf-8") as f:
+        document = json.load(f)
+    assert document["total_entries"] == 3
+    assert document["sources"] == labels
+    assert [entry["source"] for entry in document["entries"]] == [labels[0], labels[0], labels[1]]
+
+
+def test_single_database_json_matches_db_export(sources, tmp_path):
+    ours, theirs = tmp_path / "a.json", tmp_path / "b.json"
+    federation.export_json(sources[:1], str(ours), date_from="2025-01-01")
+    db.export_json(sources[0], str(theirs), date_from="2025-01-01")
+    a, b = (json.loads(p.read_text(encoding="utf-8")) for p in (ours, theirs))
+    assert a.keys() == b.keys() == {"exported_at", "total_entries", "date_from", "date_to", "entries"}
+    assert a["entries"] == b["entries"] and a["total_entries"] == 1
@@ -0,0 +1,53 @@
+import pytest
+
+from src.db import import_csv, insert_entry, month_and_week_stats
+
+CSV = (
+    "Datum,Anfangszeit,Endzeit,Dauer,Projekt\n"
+    "01.03.2024,08:00,12:00,04:00:00,Alt\n"
+    "02.03.2024,08:00,12:00,04:00:00,\n"
+    "05.03.2025,8:00,12:00:00,04:00:00,Neu\n"
+)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "zeiten.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+def _report(report) -> tuple:
+    return report.imported, report.duplicates, report.conflict_count, report.error_count
+
+
+def test_import_twice_adds_nothing(db_path, csv_path):
+    assert _report(import_csv(db_path, csv_path)) == (3, 0, 0, 0)
+    assert _report(import_csv(db_path, csv_path)) == (0, 3, 0, 0)
+    assert month_and_week_stats(db_path)[0] == [("2025-03", 1, 14400), ("2024-03", 2, 28800)]
+
+
+def test_import_reports_changed_duration_as_conflict(db_path, csv_path, tmp_path):
+    import_csv(db_path, csv_path)
+    changed = tmp_path / "geaendert.csv"
+    changed.write_text(CSV.replace("05.03.2025,8:00,12:00:00,04:00:00", "05.03.2025,08:00,12:00,03:00:00"),
+                       encoding="utf-8")
+    report = import_csv(db_path, str(changed))
+    assert _report(report) == (0, 2, 1, 0)
+    assert report.conflicts[0][0] == 4
+
+
+
+def test_manual_entry_with_an_existing_natural_key_is_rejected(db_path, csv_path):
+    import_csv(db_path, csv_path)
+    with pytest.raises(ValueError, match="bereits einen Eintrag"):
+        insert_entry(db_path, "2025-03-05", "08:00:00", "12:00:00", 100)
+
+
+def test_import_reports_unreadable_lines(db_path, tmp_path):
+    path = tmp_path / "kaputt.csv"
+    path.write_text("Datum,Anfangszeit,Endzeit,Dauer\n31.02.2025,08:00,09:00,01:00:00\n"
+                    "03.03.2025,08:00,09:00,01:00:00\n", encoding="utf-8")
+    report = import_csv(db_path, str(path))
+    assert _report(report) == (1, 0, 0, 1)
+    assert report.errors[0][0] == 2
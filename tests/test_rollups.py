@@ -0,0 +1,66 @@
+import sqlite3
+
+from src.connection import get_manager
+from src.db import check_rollups, delete_entry, insert_entry, month_and_week_stats, rebuild_rollups, repair_rollups
+
+
+def _totals(db_path: str) -> tuple:
+    with get_manager(db_path).read() as conn:
+        base = conn.execute("SELECT COUNT(*), COALESCE(SUM(duration_seconds), 0) FROM work_time").fetchone()
+        rollups = [conn.execute(f"SELECT COALESCE(SUM(sessions), 0), COALESCE(SUM(seconds), 0) FROM {table}").fetchone()
+                   for table in ("rollup_day", "rollup_week", "rollup_month")]
+    return base, rollups
+
+
+def assert_consistent(db_path: str):
+    assert check_rollups(db_path) == []
+    base, rollups = _totals(db_path)
+    assert rollups == [base] * 3
+
+
+def test_rollups_follow_insert_update_delete(db_path):
+    # Sunday/Monday and month boundaries, several sessions on one day.
+    ids = [
+        insert_entry(db_path, "2025-03-02", "08:00:00", "10:00:00", 7200),
+        insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200),
+        insert_entry(db_path, "2025-03-03", "11:00:00", "12:00:00", 3600),
+        insert_entry(db_path, "2025-03-31", "08:00:00", "09:00:00", 3600),
+        insert_entry(db_path, "2025-04-01", "08:00:00", "09:30:00", 5400),
+    ]
+    assert_consistent(db_path)
+    month_rows, week_rows = month_and_week_stats(db_path)
+    assert month_rows == [("2025-04", 1, 5400), ("2025-03", 4, 21600)]
+    assert week_rows == [("2025-03-31", 2, 9000), ("2025-03-03", 2, 10800), ("2025-02-24", 1, 7200)]
+
+    with get_manager(db_path).write() as conn:
+        conn.execute("UPDATE work_time SET duration_seconds = 1800 WHERE id = ?", (ids[1],))
+        conn.execute("UPDATE work_time SET date = '2025-05-05' WHERE id = ?", (ids[3],))
+    assert_consistent(db_path)
+
+    for entry_id in ids:
+        delete_entry(db_path, entry_id)
+        assert_consistent(db_path)
+    assert _totals(db_path) == ((0, 0), [(0, 0)] * 3)
+
+
+def test_rollups_follow_writes_from_another_connection(db_path):
+    insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200)
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO work_time (date, start_time, end_time, duration_seconds) "
+                 "VALUES ('2025-03-03', '13:00:00', '14:00:00', 3600)")
+    conn.execute("DELETE FROM work_time WHERE start_time = '08:00:00'")
+    conn.commit()
+    conn.close()
+    assert_consistent(db_path)
+    assert month_and_week_stats(db_path)[0] == [("2025-03", 1, 3600)]
+
+
+def test_repair_rebuilds_damaged_rollups(db_path):
+    insert_entry(db_path, "2025-03-03", "08:00:00", "10:00:00", 7200)
+    with get_manager(db_path).write() as conn:
+        conn.execute("UPDATE rollup_day SET seconds = 1")
+        conn.execute("DELETE FROM rollup_month")
+    assert len(repair_rollups(db_path)) == 2
+    assert_consistent(db_path)
+    rebuild_rollups(db_path)
+    assert_consistent(db_path)
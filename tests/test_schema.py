@@ -0,0 +1,87 @@
+import sqlite3
+
+from src.config import Config as _conf
+from src.connection import close_all
+from src.db import ensure_database, check_rollups
+from src.schema import MigrationReport
+
+
+def _v7_with_duplicates(path: str):
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_work_time_natural")
+    conn.executemany(
+        "INSERT INTO work_time (date, start_time, end_time, duration_seconds) VALUES (?, ?, ?, ?)",
+        [("2025-03-03", "08:00:00", "12:00:00", 14400)] * 3 + [("2025-03-04", "08:00:00", "12:00:00", 14400)],
+    )
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+    conn.close()
+
+
+def test_v7_removes_duplicates_and_reports_backup(tmp_path):
+    path = ensure_database(str(tmp_path))
+    close_all()
+    _v7_with_duplicates(path)
+
+    report = MigrationReport()
+    ensure_database(str(tmp_path), report=report)
+
+    assert report.removed_duplicates == 2
+    assert report.backup_path == str(tmp_path / "work_time_vor_bereinigung.db")
+    backup = sqlite3.connect(report.backup_path)
+    assert backup.execute("SELECT COUNT(*) FROM work_time").fetchone()[0] == 4
+    backup.close()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == _conf.schema_version
+    assert conn.execute("SELECT date, MIN(id) FROM work_time GROUP BY date").fetchall() == [
+        ("2025-03-03", 1), ("2025-03-04", 4)]
+    conn.close()
+    assert check_rollups(path) == []
+
+
+def test_v7_without_duplicates_reports_nothing(tmp_path):
+    path = ensure_database(str(tmp_path))
+    close_all()
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_work_time_natural")
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+    conn.close()
+
+    report = MigrationReport()
+    ensure_database(str(tmp_path), report=report)
+
+    assert report == MigrationReport()
+    assert not (tmp_path / "work_time_vor_bereinigung.db").exists()
+
+
+def test_v1_migrates_to_current(tmp_path, monkeypatch):
+    monkeypatch.setattr(_conf, "migration_chunk_size", 2)
+    path = str(tmp_path / _conf.db_file)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE work_time (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT, start_time TEXT, "
+                 "end_time TEXT, duration TEXT)")
+    conn.executemany("INSERT INTO work_time VALUES (?, ?, ?, ?, ?)", [
+        (1, "03.03.2025", "9:00", "12:30", "03:30:00"),
+        (2, "03.03.2025", "13:00:00", "17:00", "04:00:00"),
+        (3, "10.03.2025", "08:00", "09:00", "01:00:00"),
+        (5, "kaputt", "früh", "spät", "?"),
+    ])
+    conn.commit()
+    conn.close()
+
+    ensure_database(str(tmp_path))
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == _conf.schema_version
+    assert conn.execute("SELECT id, date, start_time, end_time, duration_seconds FROM work_time ORDER BY id").fetchall() == [
+        (1, "2025-03-03", "09:00:00", "12:30:00", 12600),
+        (2, "2025-03-03", "13:00:00", "17:00:00", 14400),
+        (3, "2025-03-10", "08:00:00", "09:00:00", 3600),
+        (5, "kaputt", "früh", "spät", 0),
+    ]
+    assert not conn.execute(_conf.txt_table_exists, ("work_time_v1",)).fetchone()
+    assert conn.execute("SELECT sessions, seconds FROM rollup_day WHERE date = '2025-03-03'").fetchone() == (2, 27000)
+    conn.close()
+    assert check_rollups(path) == []
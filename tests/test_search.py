@@ -0,0 +1,66 @@
+import pytest
+
+from src import db
+from src.formats import search_query
+
+
+@pytest.mark.parametrize("text, query", [
+    ("bericht", '"bericht"*'),
+    ("projekt:Alpha beta", 'project : "Alpha"* AND "beta"*'),
+    ("#urgent", 'tags : "urgent"*'),
+    ('"weekly sync"', '"weekly sync"'),
+    ('notiz:"weekly sync"', 'note : "weekly sync"'),
+    ("foo:bar", '"foo bar"*'),
+    ('"', None),
+    ("   ", None),
+])
+def test_search_text_becomes_fts_query(text, query):
+    assert search_query(text) == query
+
+
+@pytest.fixture
+def entries(db_path):
+    for day, details in (
+        ("2025-03-03", db.EntryDetails("Alpha", ["urgent"], "weekly sync with the team")),
+        ("2025-03-04", db.EntryDetails("Alphabet", ["review"], "sync weekly numbers")),
+        ("2025-03-05", db.EntryDetails("Beta", ["urgent", "alpha"], "release notes")),
+        ("2025-03-06", db.EntryDetails()),
+    ):
+        db.insert_entry(db_path, day, "08:00:00", "12:00:00", 14400, details)
+    return db_path
+
+
+def _dates(db_path: str, search: str) -> list[str]:
+    rows, _ = db.entries_page(db_path, descending=False, search=search)
+    assert db.count_entries(db_path, search=search) == len(rows)
+    return [row[1] for row in rows]
+
+
+def test_words_match_any_column_by_prefix(entries):
+    assert _dates(entries, "alpha") == ["2025-03-03", "2025-03-04", "2025-03-05"]
+    assert _dates(entries, "alpha urgent") == ["2025-03-03", "2025-03-05"]
+    assert _dates(entries, "") == ["2025-03-03", "2025-03-04", "2025-03-05", "2025-03-06"]
+
+
+def test_column_prefixes_limit_the_match(entries):
+    assert _dates(entries, "projekt:alpha") == ["2025-03-03", "2025-03-04"]
+    assert _dates(entries, "#alpha") == ["2025-03-05"]
+    assert _dates(entries, "tag:urgent notiz:release") == ["2025-03-05"]
+
+
+def test_quoted_text_is_an_exact_phrase(entries):
+    assert _dates(entries, '"weekly sync"') == ["2025-03-03"]
+    assert _dates(entries, "weekly sync") == ["2025-03-03", "2025-03-04"]
+    assert _dates(entries, '"projekt alpha"') == []
+
+
+def test_search_follows_deleted_entries(entries):
+    rows, _ = db.entries_page(entries, search="#urgent")
+    db.delete_entry(entries, rows[0][0])
+    assert _dates(entries, "#urgent") == ["2025-03-03"]
+
+
+def test_search_combines_with_date_range(entries):
+    rows, _ = db.entries_page(entries, date_from="2025-03-04", search="alpha")
+    assert [row[1] for row in rows] == ["2025-03-05", "2025-03-04"]
+    assert db.count_entries(entries, "2025-03-04", None, "alpha") == 2
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from src import db
+from src.connection import close_all
+
+START = datetime(2025, 3, 3, 8, 0).timestamp()
+
+
+def test_pause_and_continue_count_only_running_time(db_path):
+    db.start_session(db_path, now=START)
+    with pytest.raises(db.SessionError):
+        db.start_session(db_path, now=START + 1)
+    assert db.pause_session(db_path, now=START + 100).elapsed == 100
+    db.continue_session(db_path, now=START + 400)
+    assert db.stop_session(db_path, now=START + 1000) == ("2025-03-03", "08:00:00", "08:16:40", 700)
+    assert db.running_session(db_path) is None
+    assert db.summary_for_date(db_path, "2025-03-03") == ("2025-03-03", 1, 700)
+
+
+def test_checkpoint_survives_a_crash(db_path):
+    db.start_session(db_path, now=START)
+    session, cost = db.checkpoint_session(db_path, now=START + 600)
+    assert session.checkpoint_at == START + 600 and cost >= 0
+
+    # Nothing is shut down cleanly; the next start only has the database file.
+    close_all()
+    recovered = db.running_session(db_path)
+    assert (recovered.date, recovered.start_time, recovered.paused) == ("2025-03-03", "08:00:00", False)
+    assert recovered.checkpoint_at == START + 600
+
+    # Saving up to the last sign of life stores the session and ends it.
+    db.complete_session(db_path, recovered.date, recovered.start_time, "08:10:00",
+                        int(recovered.elapsed_at(recovered.checkpoint_at)))
+    assert db.running_session(db_path) is None
+    assert db.summary_for_date(db_path, "2025-03-03") == ("2025-03-03", 1, 600)
+
+
+def test_paused_session_is_restored_as_paused(db_path):
+    db.start_session(db_path, now=START)
+    db.pause_session(db_path, now=START + 300)
+    close_all()
+    recovered = db.running_session(db_path)
+    assert recovered.paused
+    assert recovered.elapsed_at(START + 5000) == 300
+
+
+def test_saved_session_replaces_the_stored_one(db_path):
+    db.start_session(db_path, now=START)
+    db.save_session(db_path, db.RunningSession("2025-03-03", "07:30:00", START - 1800, 0, False, START))
+    assert db.running_session(db_path).elapsed_at(START + 60) == 1860
+    db.clear_session(db_path)
+    assert db.running_session(db_path) is None